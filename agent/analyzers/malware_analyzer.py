@@ -136,6 +136,17 @@ class MalwarePatterns:
         re.IGNORECASE,
     )
 
+    # 난독화 점수용 — 따옴표 문자열, _0x 변수, 변수/함수 선언
+    QUOTED_STRING = re.compile(r'["\'][^"\']{2,}["\']')
+    HEX_VARIABLE = re.compile(r'\b_0x[a-f0-9]+\b')
+    VARIABLE_DECL = re.compile(r'\b(?:var|let|const)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)')
+    FUNCTION_DECL = re.compile(r'\bfunction\s+([a-zA-Z_$][a-zA-Z0-9_$]*)')
+
+
+def _count_matches(pattern: re.Pattern, text: str) -> int:
+    """매치 수만 계산 (findall처럼 매치 문자열 리스트를 만들지 않음)"""
+    return sum(1 for _ in pattern.finditer(text))
+
 
 class MalwareAnalyzer:
     """
@@ -351,34 +362,39 @@ class MalwareAnalyzer:
         entropy_score = min(1.0, var_entropy / 5.0) if var_entropy > 2.5 else 0.0
 
         # 2. 문자열 인코딩 비율
-        total_strings = len(re.findall(r'["\'][^"\']{2,}["\']', code))
+        patterns = self._patterns
+        total_strings = _count_matches(patterns.QUOTED_STRING, code)
         encoded_strings = (
-            len(self._patterns.HEX_ENCODED.findall(code))
-            + len(self._patterns.UNICODE_ENCODED.findall(code))
-            + len(self._patterns.BASE64_PAYLOAD.findall(code))
+            _count_matches(patterns.HEX_ENCODED, code)
+            + _count_matches(patterns.UNICODE_ENCODED, code)
+            + _count_matches(patterns.BASE64_PAYLOAD, code)
         )
         encoding_ratio = encoded_strings / max(total_strings, 1)
         details["string_encoding_ratio"] = encoding_ratio
         encoding_score = min(1.0, encoding_ratio * 2.0)
 
         # 3. 코드 밀도 (공백 제거 후 비율)
-        stripped = code.replace(" ", "").replace("\n", "").replace("\t", "")
-        code_density = len(stripped) / max(len(code), 1)
+        # 치환으로 사본을 만들지 않고 공백 문자 수만 셈
+        whitespace = code.count(" ") + code.count("\n") + code.count("\t")
+        code_density = (len(code) - whitespace) / max(len(code), 1)
         details["code_density"] = code_density
         # 매우 높은 밀도 = 미니파이/난독화 (0.95 이상)
         density_score = max(0.0, (code_density - 0.85) / 0.15) if code_density > 0.85 else 0.0
 
         # 4. 평균 줄 길이 (난독화 코드는 매우 긴 줄)
-        lines = code.split("\n")
-        non_empty_lines = [ln for ln in lines if ln.strip()]
-        avg_line_length = (
-            sum(len(ln) for ln in non_empty_lines) / max(len(non_empty_lines), 1)
-        )
+        # 공백뿐인 줄은 제외 (strip() 결과가 비지 않는 줄만)
+        non_empty_count = 0
+        non_empty_length = 0
+        for ln in code.split("\n"):
+            if ln and not ln.isspace():
+                non_empty_count += 1
+                non_empty_length += len(ln)
+        avg_line_length = non_empty_length / max(non_empty_count, 1)
         details["avg_line_length"] = avg_line_length
         line_score = min(1.0, max(0.0, (avg_line_length - 200) / 500))
 
         # 5. _0x 접두사 변수 비율
-        hex_var_count = len(re.findall(r'\b_0x[a-f0-9]+\b', code))
+        hex_var_count = _count_matches(patterns.HEX_VARIABLE, code)
         details["hex_var_count"] = hex_var_count
         hex_var_score = min(1.0, hex_var_count / 20.0)
 
@@ -396,17 +412,9 @@ class MalwareAnalyzer:
 
     def _extract_variable_names(self, code: str) -> list[str]:
         """JavaScript 코드에서 변수명 추출"""
-        # var, let, const 선언에서 변수명 추출
-        var_pattern = re.compile(
-            r'\b(?:var|let|const)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)'
-        )
-        # function 선언에서 함수명 추출
-        func_pattern = re.compile(
-            r'\bfunction\s+([a-zA-Z_$][a-zA-Z0-9_$]*)'
-        )
-
-        var_names = var_pattern.findall(code)
-        func_names = func_pattern.findall(code)
+        # var, let, const 선언의 변수명 + function 선언의 함수명
+        var_names = self._patterns.VARIABLE_DECL.findall(code)
+        func_names = self._patterns.FUNCTION_DECL.findall(code)
         return var_names + func_names
 
     def _names_entropy(self, names: list[str]) -> float:
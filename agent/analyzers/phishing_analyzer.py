@@ -22,6 +22,7 @@ from urllib.parse import urlparse
 
 from agent.core.config import AgentConfig
 from agent.core.agent import ThreatDetail, ThreatLevel, ThreatType
+from agent.utils._edit_distance import levenshtein
 
 logger = logging.getLogger(__name__)
 
@@ -580,8 +581,11 @@ class PhishingAnalyzer:
                 # 정확히 일치하면 안전
                 return {"detected": False, "similar_to": "", "similarity": 0.0}
 
-            distance = self._levenshtein_distance(domain_base, famous)
             max_len = max(len(domain_base), len(famous))
+            # 유사도 0.8 이상 ⇔ 거리 ≤ max_len // 5 — 그보다 먼 후보는 조기 거부
+            distance = self._levenshtein_distance(
+                domain_base, famous, max_distance=max_len // 5
+            )
             similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
 
             if similarity > best_similarity:
@@ -597,27 +601,11 @@ class PhishingAnalyzer:
             "similarity": best_similarity if is_typosquat else 0.0,
         }
 
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
-        """레벤슈타인 편집 거리 계산"""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        prev_row = list(range(len(s2) + 1))
-
-        for i, c1 in enumerate(s1):
-            curr_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                # 삽입, 삭제, 치환 비용 계산
-                insertions = prev_row[j + 1] + 1
-                deletions = curr_row[j] + 1
-                substitutions = prev_row[j] + (0 if c1 == c2 else 1)
-                curr_row.append(min(insertions, deletions, substitutions))
-            prev_row = curr_row
-
-        return prev_row[-1]
+    def _levenshtein_distance(
+        self, s1: str, s2: str, max_distance: Optional[int] = None
+    ) -> int:
+        """레벤슈타인 편집 거리 계산 (rapidfuzz 사용 가능 시 C++ 구현, 상한 초과 시 max_distance + 1)"""
+        return levenshtein(s1, s2, max_distance)
 
     # ============================
     # 엔트로피 계산
@@ -109,6 +109,11 @@ COMPILED_TRACKER_PATTERNS: list[re.Pattern] = [
     re.compile(p, re.IGNORECASE) for p in TRACKER_PATTERNS
 ]
 
+# 전체 추적기 패턴을 하나로 묶은 정규식 — URL을 한 번만 훑어 매칭 여부 판단
+TRACKER_ANY_PATTERN: re.Pattern = re.compile(
+    "|".join(f"(?:{p})" for p in TRACKER_PATTERNS), re.IGNORECASE
+)
+
 
 # ============================================================
 # 핑거프린팅 API 패턴
@@ -343,6 +348,10 @@ class PrivacyAnalyzer:
         Returns:
             매칭된 추적기 패턴명 또는 None
         """
+        # 대부분의 URL은 추적기가 아니므로 통합 패턴 1회 검색으로 먼저 거름
+        if not TRACKER_ANY_PATTERN.search(url):
+            return None
+        # 매칭된 경우에만 목록 순서대로 패턴명 확인
         for i, pattern in enumerate(COMPILED_TRACKER_PATTERNS):
             if pattern.search(url):
                 return TRACKER_PATTERNS[i]
@@ -384,15 +393,13 @@ class PrivacyAnalyzer:
         seen_domains: set[str] = set()
 
         for url in found_urls:
-            for tracker_pattern in COMPILED_TRACKER_PATTERNS:
-                if tracker_pattern.search(url):
-                    domain = urlparse(url).hostname or url
-                    if domain not in seen_domains:
-                        seen_domains.add(domain)
-                        matched_domains.append(domain)
-                        indicators.append(f"추적기 탐지: {domain}")
-                    matched_count += 1
-                    break
+            if TRACKER_ANY_PATTERN.search(url):
+                domain = urlparse(url).hostname or url
+                if domain not in seen_domains:
+                    seen_domains.add(domain)
+                    matched_domains.append(domain)
+                    indicators.append(f"추적기 탐지: {domain}")
+                matched_count += 1
 
         return {
             "count": matched_count,
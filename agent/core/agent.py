@@ -284,6 +284,8 @@ class SecurityAgent:
         """에이전트 종료 및 리소스 해제"""
         logger.info("SecurityAgent 종료 중...")
         self._cache.clear()
+        if self._llm_inference is not None:
+            self._llm_inference.close()
         self._initialized = False
         logger.info("SecurityAgent 종료 완료")
 
@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -41,6 +41,10 @@ class LLMConfig(BaseSettings):
         le=8192,
         description="최대 생성 토큰 수"
     )
+    stream_responses: bool = Field(
+        default=True,
+        description="OpenAI 응답을 스트리밍으로 수신 (False면 전체 응답 대기)"
+    )
     
     # 로컬 모델 폴백 설정
     use_local_fallback: bool = Field(
@@ -51,11 +55,38 @@ class LLMConfig(BaseSettings):
         default="microsoft/DialoGPT-medium",
         description="로컬 폴백 모델명"
     )
+    local_quantization: Literal["none", "int8", "int4"] = Field(
+        default="none",
+        description="CUDA에서 로컬 모델 가중치 양자화 (bitsandbytes)"
+    )
+    local_compile: bool = Field(
+        default=True,
+        description="CUDA에서 로컬 모델을 torch.compile + 정적 KV 캐시로 최적화"
+    )
+    local_max_batch_size: int = Field(
+        default=8,
+        ge=1,
+        description="로컬 모델 동시 요청 배치 최대 크기"
+    )
+    local_batch_window_ms: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="로컬 모델 배치 수집 대기 시간 (밀리초)"
+    )
     
     # 캐싱 설정
     cache_enabled: bool = Field(default=True, description="응답 캐싱 활성화")
     cache_ttl_seconds: int = Field(default=3600, description="캐시 TTL (초)")
     cache_max_size: int = Field(default=1000, description="캐시 최대 항목 수")
+    cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024,  # 16MB
+        description="메모리 캐시 최대 크기 (압축 바이트 기준)"
+    )
+    cache_path: str = Field(
+        default="",
+        description="영구 응답 캐시 SQLite 파일 경로 (빈 값이면 메모리 캐시만 사용)"
+    )
+    cache_disk_max_size: int = Field(default=10000, description="영구 캐시 최대 항목 수")
     
     # 재시도 설정
     max_retries: int = Field(default=3, description="최대 재시도 횟수")
@@ -144,7 +175,19 @@ class ExternalAPIConfig(BaseSettings):
     # API 요청 제한
     rate_limit_per_minute: int = Field(
         default=30,
-        description="분당 최대 API 요청 수"
+        description="API별 분당 최대 요청 수"
+    )
+    gsb_concurrency: int = Field(
+        default=8,
+        description="Google Safe Browsing 최대 동시 요청 수"
+    )
+    vt_concurrency: int = Field(
+        default=4,
+        description="VirusTotal 최대 동시 요청 수"
+    )
+    batch_concurrency: int = Field(
+        default=16,
+        description="일괄 검사 시 동시에 진행하는 URL별 조회 수"
     )
     request_timeout: float = Field(
         default=10.0,
@@ -5,49 +5,250 @@ LLM 추론 엔진
 OpenAI GPT-4 비동기 클라이언트 및 로컬 HuggingFace 모델 폴백을 제공합니다.
 
 주요 기능:
-- 비동기 OpenAI GPT-4 호출 (openai.AsyncOpenAI)
+- 비동기 OpenAI GPT-4 호출 (openai.AsyncOpenAI, 스트리밍 수신)
 - 시스템/유저 메시지 구성 및 구조화된 JSON 출력 (json_mode)
-- 지수 백오프 재시도 (최대 3회, 기본 1초)
-- TTL 기반 응답 캐시 (딕셔너리)
+- 지수 백오프 재시도 (최대 3회, 기본 1초, 지터 + Retry-After 반영)
+- TTL 기반 응답 캐시 (zlib 압축 딕셔너리 + 선택적 SQLite 영구 캐시)
 - tiktoken 기반 토큰 카운팅
-- 로컬 HuggingFace transformers AutoModelForCausalLM 폴백
+- 로컬 HuggingFace transformers AutoModelForCausalLM 폴백 (동시 요청 배치 처리)
 - temperature / max_tokens 설정
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import json
 import logging
+import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from typing import Any, Optional
+import zlib
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
 
 from agent.core.config import LLMConfig
 
 logger = logging.getLogger(__name__)
 
+# 재시도 대기 상한 (초) — 지수 백오프에만 적용 (서버의 Retry-After는 그대로 따름)
+_MAX_RETRY_DELAY = 60.0
+
+# 따를 수 있는 최대 Retry-After (초) — 더 길면 해당 호출의 재시도를 포기
+_MAX_RETRY_AFTER = 300.0
+
+# 재시도 가능한 HTTP 상태 코드 (요청 제한 + 서버 오류)
+_RETRIABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# LLM 응답 내 ```json ... ``` 코드 블록
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*\n?(.*?)\n?\s*```', re.DOTALL)
+
+# 로컬 모델 시스템 프롬프트 토큰 ID 캐시 최대 항목 수
+_LOCAL_PREFIX_CACHE_SIZE = 8
+
+# 로컬 모델 입력 최대 토큰 수
+_LOCAL_MAX_INPUT_TOKENS = 2048
+
+# 텍스트별 토큰 수 메모이제이션 최대 항목 수
+# (시스템 프롬프트는 대부분의 분석에서 재사용됨)
+_TOKEN_COUNT_CACHE_SIZE = 1024
+
+# 캐시 응답 압축용 zlib 프리셋 사전
+# 분석 응답은 짧고 키 구성이 거의 같으므로, 공통 키/값을 미리 넣어두면
+# 사전 없이 압축할 때보다 훨씬 작아집니다.
+_RESPONSE_ZDICT = json.dumps(
+    {
+        "threat_level": ["SAFE", "LOW", "MEDIUM", "HIGH", "CRITICAL", "UNKNOWN"],
+        "threat_types": ["phishing", "malware", "xss", "tracker", "cryptominer"],
+        "confidence": 0.0,
+        "reasoning": "",
+        "indicators": [],
+        "recommendation": "",
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def _compress_response(response: dict[str, Any]) -> bytes:
+    """응답 딕셔너리를 JSON 직렬화 후 zlib (프리셋 사전) 압축"""
+    compressor = zlib.compressobj(zdict=_RESPONSE_ZDICT)
+    raw = json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return compressor.compress(raw) + compressor.flush()
+
+
+def _decompress_response(data: bytes) -> dict[str, Any]:
+    """_compress_response의 역변환"""
+    decompressor = zlib.decompressobj(zdict=_RESPONSE_ZDICT)
+    raw = decompressor.decompress(data) + decompressor.flush()
+    return json.loads(raw)
+
+
+# ============================================================
+# 스트리밍 조기 중단
+# ============================================================
+
+class _StreamAbortedError(Exception):
+    """
+    JSON 모드 스트리밍 응답이 '{'로 시작하지 않아 수신을 중단함
+
+    상태 코드가 없으므로 재시도 가능한 오류로 분류되어 다른 일시적 오류와
+    같이 백오프 후 재시도합니다.
+    """
+
+
+# ============================================================
+# tiktoken 인코딩 (프로세스 전역 공유)
+# ============================================================
+
+@functools.lru_cache(maxsize=8)
+def _encoding_for(model: str) -> Any:
+    """
+    모델명에 맞는 tiktoken 인코딩 반환
+
+    BPE 테이블 로딩 비용이 크므로 모든 LLMInference 인스턴스가 공유합니다.
+    Encoding 객체는 Rust 기반으로 스레드 안전합니다.
+
+    Returns:
+        tiktoken.Encoding 또는 None (tiktoken 미설치)
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken 미설치 — 토큰 수 추정 모드 사용")
+        return None
+
+    # 모델별 인코딩 선택
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        # 알 수 없는 모델이면 cl100k_base 사용 (GPT-4 기본)
+        encoding = tiktoken.get_encoding("cl100k_base")
+
+    logger.debug("tiktoken 인코딩 초기화: %s", encoding.name)
+    return encoding
+
 
 # ============================================================
 # 캐시 항목 데이터 클래스
 # ============================================================
 
 class _CacheEntry:
-    """TTL 기반 응답 캐시 항목"""
+    """TTL 기반 응답 캐시 항목 (응답은 압축된 바이트로 보관)"""
 
-    __slots__ = ("response", "created_at", "ttl")
+    __slots__ = ("data", "created_at", "ttl")
 
-    def __init__(self, response: dict[str, Any], created_at: float, ttl: float) -> None:
-        self.response = response
+    def __init__(self, data: bytes, created_at: float, ttl: float) -> None:
+        self.data = data
         self.created_at = created_at
         self.ttl = ttl
 
+    @property
+    def response(self) -> dict[str, Any]:
+        """압축 해제된 응답 딕셔너리 (호출마다 새 객체)"""
+        return _decompress_response(self.data)
+
     @property
     def is_expired(self) -> bool:
         """TTL 초과 여부 확인"""
         return (time.time() - self.created_at) > self.ttl
 
 
+# ============================================================
+# 영구 캐시 (SQLite)
+# ============================================================
+
+class _DiskCache:
+    """
+    SQLite 기반 영구 응답 캐시
+
+    프로세스 재시작 후에도 LLM 응답을 재사용하기 위한 2차 캐시입니다.
+    동기 API이며, LLMInference에서 executor를 통해 호출합니다.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key      TEXT PRIMARY KEY,
+                    response BLOB NOT NULL,
+                    expires  REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """키로 조회 (만료 항목은 삭제 후 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+        try:
+            return _decompress_response(row[0])
+        except (zlib.error, TypeError, ValueError):
+            return None
+
+    def put(self, key: str, response: dict[str, Any], ttl: float) -> None:
+        """항목 저장 (만료 항목 정리 + 최대 크기 초과분 제거)"""
+        now = time.time()
+        payload = _compress_response(response)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, expires) VALUES (?, ?, ?)",
+                (key, payload, now + ttl),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires < ?", (now,))
+            # 만료가 가장 이른 항목부터 제거
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY expires DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_size,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """영구 캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
 # ============================================================
 # LLM 추론 엔진
 # ============================================================
@@ -74,18 +275,42 @@ class LLMInference:
         # OpenAI 비동기 클라이언트 (지연 초기화)
         self._openai_client: Any = None
 
+        # 마지막으로 사용한 시스템 메시지 (대부분 호출에서 동일하므로 재사용)
+        self._system_message: Optional[dict[str, str]] = None
+
         # 로컬 HuggingFace 모델 (지연 초기화)
         self._local_model: Any = None
         self._local_tokenizer: Any = None
         self._local_model_loaded = False
 
+        # 시스템 프롬프트 → 포맷된 접두부 토큰 ID (LRU, 배치 워커 전용)
+        self._local_prefix_ids: OrderedDict[str, list[int]] = OrderedDict()
+
+        # 로컬 모델 배치 큐 및 워커 (최초 로컬 호출 시 생성)
+        self._local_queue: Optional[asyncio.Queue] = None
+        self._local_worker: Optional[asyncio.Task] = None
+
         # 응답 캐시 (해시 키 → _CacheEntry)
         self._cache: dict[str, _CacheEntry] = {}
+        self._cache_bytes = 0
         self._cache_lock = asyncio.Lock()
 
+        # 영구 캐시 (cache_path 설정 시에만 사용)
+        self._disk_cache: Optional[_DiskCache] = None
+        if self.config.cache_enabled and self.config.cache_path:
+            try:
+                self._disk_cache = _DiskCache(
+                    self.config.cache_path, self.config.cache_disk_max_size
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("영구 캐시 초기화 실패 — 메모리 캐시만 사용: %s", e)
+
         # tiktoken 인코딩 (지연 초기화)
         self._tiktoken_encoding: Any = None
 
+        # 토큰 수 메모이제이션 (텍스트 → 토큰 수, LRU)
+        self._token_counts: OrderedDict[str, int] = OrderedDict()
+
         logger.info(
             "LLMInference 초기화 — 모델: %s, 폴백: %s",
             self.config.model_name,
@@ -175,12 +400,23 @@ class LLMInference:
         Returns:
             토큰 수
         """
-        encoding = self._get_tiktoken_encoding()
-        if encoding is not None:
-            return len(encoding.encode(text))
+        return self._count_tokens_memoized([text])[0]
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        여러 텍스트의 토큰 수를 한 번에 계산 (비용 계획용)
 
-        # tiktoken 사용 불가 시 대략적 추정 (4자 ≈ 1토큰)
-        return len(text) // 4
+        count_tokens와 같은 메모이제이션 경로를 사용하며, 캐시에 없는 텍스트는
+        tiktoken encode_batch로 일괄 인코딩합니다.
+
+        Args:
+            texts: 토큰 수를 셀 텍스트 목록
+
+        Returns:
+            토큰 수 배열 (shape: [N], dtype: int32)
+        """
+        counts = self._count_tokens_memoized(list(texts))
+        return np.fromiter(counts, dtype=np.int32, count=len(counts))
 
     def count_messages_tokens(
         self, system_prompt: str, user_prompt: str
@@ -201,8 +437,9 @@ class LLMInference:
         overhead_per_message = 4
         reply_priming = 3
 
-        system_tokens = self.count_tokens(system_prompt) + overhead_per_message
-        user_tokens = self.count_tokens(user_prompt) + overhead_per_message
+        system_count, user_count = self._count_tokens_memoized([system_prompt, user_prompt])
+        system_tokens = system_count + overhead_per_message
+        user_tokens = user_count + overhead_per_message
 
         return system_tokens + user_tokens + reply_priming
 
@@ -238,16 +475,41 @@ class LLMInference:
         }
 
     async def clear_cache(self) -> None:
-        """응답 캐시 전체 삭제"""
+        """응답 캐시 전체 삭제 (영구 캐시 포함)"""
         async with self._cache_lock:
             self._cache.clear()
-            logger.info("LLM 응답 캐시 초기화 완료")
+            self._cache_bytes = 0
+        if self._disk_cache is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_cache.clear)
+        logger.info("LLM 응답 캐시 초기화 완료")
+
+    def close(self) -> None:
+        """로컬 배치 워커 및 영구 캐시 연결 종료"""
+        if self._local_worker is not None:
+            # 워커가 처리 중이던 배치는 워커의 취소 처리에서, 큐에 남은 요청은
+            # 여기서 결과 없음으로 종료 (대기 중인 _submit_local이 멈추지 않도록)
+            self._local_worker.cancel()
+            self._local_worker = None
+            queue, self._local_queue = self._local_queue, None
+            pending = []
+            while not queue.empty():
+                pending.append(queue.get_nowait()[3])
+            self._resolve_local_futures(pending)
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
 
     @property
     def cache_size(self) -> int:
         """현재 캐시 항목 수"""
         return len(self._cache)
 
+    @property
+    def cache_bytes(self) -> int:
+        """현재 메모리 캐시가 보관 중인 압축 응답 크기 (바이트)"""
+        return self._cache_bytes
+
     # ============================
     # OpenAI API 호출
     # ============================
@@ -295,23 +557,20 @@ class LLMInference:
         last_error: Optional[Exception] = None
         for attempt in range(self.config.max_retries):
             try:
-                # 비동기 ChatCompletion 호출
-                completion = await client.chat.completions.create(
-                    model=self.config.model_name,
+                # 비동기 ChatCompletion 호출 및 콘텐츠 수신
+                content = await self._fetch_completion(
+                    client,
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
                     response_format=response_format,
                 )
-
-                # 응답에서 콘텐츠 추출
-                content = completion.choices[0].message.content
                 if not content:
                     logger.warning("OpenAI 응답 콘텐츠가 비어 있음 (시도 %d)", attempt + 1)
                     continue
 
                 # JSON 파싱
-                parsed = self._parse_json_response(content)
+                parsed = self._parse_json_response(content, json_mode=json_mode)
                 if parsed is not None:
                     logger.debug(
                         "OpenAI 호출 성공 (시도 %d, 모델: %s)",
@@ -331,9 +590,20 @@ class LLMInference:
                     attempt + 1, self.config.max_retries, e,
                 )
 
-                # 마지막 시도가 아니면 지수 백오프 대기
+                # 영구 오류 (인증 실패, 잘못된 요청 등)는 재시도하지 않음
+                if not self._is_retriable_error(e):
+                    logger.error("재시도 불가능한 OpenAI 오류 — 즉시 중단")
+                    break
+
+                # 마지막 시도가 아니면 지수 백오프 + 지터 대기
                 if attempt < self.config.max_retries - 1:
-                    delay = self.config.retry_base_delay * (2 ** attempt)
+                    delay = self._compute_retry_delay(attempt, e)
+                    if delay is None:
+                        logger.error(
+                            "서버 요청 대기 시간(Retry-After)이 %.0f초를 넘음 — 재시도 중단",
+                            _MAX_RETRY_AFTER,
+                        )
+                        break
                     logger.debug("재시도 대기: %.1f초", delay)
                     await asyncio.sleep(delay)
 
@@ -343,6 +613,148 @@ class LLMInference:
         )
         return None
 
+    async def _fetch_completion(
+        self,
+        client: Any,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict[str, str]],
+    ) -> Optional[str]:
+        """
+        ChatCompletion 호출 후 응답 콘텐츠 반환
+
+        stream_responses가 켜져 있으면 토큰을 스트리밍으로 수신합니다.
+        JSON 모드에서 첫 문자가 '{'가 아니면 잘못된 출력으로 보고
+        나머지 생성을 기다리지 않고 즉시 중단합니다.
+
+        Returns:
+            응답 텍스트 또는 None (빈 응답)
+
+        Raises:
+            _StreamAbortedError: JSON 모드 스트리밍 응답을 조기 중단한 경우
+        """
+        if not self.config.stream_responses:
+            completion = await client.chat.completions.create(
+                model=self.config.model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+            )
+            return completion.choices[0].message.content
+
+        stream = await client.chat.completions.create(
+            model=self.config.model_name,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            stream=True,
+        )
+
+        parts: list[str] = []
+        checked_start = response_format is None
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+
+                # JSON 모드 조기 검증 — 선행 공백 이후 첫 문자 확인
+                if not checked_start:
+                    head = "".join(parts).lstrip()
+                    if head:
+                        if head[0] != "{":
+                            raise _StreamAbortedError(
+                                f"JSON 모드 응답이 '{{'로 시작하지 않음 — 수신 중단: {head[:50]!r}"
+                            )
+                        checked_start = True
+        finally:
+            await stream.close()
+
+        return "".join(parts)
+
+    def _compute_retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        재시도 대기 시간 계산
+
+        지수 백오프에 지터를 더해 동시 재시도가 한 시점에 몰리지 않도록 하며
+        (_MAX_RETRY_DELAY 상한), 서버가 Retry-After 헤더를 보낸 경우 그 값을
+        상한과 무관하게 최소 대기 시간으로 사용합니다 (요청보다 일찍 재시도하지 않음).
+
+        Args:
+            attempt: 현재 시도 번호 (0부터 시작)
+            error: 발생한 예외
+
+        Returns:
+            대기 시간 (초) 또는 None (Retry-After가 _MAX_RETRY_AFTER 초과 — 재시도 포기)
+        """
+        base = min(_MAX_RETRY_DELAY, self.config.retry_base_delay * (2 ** attempt))
+        delay = min(base + random.uniform(0, base / 2), _MAX_RETRY_DELAY)
+
+        retry_after = self._parse_retry_after(error)
+        if retry_after is not None:
+            if retry_after > _MAX_RETRY_AFTER:
+                return None
+            delay = max(delay, retry_after)
+
+        return delay
+
+    @staticmethod
+    def _is_retriable_error(error: Exception) -> bool:
+        """
+        재시도 가능한 오류인지 판별
+
+        상태 코드가 없는 오류 (타임아웃, 연결 실패)와 429/5xx 응답은 재시도하고,
+        그 외 4xx (인증 실패, 잘못된 요청 등)는 영구 오류로 간주합니다.
+        """
+        status_code = getattr(error, "status_code", None)
+        if not isinstance(status_code, int):
+            return True
+        return status_code in _RETRIABLE_STATUS_CODES or status_code >= 500
+
+    @staticmethod
+    def _parse_retry_after(error: Exception) -> Optional[float]:
+        """
+        예외의 HTTP 응답에서 Retry-After 대기 시간 추출
+
+        retry-after-ms (밀리초), retry-after (초 또는 HTTP 날짜)를 순서대로 확인합니다.
+
+        Returns:
+            대기 시간 (초) 또는 None (헤더 없음/파싱 실패)
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return max(0.0, float(retry_after_ms) / 1000)
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        # HTTP 날짜 형식 (예: "Wed, 21 Oct 2026 07:28:00 GMT")
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
     def _get_openai_client(self) -> Any:
         """OpenAI 비동기 클라이언트 지연 초기화"""
         if self._openai_client is not None:
@@ -366,6 +778,9 @@ class LLMInference:
         """
         OpenAI ChatCompletion 메시지 배열 구성
 
+        시스템 메시지 딕셔너리는 시스템 프롬프트가 바뀔 때만 새로 만듭니다.
+        클라이언트는 메시지를 직렬화만 하므로 공유해도 안전합니다.
+
         Args:
             system_prompt: 시스템 역할 메시지
             user_prompt: 사용자 입력 메시지
@@ -373,22 +788,24 @@ class LLMInference:
         Returns:
             메시지 딕셔너리 리스트
         """
-        messages: list[dict[str, str]] = []
+        # 사용자 메시지 (분석 대상)
+        user_message = {
+            "role": "user",
+            "content": user_prompt,
+        }
+        if not system_prompt:
+            return [user_message]
 
         # 시스템 메시지 (역할/규칙 정의)
-        if system_prompt:
-            messages.append({
+        system_message = self._system_message
+        if system_message is None or system_message["content"] != system_prompt:
+            system_message = {
                 "role": "system",
                 "content": system_prompt,
-            })
-
-        # 사용자 메시지 (분석 대상)
-        messages.append({
-            "role": "user",
-            "content": user_prompt,
-        })
+            }
+            self._system_message = system_message
 
-        return messages
+        return [system_message, user_message]
 
     # ============================
     # 로컬 HuggingFace 모델 폴백
@@ -405,7 +822,8 @@ class LLMInference:
         로컬 HuggingFace transformers 모델 폴백
 
         AutoModelForCausalLM을 사용하여 로컬에서 추론합니다.
-        CPU/GPU 자동 감지하며, 비동기 실행을 위해 executor를 사용합니다.
+        CPU/GPU 자동 감지하며, 동시에 들어온 요청은 배치 워커가 모아서
+        한 번의 generate() 호출로 처리합니다.
 
         Args:
             system_prompt: 시스템 프롬프트
@@ -425,17 +843,9 @@ class LLMInference:
                 logger.error("로컬 모델이 로드되지 않음")
                 return None
 
-            # 프롬프트 결합
-            combined_prompt = self._format_local_prompt(system_prompt, user_prompt)
-
-            # 블로킹 추론을 executor에서 실행
-            loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._generate_local,
-                combined_prompt,
-                temperature,
-                max_tokens,
+            # 배치 워커에 요청 전달 후 결과 대기
+            result = await self._submit_local(
+                system_prompt, user_prompt, temperature, max_tokens
             )
 
             if result is None:
@@ -482,25 +892,56 @@ class LLMInference:
             # executor에서 블로킹 로딩 실행
             loop = asyncio.get_running_loop()
 
+            # 정밀도 선택 — CUDA는 bf16 우선 (fp16보다 수치 안정적)
+            if device == "cuda" and torch.cuda.is_bf16_supported():
+                dtype = torch.bfloat16
+            elif device != "cpu":
+                dtype = torch.float16
+            else:
+                dtype = torch.float32
+
+            # 가중치 양자화 설정 (CUDA 전용, bitsandbytes 필요)
+            quantization_config = None
+            if device == "cuda" and self.config.local_quantization != "none":
+                quantization_config = self._make_quantization_config(dtype)
+
+            load_kwargs: dict[str, Any] = {
+                "trust_remote_code": True,
+                "device_map": "auto" if device != "cpu" else None,
+            }
+            if quantization_config is not None:
+                load_kwargs["quantization_config"] = quantization_config
+            else:
+                load_kwargs["torch_dtype"] = dtype
+
             def _load() -> tuple:
                 tokenizer = AutoTokenizer.from_pretrained(
                     model_name, trust_remote_code=True
                 )
                 model = AutoModelForCausalLM.from_pretrained(
-                    model_name,
-                    trust_remote_code=True,
-                    torch_dtype=torch.float16 if device != "cpu" else torch.float32,
-                    device_map="auto" if device != "cpu" else None,
+                    model_name, **load_kwargs
                 )
                 if device == "cpu":
                     model = model.to(device)
+                model.eval()
+                # 양자화 모델은 torch.compile 대상에서 제외
+                if (
+                    device == "cuda"
+                    and self.config.local_compile
+                    and quantization_config is None
+                ):
+                    self._compile_local_model(model, tokenizer)
                 return tokenizer, model
 
             self._local_tokenizer, self._local_model = await loop.run_in_executor(
                 None, _load
             )
             self._local_model_loaded = True
-            logger.info("로컬 모델 로딩 완료: %s (%s)", model_name, device)
+            logger.info(
+                "로컬 모델 로딩 완료: %s (%s, 양자화: %s)",
+                model_name, device,
+                self.config.local_quantization if quantization_config is not None else "none",
+            )
 
         except ImportError as e:
             logger.error(
@@ -511,29 +952,198 @@ class LLMInference:
             logger.error("로컬 모델 로딩 실패: %s", e)
             self._local_model_loaded = True  # 재시도 방지
 
-    def _generate_local(
-        self, prompt: str, temperature: float, max_tokens: int
+    def _make_quantization_config(self, compute_dtype: Any) -> Any:
+        """
+        bitsandbytes 양자화 설정 생성
+
+        int4는 NF4 + 지정한 연산 정밀도, int8은 LLM.int8()을 사용합니다.
+        bitsandbytes가 없으면 None을 반환하여 비양자화 로딩으로 폴백합니다.
+
+        Args:
+            compute_dtype: int4 연산에 사용할 torch dtype
+
+        Returns:
+            transformers.BitsAndBytesConfig 또는 None
+        """
+        try:
+            import bitsandbytes  # noqa: F401
+            from transformers import BitsAndBytesConfig
+        except ImportError:
+            logger.warning(
+                "bitsandbytes 미설치 — 양자화 없이 로딩: pip install bitsandbytes"
+            )
+            return None
+
+        if self.config.local_quantization == "int4":
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=compute_dtype,
+                bnb_4bit_quant_type="nf4",
+            )
+        return BitsAndBytesConfig(load_in_8bit=True)
+
+    @staticmethod
+    def _compile_local_model(model: Any, tokenizer: Any) -> None:
+        """
+        로컬 모델 forward를 torch.compile로 컴파일 (동기 — 로딩 executor에서 호출)
+
+        정적 KV 캐시를 사용해 디코딩 단계의 텐서 형태를 고정하고,
+        더미 생성 1회로 컴파일을 미리 수행하여 첫 요청 지연을 없앱니다.
+        실패하면 eager 모드로 그대로 사용합니다.
+        """
+        original_forward = model.forward
+        try:
+            import torch
+
+            model.generation_config.cache_implementation = "static"
+            model.forward = torch.compile(
+                model.forward, mode="reduce-overhead", fullgraph=True
+            )
+
+            # 워밍업 — 컴파일을 요청 경로 밖에서 트리거
+            device = next(model.parameters()).device
+            inputs = tokenizer("warmup", return_tensors="pt").to(device)
+            with torch.no_grad():
+                model.generate(
+                    **inputs,
+                    max_new_tokens=4,
+                    do_sample=False,
+                    pad_token_id=tokenizer.eos_token_id,
+                )
+            logger.info("로컬 모델 torch.compile 완료 (정적 KV 캐시)")
+
+        except Exception as e:
+            logger.warning("로컬 모델 컴파일 실패 — eager 모드 사용: %s", e)
+            model.generation_config.cache_implementation = None
+            model.forward = original_forward
+
+    async def _submit_local(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
     ) -> Optional[str]:
         """
-        로컬 모델에서 텍스트 생성 (동기 — executor에서 호출)
+        로컬 생성 요청을 배치 큐에 넣고 결과를 기다림
 
         Args:
-            prompt: 입력 프롬프트
+            system_prompt: 시스템 프롬프트
+            user_prompt: 사용자 프롬프트
             temperature: 생성 온도
             max_tokens: 최대 생성 토큰
 
         Returns:
             생성된 텍스트 또는 None
         """
+        loop = asyncio.get_running_loop()
+
+        # 워커 지연 시작 (현재 이벤트 루프에 바인딩)
+        if self._local_worker is None or self._local_worker.done():
+            self._local_queue = asyncio.Queue()
+            self._local_worker = loop.create_task(
+                self._local_batch_worker(self._local_queue)
+            )
+
+        future: asyncio.Future = loop.create_future()
+        await self._local_queue.put(
+            ((system_prompt, user_prompt), temperature, max_tokens, future)
+        )
+        return await future
+
+    async def _local_batch_worker(self, queue: asyncio.Queue) -> None:
+        """
+        로컬 모델 배치 워커
+
+        첫 요청이 도착하면 batch window 동안 추가 요청을 모은 뒤,
+        생성 파라미터가 같은 요청끼리 묶어 한 번에 생성합니다.
+        이전 배치를 생성하는 동안 쌓인 요청은 다음 배치가 됩니다.
+        """
+        loop = asyncio.get_running_loop()
+        max_batch = self.config.local_max_batch_size
+        window = self.config.local_batch_window_ms / 1000
+
+        batch: list[tuple[tuple[str, str], float, int, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+
+                # batch window 동안 추가 요청 수집
+                deadline = loop.time() + window
+                while len(batch) < max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # 생성 파라미터별로 그룹화
+                groups: dict[
+                    tuple[float, int], list[tuple[tuple[str, str], asyncio.Future]]
+                ] = {}
+                for prompt, temperature, max_tokens, future in batch:
+                    if not future.cancelled():
+                        groups.setdefault((temperature, max_tokens), []).append((prompt, future))
+
+                for (temperature, max_tokens), items in groups.items():
+                    prompts = [prompt for prompt, _ in items]
+                    try:
+                        results = await loop.run_in_executor(
+                            None, self._generate_local_batch, prompts, temperature, max_tokens
+                        )
+                    except Exception as e:
+                        logger.error("로컬 배치 생성 실패: %s", e)
+                        results = [None] * len(items)
+
+                    for (_, future), result in zip(items, results):
+                        if not future.done():
+                            future.set_result(result)
+        except asyncio.CancelledError:
+            # close()로 워커 취소 — 수집/생성 중이던 요청은 결과 없음으로 종료
+            self._resolve_local_futures(item[3] for item in batch)
+            raise
+
+    @staticmethod
+    def _resolve_local_futures(futures: Iterable[asyncio.Future]) -> None:
+        """아직 끝나지 않은 로컬 생성 요청을 결과 없음(None)으로 종료"""
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
+
+    def _generate_local_batch(
+        self, prompts: list[tuple[str, str]], temperature: float, max_tokens: int
+    ) -> list[Optional[str]]:
+        """
+        로컬 모델에서 여러 프롬프트를 한 번에 생성 (동기 — executor에서 호출)
+
+        Args:
+            prompts: (시스템 프롬프트, 사용자 프롬프트) 목록
+            temperature: 생성 온도
+            max_tokens: 최대 생성 토큰
+
+        Returns:
+            프롬프트 순서대로 생성된 텍스트 (실패 항목은 None)
+        """
         try:
             import torch
 
-            # 토크나이즈
-            inputs = self._local_tokenizer(
-                prompt,
+            # 디코더 전용 모델은 왼쪽 패딩이어야 생성 위치가 정렬됨
+            tokenizer = self._local_tokenizer
+            tokenizer.padding_side = "left"
+            if tokenizer.pad_token_id is None:
+                tokenizer.pad_token = tokenizer.eos_token
+
+            # 토크나이즈 — 시스템 접두부는 캐시된 토큰 ID 재사용
+            input_ids = [
+                self._tokenize_local_prompt(system_prompt, user_prompt)
+                for system_prompt, user_prompt in prompts
+            ]
+            inputs = tokenizer.pad(
+                {"input_ids": input_ids},
+                padding=True,
                 return_tensors="pt",
-                truncation=True,
-                max_length=2048,
             )
 
             # 모델 디바이스로 이동
@@ -544,7 +1154,7 @@ class LLMInference:
             gen_kwargs: dict[str, Any] = {
                 "max_new_tokens": min(max_tokens, 1024),
                 "do_sample": temperature > 0.0,
-                "pad_token_id": self._local_tokenizer.eos_token_id,
+                "pad_token_id": tokenizer.pad_token_id,
             }
             if temperature > 0.0:
                 gen_kwargs["temperature"] = temperature
@@ -558,73 +1168,131 @@ class LLMInference:
 
             # 입력 토큰 이후의 생성 부분만 디코딩
             input_length = inputs["input_ids"].shape[1]
-            generated_ids = output_ids[0][input_length:]
-            generated_text = self._local_tokenizer.decode(
-                generated_ids, skip_special_tokens=True
+            generated_texts = tokenizer.batch_decode(
+                output_ids[:, input_length:], skip_special_tokens=True
             )
 
-            return generated_text.strip() if generated_text else None
+            return [text.strip() or None for text in generated_texts]
 
         except Exception as e:
             logger.error("로컬 모델 생성 실패: %s", e)
-            return None
+            return [None] * len(prompts)
 
-    def _format_local_prompt(self, system_prompt: str, user_prompt: str) -> str:
+    def _tokenize_local_prompt(self, system_prompt: str, user_prompt: str) -> list[int]:
         """
-        로컬 모델용 프롬프트 포맷팅
+        로컬 모델 입력 토큰 ID 생성
 
-        ChatML 형식으로 시스템/사용자 메시지를 결합합니다.
+        시스템 접두부는 시스템 프롬프트별로 한 번만 토크나이즈하여 캐시하고,
+        매 요청마다 사용자 부분만 토크나이즈해 이어 붙입니다.
         """
-        parts: list[str] = []
+        prefix_ids = self._local_prefix_ids.get(system_prompt)
+        if prefix_ids is None:
+            prefix_ids = self._local_tokenizer(
+                self._format_local_system(system_prompt)
+            )["input_ids"]
+            self._local_prefix_ids[system_prompt] = prefix_ids
+            if len(self._local_prefix_ids) > _LOCAL_PREFIX_CACHE_SIZE:
+                self._local_prefix_ids.popitem(last=False)
+        else:
+            self._local_prefix_ids.move_to_end(system_prompt)
+
+        user_ids = self._local_tokenizer(
+            self._format_local_user(user_prompt), add_special_tokens=False
+        )["input_ids"]
+
+        return (prefix_ids + user_ids)[:_LOCAL_MAX_INPUT_TOKENS]
 
-        if system_prompt:
-            parts.append(f"<|system|>\n{system_prompt}\n</|system|>")
+    @staticmethod
+    def _format_local_system(system_prompt: str) -> str:
+        """
+        로컬 모델용 시스템 접두부 포맷팅 (ChatML 형식)
 
-        parts.append(f"<|user|>\n{user_prompt}\n</|user|>")
-        parts.append("<|assistant|>")
+        시스템 프롬프트가 비어 있으면 빈 문자열을 반환합니다.
+        """
+        if not system_prompt:
+            return ""
+        return f"<|system|>\n{system_prompt}\n</|system|>\n"
 
-        return "\n".join(parts)
+    @staticmethod
+    def _format_local_user(user_prompt: str) -> str:
+        """로컬 모델용 사용자 메시지 + 어시스턴트 프라이밍 포맷팅 (ChatML 형식)"""
+        return f"<|user|>\n{user_prompt}\n</|user|>\n<|assistant|>"
 
     # ============================
     # 토큰 카운팅
     # ============================
 
-    def _get_tiktoken_encoding(self) -> Any:
-        """tiktoken 인코딩 객체 지연 초기화"""
-        if self._tiktoken_encoding is not None:
-            return self._tiktoken_encoding
+    def _count_tokens_memoized(self, texts: list[str]) -> list[int]:
+        """
+        여러 텍스트의 토큰 수를 한 번에 계산 (토큰 수 계산의 유일한 인코딩 경로)
 
-        try:
-            import tiktoken
+        메모이제이션된 텍스트는 재계산하지 않으며, 나머지는
+        tiktoken encode_batch로 일괄 인코딩합니다 (Rust 코어, GIL 해제).
 
-            # 모델별 인코딩 선택
-            model = self.config.model_name
-            try:
-                self._tiktoken_encoding = tiktoken.encoding_for_model(model)
-            except KeyError:
-                # 알 수 없는 모델이면 cl100k_base 사용 (GPT-4 기본)
-                self._tiktoken_encoding = tiktoken.get_encoding("cl100k_base")
+        Args:
+            texts: 토큰 수를 셀 텍스트 목록
+
+        Returns:
+            입력 순서와 같은 토큰 수 목록
+        """
+        encoding = self._get_tiktoken_encoding()
+        if encoding is None:
+            # tiktoken 사용 불가 시 대략적 추정 (4자 ≈ 1토큰)
+            return [len(text) // 4 for text in texts]
+
+        counts: list[int] = [0] * len(texts)
+        missing: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            cached = self._token_counts.get(text)
+            if cached is not None:
+                self._token_counts.move_to_end(text)
+                counts[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
 
-            logger.debug("tiktoken 인코딩 초기화: %s", self._tiktoken_encoding.name)
-            return self._tiktoken_encoding
+        if missing:
+            pending = list(missing)
+            if len(pending) == 1:
+                encoded = [encoding.encode(pending[0])]
+            else:
+                encoded = encoding.encode_batch(
+                    pending, num_threads=min(len(pending), os.cpu_count() or 1)
+                )
 
-        except ImportError:
-            logger.warning("tiktoken 미설치 — 토큰 수 추정 모드 사용")
-            return None
+            for text, tokens in zip(pending, encoded):
+                count = len(tokens)
+                for i in missing[text]:
+                    counts[i] = count
+
+                self._token_counts[text] = count
+                if len(self._token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+                    self._token_counts.popitem(last=False)
+
+        return counts
+
+    def _get_tiktoken_encoding(self) -> Any:
+        """tiktoken 인코딩 객체 지연 초기화 (프로세스 전역 공유)"""
+        if self._tiktoken_encoding is None:
+            self._tiktoken_encoding = _encoding_for(self.config.model_name)
+        return self._tiktoken_encoding
 
     # ============================
     # JSON 응답 파싱
     # ============================
 
     @staticmethod
-    def _parse_json_response(content: str) -> Optional[dict[str, Any]]:
+    def _parse_json_response(
+        content: str, json_mode: bool = False
+    ) -> Optional[dict[str, Any]]:
         """
         LLM 응답에서 JSON 객체 추출 및 파싱
 
         순수 JSON, ```json 블록, 혼합 텍스트 내 JSON을 모두 처리합니다.
+        JSON 모드 응답은 순수 JSON이 보장되므로 직접 파싱만 시도합니다.
 
         Args:
             content: LLM 응답 텍스트
+            json_mode: JSON 모드 응답 여부 (True면 코드 블록/중괄호 추출 생략)
 
         Returns:
             파싱된 딕셔너리 또는 None
@@ -634,17 +1302,20 @@ class LLMInference:
 
         content = content.strip()
 
-        # 1차 시도: 직접 JSON 파싱
-        try:
-            result = json.loads(content)
-            if isinstance(result, dict):
-                return result
-        except json.JSONDecodeError:
-            pass
+        # 1차 시도: 직접 JSON 파싱 (JSON으로 시작할 때만)
+        if json_mode or content.startswith(("{", "[")):
+            try:
+                result = json.loads(content)
+                if isinstance(result, dict):
+                    return result
+            except json.JSONDecodeError:
+                pass
+
+        if json_mode:
+            return None
 
         # 2차 시도: ```json ... ``` 블록 추출
-        import re
-        json_block = re.search(r'```(?:json)?\s*\n?(.*?)\n?\s*```', content, re.DOTALL)
+        json_block = _JSON_FENCE_RE.search(content)
         if json_block:
             try:
                 result = json.loads(json_block.group(1).strip())
@@ -674,35 +1345,90 @@ class LLMInference:
         self, system_prompt: str, user_prompt: str,
         temperature: float, max_tokens: int,
     ) -> str:
-        """프롬프트 기반 캐시 키 생성 (SHA-256 해시)"""
-        key_data = f"{system_prompt}|{user_prompt}|{temperature}|{max_tokens}"
-        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+        """
+        프롬프트 기반 캐시 키 생성 (SHA-256 해시)
+
+        두 프롬프트를 하나의 문자열로 합치지 않고 해시에 순서대로 공급합니다.
+        결과는 "system|user|temperature|max_tokens" 문자열의 해시와 같습니다.
+        """
+        hasher = hashlib.sha256(system_prompt.encode("utf-8"))
+        hasher.update(b"|")
+        hasher.update(user_prompt.encode("utf-8"))
+        hasher.update(f"|{temperature}|{max_tokens}".encode("utf-8"))
+        return hasher.hexdigest()
 
     async def _get_cached(self, key: str) -> Optional[dict[str, Any]]:
-        """캐시에서 응답 조회 (TTL 만료 확인)"""
-        async with self._cache_lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
-            if entry.is_expired:
-                del self._cache[key]
-                return None
-            return entry.response
+        """
+        캐시에서 응답 조회 (TTL 만료 확인, 메모리 미스 시 영구 캐시 조회)
+
+        조회는 락 없이 수행하고, 만료 항목 제거 시에만 락을 잡습니다.
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            if not entry.is_expired:
+                return entry.response
+
+            async with self._cache_lock:
+                # 락 대기 중 다른 코루틴이 갱신했을 수 있으므로 같은 항목일 때만 제거
+                if self._cache.get(key) is entry:
+                    del self._cache[key]
+                    self._cache_bytes -= len(entry.data)
+
+        if self._disk_cache is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(None, self._disk_cache.get, key)
+        except sqlite3.Error as e:
+            # 잠긴/손상된 캐시 파일 또는 close()와의 경합 — 캐시 미스로 처리
+            logger.warning("영구 캐시 조회 실패: %s", e)
+            return None
+        if response is not None:
+            # 영구 캐시 히트 → 메모리 캐시로 승격
+            await self._set_memory_cached(key, response)
+        return response
 
     async def _set_cached(self, key: str, response: dict[str, Any]) -> None:
-        """응답을 캐시에 저장 (최대 크기 제한)"""
+        """응답을 캐시에 저장 (메모리 + 영구 캐시)"""
+        await self._set_memory_cached(key, response)
+
+        if self._disk_cache is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    None,
+                    self._disk_cache.put,
+                    key,
+                    response,
+                    float(self.config.cache_ttl_seconds),
+                )
+            except sqlite3.Error as e:
+                logger.warning("영구 캐시 저장 실패: %s", e)
+
+    async def _set_memory_cached(self, key: str, response: dict[str, Any]) -> None:
+        """응답을 압축하여 메모리 캐시에 저장 (항목 수 + 바이트 크기 제한)"""
+        data = _compress_response(response)
+
         async with self._cache_lock:
-            # 캐시 크기 제한
-            if len(self._cache) >= self.config.cache_max_size:
-                # 가장 오래된 항목 제거 (FIFO)
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= len(previous.data)
+
+            # 캐시 크기 제한 — 가장 오래된 항목부터 제거 (FIFO)
+            while self._cache and (
+                len(self._cache) >= self.config.cache_max_size
+                or self._cache_bytes + len(data) > self.config.cache_max_bytes
+            ):
                 oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
+                self._cache_bytes -= len(self._cache.pop(oldest_key).data)
 
             self._cache[key] = _CacheEntry(
-                response=response,
+                data=data,
                 created_at=time.time(),
                 ttl=float(self.config.cache_ttl_seconds),
             )
+            self._cache_bytes += len(data)
 
     # ============================
     # 매직 메서드
@@ -0,0 +1,214 @@
+"""편집 거리 유닛 테스트 (순수 Python 폴백 경로)"""
+import random
+from typing import Optional
+
+import pytest
+
+from agent.utils import _edit_distance
+from agent.utils._edit_distance import (
+    _BIT_PARALLEL_MAX_LEN,
+    _histogram_lower_bound,
+    _levenshtein_banded,
+    _levenshtein_bit_parallel,
+    _levenshtein_dp,
+    levenshtein,
+)
+
+# === 헬퍼 ===
+
+
+def _reference(s1: str, s2: str) -> int:
+    """전체 행렬을 채우는 기준 레벤슈타인 DP"""
+    rows = [[0] * (len(s2) + 1) for _ in range(len(s1) + 1)]
+    for i in range(len(s1) + 1):
+        rows[i][0] = i
+    for j in range(len(s2) + 1):
+        rows[0][j] = j
+    for i in range(1, len(s1) + 1):
+        for j in range(1, len(s2) + 1):
+            rows[i][j] = min(
+                rows[i - 1][j] + 1,
+                rows[i][j - 1] + 1,
+                rows[i - 1][j - 1] + (s1[i - 1] != s2[j - 1]),
+            )
+    return rows[-1][-1]
+
+
+def _bounded(distance: int, max_distance: Optional[int]) -> int:
+    """상한 적용 시 기대값 (초과하면 max_distance + 1)"""
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+    return distance
+
+
+@pytest.fixture(autouse=True)
+def _no_rapidfuzz(monkeypatch):
+    """rapidfuzz 설치 여부와 무관하게 순수 Python 폴백 경로를 검사"""
+    monkeypatch.setattr(_edit_distance, "_RapidLevenshtein", None)
+
+
+def _mutate(rng: random.Random, text: str, edits: int, alphabet: str) -> str:
+    """임의 위치에 삽입/삭제/치환을 edits번 적용"""
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        pos = rng.randrange(len(chars) + 1)
+        if op == 0 or not chars:
+            chars.insert(pos, rng.choice(alphabet))
+        elif op == 1:
+            del chars[min(pos, len(chars) - 1)]
+        else:
+            chars[min(pos, len(chars) - 1)] = rng.choice(alphabet)
+    return "".join(chars)
+
+
+ASCII = "abcdefghij0123456789-."
+NON_ASCII = "가나다라마바사아éüß😀"
+
+# 경계 사례 (빈 문자열, 64/65자, 비ASCII, 동일 문자열)
+EDGE_PAIRS = [
+    ("", ""),
+    ("", "abc"),
+    ("abc", ""),
+    ("a" * 64, ""),
+    ("a" * 65, "a" * 64),
+    ("a" * 64, "b" * 64),
+    ("a" * 64, "a" * 63 + "b"),
+    ("ab" * 32, "ba" * 32),
+    ("x" * 65, "x" * 65),
+    ("x" * 65, "y" + "x" * 64),
+    ("abc" * 22, "abd" * 22),
+    ("구글", "구굴"),
+    ("naver.com", "nävér.com"),
+    ("😀" * 64, "😀" * 63 + "😃"),
+    ("paypal", "paypa1"),
+    ("kitten", "sitting"),
+]
+
+
+def _random_pairs(seed: int, count: int, lengths: tuple[int, ...], alphabet: str):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        base = "".join(rng.choice(alphabet) for _ in range(rng.choice(lengths)))
+        pairs.append((base, _mutate(rng, base, rng.randrange(0, 12), alphabet)))
+    return pairs
+
+
+RANDOM_PAIRS = (
+    _random_pairs(1, 150, (0, 1, 5, 12, 63, 64, 65), ASCII)
+    + _random_pairs(2, 100, (3, 10, 64, 65, 80), NON_ASCII)
+    + _random_pairs(3, 60, (100, 130), "ab")
+)
+
+
+# === 각 폴백 구현 vs 기준 DP ===
+
+class TestFallbacks:
+    """비트 병렬 / 배열 DP / 밴드 DP를 기준 DP와 비교"""
+
+    @pytest.mark.parametrize("s1,s2", EDGE_PAIRS + RANDOM_PAIRS)
+    def test_unbounded(self, s1, s2):
+        """상한 없는 거리 — 세 구현 모두 기준 DP와 같음"""
+        expected = _reference(s1, s2)
+        assert _levenshtein_dp(s1, s2) == expected
+        assert _levenshtein_bit_parallel(s1, s2) == expected
+        # 밴드 폭이 충분하면 정확한 거리
+        assert _levenshtein_banded(s1, s2, max(len(s1), len(s2))) == expected
+        assert levenshtein(s1, s2) == expected
+
+    @pytest.mark.parametrize("s1,s2", EDGE_PAIRS + RANDOM_PAIRS)
+    def test_bounded_around_distance(self, s1, s2):
+        """상한이 실제 거리보다 작음/같음/큼 — 초과 시 max_distance + 1"""
+        distance = _reference(s1, s2)
+        for max_distance in {0, max(0, distance - 1), distance, distance + 1}:
+            expected = _bounded(distance, max_distance)
+            assert _levenshtein_bit_parallel(s1, s2, max_distance) == expected
+            assert _levenshtein_banded(s1, s2, max_distance) == expected
+            assert levenshtein(s1, s2, max_distance) == expected
+
+    @pytest.mark.parametrize("s1,s2", EDGE_PAIRS + RANDOM_PAIRS)
+    def test_histogram_is_lower_bound(self, s1, s2):
+        """문자 빈도 하한은 실제 거리를 넘지 않음"""
+        assert _histogram_lower_bound(s1, s2) <= _reference(s1, s2)
+
+    def test_dispatch_boundary(self, monkeypatch):
+        """짧은 쪽이 64자 이하면 비트 병렬, 65자 이상이면 DP/밴드 경로"""
+        calls: list[str] = []
+
+        def spy(name, func):
+            def wrapper(*args):
+                calls.append(name)
+                return func(*args)
+            monkeypatch.setattr(_edit_distance, name, wrapper)
+
+        spy("_levenshtein_bit_parallel", _levenshtein_bit_parallel)
+        spy("_levenshtein_dp", _levenshtein_dp)
+        spy("_levenshtein_banded", _levenshtein_banded)
+
+        at_limit = "a" * _BIT_PARALLEL_MAX_LEN
+        over_limit = "a" * (_BIT_PARALLEL_MAX_LEN + 1)
+        assert levenshtein(at_limit, over_limit) == 1
+        assert levenshtein(over_limit, over_limit + "b") == 1
+        assert levenshtein(over_limit, over_limit + "b", 3) == 1
+        assert calls == [
+            "_levenshtein_bit_parallel", "_levenshtein_dp", "_levenshtein_banded",
+        ]
+
+
+# === 상한 경계 (PhishingAnalyzer 타이포스쿼팅 판정) ===
+
+class TestMaxDistanceCutoff:
+    """max_distance 상한과 조기 종료 경계 테스트"""
+
+    @pytest.mark.parametrize("famous,candidate", [
+        ("paypal", "paypa1"),
+        ("microsoft", "rnicrosoft"),
+        ("amazon", "arnazon"),
+        ("facebook", "faceb00k"),
+        ("google", "gooogle"),
+        ("netflix", "netfl1x"),
+    ])
+    def test_phishing_cutoff(self, famous, candidate):
+        """max_len // 5 상한 — 기준 DP 거리 기준 판정과 같음"""
+        max_distance = max(len(famous), len(candidate)) // 5
+        expected = _bounded(_reference(famous, candidate), max_distance)
+        assert levenshtein(candidate, famous, max_distance) == expected
+
+    @pytest.mark.parametrize("length", [64, 65, 100])
+    @pytest.mark.parametrize("edits", [1, 3, 7])
+    def test_exact_edit_count(self, length, edits):
+        """치환 수가 곧 거리인 쌍 — 상한 edits-1은 초과, edits/edits+1은 정확한 값"""
+        s1 = "a" * length
+        s2 = "b" * edits + "a" * (length - edits)
+        for func in (_levenshtein_bit_parallel, _levenshtein_banded, levenshtein):
+            assert func(s1, s2, edits - 1) == edits
+            assert func(s1, s2, edits) == edits
+            assert func(s1, s2, edits + 1) == edits
+
+    def test_length_gap_exceeds_cutoff(self):
+        """길이 차이가 상한보다 크면 즉시 max_distance + 1"""
+        assert levenshtein("a" * 10, "a" * 14, 3) == 4
+        assert levenshtein("a" * 10, "a" * 13, 3) == 3
+        assert _levenshtein_banded("a" * 100, "a" * 104, 3) == 4
+        assert _levenshtein_banded("a" * 100, "a" * 103, 3) == 3
+
+    def test_band_early_exit(self):
+        """앞쪽 차이로 행 최솟값이 상한을 넘으면 조기 종료, 상한 이내면 정확한 값"""
+        s1 = "x" * 10 + "a" * 90
+        s2 = "y" * 10 + "a" * 90
+        assert _levenshtein_banded(s1, s2, 9) == 10
+        assert _levenshtein_banded(s1, s2, 10) == 10
+
+        s1 = "ab" * 50
+        s2 = "ba" * 50
+        distance = _reference(s1, s2)
+        assert _levenshtein_banded(s1, s2, distance - 1) == distance
+        assert _levenshtein_banded(s1, s2, distance) == distance
+
+    def test_zero_cutoff(self):
+        """상한 0 — 같으면 0, 다르면 1"""
+        for s in ("", "a", "a" * 64, "a" * 65, "가나다"):
+            assert levenshtein(s, s, 0) == 0
+        assert levenshtein("a" * 65, "a" * 64 + "b", 0) == 1
+        assert levenshtein("가나다", "가나라", 0) == 1
@@ -0,0 +1,97 @@
+"""특징 추출기 유닛 테스트"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from agent.utils import feature_extractor
+from agent.utils.feature_extractor import (
+    DOMFeatureExtractor,
+    JSFeatureExtractor,
+    _DOM_FLAG_PATTERNS,
+    _DOM_SCANNER,
+    _JS_CACHE_MIN_LENGTH,
+    _JS_FEATURE_CACHE,
+)
+
+# === DOM 다중 패턴 스캐너 테스트 ===
+
+# 비ASCII 단어 문자에 붙은 이벤트 핸들러 등 — hyperscan의 ASCII 기준 \b, \s와
+# re의 유니코드 기준 결과가 달라질 수 있는 HTML
+NON_ASCII_HTML = [
+    '<p>긴급onclick="x()"</p>',
+    '<div éonload="init()">',
+    '<body onload="a()">본문 onclick="b()"</body>',
+    '<script>var 주소 = "로그인";</script><script src="a.js"></script>',
+    '<form action="http://e.com">비밀번호<input type="password"></form>',
+    '<iframe src="x" style="display:none"></iframe>ÿ onmouseover="c()"',
+    '<a href="http://x">\x1conclick="d()"</a>',
+]
+
+
+def _normalize_flags(counts: dict[str, int]) -> dict[str, int]:
+    """존재 여부 패턴은 0/1로 맞춤 (hyperscan 경로는 매치 수를 보고)"""
+    return {
+        name: min(value, 1) if name in _DOM_FLAG_PATTERNS else value
+        for name, value in counts.items()
+    }
+
+
+class TestDOMPatternScanner:
+    """DOM 패턴 스캐너 테스트"""
+
+    @pytest.mark.parametrize("html", NON_ASCII_HTML)
+    def test_non_ascii_matches_re(self, html):
+        """비ASCII HTML — re 스캔과 같은 매치 수"""
+        assert _normalize_flags(_DOM_SCANNER.scan(html)) == _normalize_flags(
+            _DOM_SCANNER._scan_re(html)
+        )
+
+    def test_handler_glued_to_non_ascii_word(self):
+        """비ASCII 단어 문자 바로 뒤의 onclick은 이벤트 핸들러가 아님"""
+        extractor = DOMFeatureExtractor()
+        assert extractor.extract('<p>긴급onclick="x()"</p>')["event_handler_count"] == 0.0
+        assert extractor.extract('<p>éonload="x()"</p>')["event_handler_count"] == 0.0
+        assert extractor.extract('<p onclick="x()">긴급</p>')["event_handler_count"] == 1.0
+
+
+# === JS 특징 캐시 테스트 ===
+
+SHORT_SNIPPETS = [f"var x{i} = {i};" for i in range(8)]
+LONG_SCRIPTS = [
+    f"function f{i}() {{ eval(atob('{'QUJD' * 80}')); }}\n" * 2 for i in range(4)
+]
+
+
+class TestJSFeatureCache:
+    """JS 특징 LRU 캐시 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def _empty_cache(self):
+        _JS_FEATURE_CACHE.clear()
+        yield
+        _JS_FEATURE_CACHE.clear()
+
+    def test_short_snippets_not_cached(self):
+        """단건 추출 — 짧은 스니펫은 캐시하지 않고 긴 스크립트만 캐시"""
+        extractor = JSFeatureExtractor()
+        for code in SHORT_SNIPPETS + LONG_SCRIPTS:
+            extractor.extract_vector(code)
+        assert len(_JS_FEATURE_CACHE) == len(LONG_SCRIPTS)
+
+    def test_parallel_batch_skips_short_snippets(self, monkeypatch):
+        """병렬 배치 경로도 짧은 스니펫은 캐시하지 않고 결과는 단건 추출과 같음"""
+        assert all(len(code) < _JS_CACHE_MIN_LENGTH for code in SHORT_SNIPPETS)
+        assert all(len(code) >= _JS_CACHE_MIN_LENGTH for code in LONG_SCRIPTS)
+
+        # 프로세스 기동 없이 병렬 경로를 타도록 임계값/풀을 교체
+        monkeypatch.setattr(feature_extractor, "_JS_PARALLEL_MIN_CHARS", 0)
+        monkeypatch.setattr(feature_extractor, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+        extractor = JSFeatureExtractor()
+        codes = SHORT_SNIPPETS + LONG_SCRIPTS + SHORT_SNIPPETS[:2]
+        matrix = extractor.extract_vector_batch(codes, max_workers=2)
+
+        assert len(_JS_FEATURE_CACHE) == len(LONG_SCRIPTS)
+        expected = np.stack([extractor.extract_vector(code) for code in codes])
+        np.testing.assert_array_equal(matrix, expected)
@@ -0,0 +1,335 @@
+"""LLM 추론 엔진 유닛 테스트"""
+import asyncio
+import sqlite3
+import threading
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from agent.core.config import LLMConfig
+from agent.models import inference as inference_module
+from agent.models.inference import (
+    LLMInference,
+    _DiskCache,
+    _MAX_RETRY_AFTER,
+    _MAX_RETRY_DELAY,
+)
+
+# === 로컬 배치 워커 테스트 ===
+
+
+def _blocking_inference() -> tuple[LLMInference, threading.Event, threading.Event]:
+    """생성이 release 전까지 막히는 로컬 배치 생성기를 가진 추론 엔진"""
+    inference = LLMInference(LLMConfig(api_key="", local_batch_window_ms=0))
+    started = threading.Event()
+    release = threading.Event()
+
+    def generate(prompts, temperature, max_tokens):
+        started.set()
+        release.wait(5)
+        return ["{}"] * len(prompts)
+    inference._generate_local_batch = generate
+    return inference, started, release
+
+
+class TestLocalBatchWorker:
+    """로컬 배치 워커 종료 처리 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_close_resolves_running_and_queued_requests(self):
+        """close() 시 생성 중인 배치와 큐에 남은 요청 모두 None으로 종료"""
+        inference, started, release = _blocking_inference()
+        try:
+            running = asyncio.create_task(
+                inference._submit_local("sys", "first", 0.0, 16)
+            )
+            loop = asyncio.get_running_loop()
+            assert await loop.run_in_executor(None, started.wait, 5)
+
+            # 다른 생성 파라미터 — 워커가 생성 중이므로 큐에서 대기
+            queued = asyncio.create_task(
+                inference._submit_local("sys", "second", 0.5, 32)
+            )
+            await asyncio.sleep(0)
+
+            inference.close()
+            assert await asyncio.wait_for(running, timeout=2) is None
+            assert await asyncio.wait_for(queued, timeout=2) is None
+        finally:
+            release.set()
+
+    @pytest.mark.asyncio
+    async def test_worker_restarts_after_close(self):
+        """close() 후 새 요청은 새 워커로 처리"""
+        inference, _, release = _blocking_inference()
+        release.set()
+        assert await inference._submit_local("sys", "a", 0.0, 16) == "{}"
+        inference.close()
+        assert await inference._submit_local("sys", "b", 0.0, 16) == "{}"
+        inference.close()
+
+
+# === OpenAI 스트리밍 재시도 테스트 ===
+
+
+class _FakeStream:
+    """ChatCompletion 스트림 대역 — 주어진 델타를 청크로 전달"""
+
+    def __init__(self, deltas: list[str]):
+        self._deltas = deltas
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for delta in self._deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    async def close(self):
+        pass
+
+
+def _streaming_client(responses: list[list[str]]) -> SimpleNamespace:
+    """호출마다 responses의 다음 델타 목록을 스트리밍하는 OpenAI 클라이언트 대역"""
+    remaining = iter(responses)
+
+    async def create(**kwargs):
+        return _FakeStream(next(remaining))
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+class TestOpenAIStreaming:
+    """JSON 모드 스트리밍 조기 중단 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_stream_abort_backs_off_before_retry(self, caplog):
+        """조기 중단은 사유를 기록하고 백오프 후 재시도"""
+        inference = LLMInference(LLMConfig(
+            OPENAI_API_KEY="test-key", stream_responses=True, max_retries=3,
+        ))
+        inference._openai_client = _streaming_client([
+            ["Sure! ", "{\"threat_level\": \"LOW\"}"],
+            [" ", "{\"threat_level\": ", "\"SAFE\"}"],
+        ])
+        delays: list[int] = []
+
+        def compute_retry_delay(attempt, error):
+            delays.append(attempt)
+            return 0.0
+        inference._compute_retry_delay = compute_retry_delay
+
+        result = await inference._call_openai("sys", "user", 0.0, 64, json_mode=True)
+        assert result["threat_level"] == "SAFE"
+        assert delays == [0]
+        assert "Sure!" in caplog.text
+
+
+# === 재시도 대기 시간 테스트 ===
+
+
+class _APIError(Exception):
+    """상태 코드와 응답 헤더를 가진 OpenAI API 오류 대역"""
+
+    def __init__(self, status_code: int = 429, headers: dict = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class TestRetryDelay:
+    """_parse_retry_after / _compute_retry_delay 테스트"""
+
+    @pytest.mark.parametrize("headers,expected", [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after": "0.25"}, 0.25),
+        ({"retry-after": "-3"}, 0.0),
+        # retry-after-ms가 우선, 파싱 실패 시 retry-after 사용
+        ({"retry-after-ms": "200", "retry-after": "9"}, 0.2),
+        ({"retry-after-ms": "soon", "retry-after": "9"}, 9.0),
+        ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),  # 지난 날짜
+        ({"retry-after": "not a date"}, None),
+        ({}, None),
+    ])
+    def test_parse_retry_after(self, headers, expected):
+        assert LLMInference._parse_retry_after(_APIError(headers=headers)) == expected
+
+    def test_parse_retry_after_http_date(self):
+        """HTTP 날짜 형식 — 현재 시각까지 남은 초"""
+        headers = {"retry-after": formatdate(time.time() + 120, usegmt=True)}
+        delay = LLMInference._parse_retry_after(_APIError(headers=headers))
+        assert 115 <= delay <= 120
+
+    def test_parse_retry_after_without_response(self):
+        """응답이 없는 오류 (타임아웃 등)는 None"""
+        assert LLMInference._parse_retry_after(TimeoutError()) is None
+
+    @pytest.mark.parametrize("jitter", ["low", "high"])
+    def test_backoff_with_jitter_and_cap(self, monkeypatch, jitter):
+        """지수 백오프 + 0~50% 지터, _MAX_RETRY_DELAY 상한"""
+        monkeypatch.setattr(
+            inference_module.random, "uniform",
+            lambda a, b: a if jitter == "low" else b,
+        )
+        inference = LLMInference(LLMConfig(retry_base_delay=1.0))
+        factor = 1.0 if jitter == "low" else 1.5
+        error = _APIError(500)
+
+        assert inference._compute_retry_delay(0, error) == 1.0 * factor
+        assert inference._compute_retry_delay(3, error) == 8.0 * factor
+        assert inference._compute_retry_delay(6, error) == min(64.0 * factor, _MAX_RETRY_DELAY)
+        assert inference._compute_retry_delay(20, error) == _MAX_RETRY_DELAY
+
+    def test_retry_after_is_floor_beyond_cap(self, monkeypatch):
+        """Retry-After는 백오프보다 길면 상한을 넘어서도 그대로 따름"""
+        monkeypatch.setattr(inference_module.random, "uniform", lambda a, b: a)
+        inference = LLMInference(LLMConfig(retry_base_delay=1.0))
+
+        # 백오프(4초)보다 짧은 Retry-After는 백오프 사용
+        assert inference._compute_retry_delay(2, _APIError(headers={"retry-after": "1"})) == 4.0
+        assert inference._compute_retry_delay(0, _APIError(headers={"retry-after": "30"})) == 30.0
+        over_cap = _MAX_RETRY_DELAY + 30
+        assert inference._compute_retry_delay(
+            0, _APIError(headers={"retry-after": str(over_cap)})
+        ) == over_cap
+        assert inference._compute_retry_delay(
+            0, _APIError(headers={"retry-after": str(_MAX_RETRY_AFTER)})
+        ) == _MAX_RETRY_AFTER
+        # 따를 수 없을 만큼 긴 대기는 재시도 포기
+        assert inference._compute_retry_delay(
+            0, _APIError(headers={"retry-after": str(_MAX_RETRY_AFTER + 1)})
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_call_gives_up_on_long_retry_after(self, monkeypatch):
+        """Retry-After가 너무 길면 대기하지 않고 호출 실패 (None)"""
+        calls: list[dict] = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            raise _APIError(429, {"retry-after": str(_MAX_RETRY_AFTER * 2)})
+
+        async def no_sleep(delay):
+            raise AssertionError(f"대기하면 안 됨: {delay}")
+        monkeypatch.setattr(inference_module.asyncio, "sleep", no_sleep)
+
+        inference = LLMInference(LLMConfig(OPENAI_API_KEY="test-key", max_retries=3))
+        inference._openai_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        assert await inference._call_openai("sys", "user", 0.0, 64, json_mode=True) is None
+        assert len(calls) == 1
+
+
+# === 토큰 수 계산 테스트 ===
+
+
+class _FakeEncoding:
+    """공백 단위로 토큰을 나누는 tiktoken 인코딩 대역 (인코딩한 텍스트 기록)"""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        return [self.encode(text) for text in texts]
+
+
+class TestTokenCounting:
+    """count_tokens / count_tokens_batch 테스트"""
+
+    def test_batch_shares_memoized_path(self):
+        """일괄 계산도 단건 계산과 같은 메모이제이션 경로 사용"""
+        inference = LLMInference(LLMConfig())
+        encoding = inference._tiktoken_encoding = _FakeEncoding()
+
+        counts = inference.count_tokens_batch(["a b c", "", "a b c", "d e"])
+        assert counts.dtype.name == "int32"
+        assert counts.tolist() == [3, 0, 3, 2]
+        # 중복 텍스트는 한 번만 인코딩
+        assert sorted(encoding.encoded) == ["", "a b c", "d e"]
+
+        # 이미 센 텍스트는 다시 인코딩하지 않음
+        assert inference.count_tokens("d e") == 2
+        assert inference.count_tokens_batch(["a b c"]).tolist() == [3]
+        assert len(encoding.encoded) == 3
+
+
+# === 영구 캐시 테스트 ===
+
+
+RESPONSE = {
+    "threat_level": "HIGH",
+    "reasons": ["가짜 로그인 페이지", "브랜드 사칭"] * 20,
+    "score": 0.93,
+}
+
+
+class TestDiskCache:
+    """SQLite 영구 응답 캐시 테스트"""
+
+    def test_compressed_round_trip(self, tmp_path):
+        """압축 저장한 응답을 재시작 후에도 그대로 복원"""
+        path = str(tmp_path / "llm_cache.db")
+        cache = _DiskCache(path, max_size=10)
+        cache.put("key", RESPONSE, ttl=60.0)
+        cache.close()
+
+        cache = _DiskCache(path, max_size=10)
+        try:
+            assert cache.get("key") == RESPONSE
+            assert cache.get("missing") is None
+            # 만료된 항목은 None
+            cache.put("old", RESPONSE, ttl=-1.0)
+            assert cache.get("old") is None
+        finally:
+            cache.close()
+
+        # 저장 형식은 압축 BLOB
+        conn = sqlite3.connect(path)
+        try:
+            (blob,) = conn.execute(
+                "SELECT response FROM llm_cache WHERE key = 'key'"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert isinstance(blob, bytes)
+        assert len(blob) < len(str(RESPONSE).encode("utf-8"))
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_promoted_to_memory(self, tmp_path):
+        """새 인스턴스는 영구 캐시에서 응답을 읽어 메모리 캐시로 승격"""
+        config = LLMConfig(cache_path=str(tmp_path / "llm_cache.db"))
+        first = LLMInference(config)
+        await first._set_cached("key", RESPONSE)
+        first.close()
+
+        second = LLMInference(config)
+        try:
+            assert await second._get_cached("key") == RESPONSE
+            assert "key" in second._cache
+        finally:
+            second.close()
+
+    @pytest.mark.asyncio
+    async def test_read_failure_is_cache_miss(self, tmp_path, caplog):
+        """영구 캐시 조회 오류는 예외 대신 캐시 미스 (경고 기록)"""
+        inference = LLMInference(LLMConfig(cache_path=str(tmp_path / "llm_cache.db")))
+        try:
+            def locked(key):
+                raise sqlite3.OperationalError("database is locked")
+            inference._disk_cache.get = locked
+            assert await inference._get_cached("key") is None
+            assert "database is locked" in caplog.text
+
+            # close()와 경합 — 닫힌 연결에서 조회
+            inference._disk_cache = _DiskCache(str(tmp_path / "closed.db"), 10)
+            inference._disk_cache._conn.close()
+            assert await inference._get_cached("key") is None
+        finally:
+            inference.close()
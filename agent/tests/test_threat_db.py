@@ -0,0 +1,570 @@
+"""위협 DB 유닛 테스트"""
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+
+from agent.utils import threat_db
+from agent.utils.threat_db import ThreatDatabase, _BULK_OFFLOAD_MIN_ROWS, _SCHEMA_VERSION
+
+# === 헬퍼 ===
+
+
+async def _group_counts(db: ThreatDatabase) -> dict:
+    """get_stats와 같은 형태의 집계를 GROUP BY 전체 스캔으로 계산"""
+    async def grouped(sql):
+        return {key: count for key, count in await db._fetchall(sql)}
+
+    return {
+        "total_threats": (await db._fetchone("SELECT COUNT(*) FROM threats"))[0],
+        "threats_by_level": await grouped(
+            "SELECT level, COUNT(*) FROM threats GROUP BY level"
+        ),
+        "threats_by_type": await grouped(
+            "SELECT type, COUNT(*) FROM threats GROUP BY type"
+        ),
+        "total_iocs": (await db._fetchone("SELECT COUNT(*) FROM iocs"))[0],
+        "iocs_by_type": await grouped("SELECT type, COUNT(*) FROM iocs GROUP BY type"),
+        "total_scans": (await db._fetchone("SELECT COUNT(*) FROM scan_results"))[0],
+    }
+
+
+async def _assert_stats_match(db: ThreatDatabase) -> None:
+    """stats_counters 기반 get_stats가 GROUP BY 집계와 같은지 확인"""
+    stats = await db.get_stats()
+    expected = await _group_counts(db)
+    for key, value in expected.items():
+        assert stats[key] == value, key
+
+
+# === 쓰기 큐 테스트 ===
+
+class TestWriteQueue:
+    """백그라운드 쓰기 큐 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_batch(self, temp_db):
+        """동시에 들어온 쓰기는 한 트랜잭션으로 커밋"""
+        async with ThreatDatabase(temp_db) as db:
+            batch_sizes: list[int] = []
+            commit_batch = db._commit_batch
+
+            async def record_batch(batch):
+                batch_sizes.append(len(batch))
+                await commit_batch(batch)
+            db._commit_batch = record_batch
+
+            ids = await asyncio.gather(*(
+                db.add_threat(f"http://batch{i}.com", level=i % 5) for i in range(20)
+            ))
+            assert batch_sizes == [20]
+            assert len(set(ids)) == 20
+            assert len(await db.search_threats("batch", limit=100)) == 20
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_does_not_fail_batch(self, temp_db):
+        """배치 안의 한 문장이 실패해도 해당 호출만 예외, 나머지는 커밋"""
+        async with ThreatDatabase(temp_db) as db:
+            results = await asyncio.gather(
+                db.add_threat("http://ok1.com"),
+                db.add_threat(None),  # url NOT NULL 위반
+                db.add_threat("http://ok2.com"),
+                return_exceptions=True,
+            )
+            assert isinstance(results[0], int)
+            assert isinstance(results[1], sqlite3.IntegrityError)
+            assert isinstance(results[2], int)
+            assert await db.get_threat_by_url("http://ok1.com")
+            assert await db.get_threat_by_url("http://ok2.com")
+            await _assert_stats_match(db)
+
+    @pytest.mark.asyncio
+    async def test_write_after_close_started_raises(self, temp_db):
+        """종료가 시작된 뒤의 쓰기는 대기하지 않고 RuntimeError"""
+        db = ThreatDatabase(temp_db)
+        await db.connect()
+        closing = asyncio.create_task(db.close())
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(db.add_threat("http://late.com"), timeout=2)
+        await closing
+        assert not db.is_connected
+
+
+# === 단건 조회 캐시 테스트 ===
+
+class TestLookupCache:
+    """get_threat_by_url / get_ioc 캐시 무효화 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_threat_cache_invalidation(self, temp_db):
+        """캐시된 '없음' 결과와 행 모두 추가/수정/삭제 시 무효화"""
+        async with ThreatDatabase(temp_db) as db:
+            url = "http://cached.com/login"
+            assert await db.get_threat_by_url(url) is None
+
+            threat_id = await db.add_threat(url, level=2)
+            assert (await db.get_threat_by_url(url))["level"] == 2
+
+            await db.update_threat(threat_id, level=4)
+            assert (await db.get_threat_by_url(url))["level"] == 4
+
+            await db.delete_threat(threat_id)
+            assert await db.get_threat_by_url(url) is None
+
+    @pytest.mark.asyncio
+    async def test_cached_row_not_mutated_by_caller(self, temp_db):
+        """반환된 딕셔너리를 수정해도 캐시된 결과는 그대로"""
+        async with ThreatDatabase(temp_db) as db:
+            await db.add_threat("http://mut.com", details={"k": 1})
+            first = await db.get_threat_by_url("http://mut.com")
+            first["details"]["k"] = 2
+            assert (await db.get_threat_by_url("http://mut.com"))["details"] == {"k": 1}
+
+    @pytest.mark.asyncio
+    async def test_ioc_cache_invalidation(self, temp_db):
+        """IoC 캐시 — '없음' 결과, 추가, 중복 추가, 삭제"""
+        async with ThreatDatabase(temp_db) as db:
+            assert await db.get_ioc("domain", "evil.com") is None
+
+            ioc_id = await db.add_ioc("domain", "evil.com", "feed", 0.9)
+            assert (await db.get_ioc("domain", "evil.com"))["id"] == ioc_id
+
+            # 중복 추가는 기존 ID 반환, 기존 출처 유지
+            assert await db.add_ioc("domain", "evil.com", "other", 0.1) == ioc_id
+            assert (await db.get_ioc("domain", "evil.com"))["source"] == "feed"
+
+            assert await db.delete_ioc(ioc_id)
+            assert await db.get_ioc("domain", "evil.com") is None
+
+
+# === 전문 검색 테스트 ===
+
+SEARCH_ROWS = [
+    ("http://evil-login.com/auth", "evil-login.com", {"note": "Credential harvest"}),
+    ("https://EVIL.example.org/x", "EVIL.example.org", {"note": "대문자 도메인"}),
+    ("http://paypa1.com/verify", "paypa1.com", {"brand": "PayPal", "note": "Ünïcode"}),
+    ("http://shop.test/ünïcode", "shop.test", {"note": "피싱 페이지"}),
+    ("http://plain.test/", "plain.test", {"quote": 'say "hi" now'}),
+]
+
+SEARCH_QUERIES = [
+    "evil", "EVIL", "login", "paypal", "PayPal", "ünï", "Ünï", "피싱 페",
+    '"hi"', "credential", "xyz", "ev", "a_b", "50%", "auth",
+]
+
+
+class TestSearchThreats:
+    """search_threats 전문 색인 경로 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_fts_matches_full_scan_like(self, temp_db):
+        """트라이그램 색인 경로 결과가 전체 스캔 LIKE 결과와 같음"""
+        async with ThreatDatabase(temp_db) as db:
+            for url, domain, details in SEARCH_ROWS:
+                await db.add_threat(url, domain, details=details)
+
+            for query in SEARCH_QUERIES:
+                like_query = f"%{query}%"
+                expected = [
+                    row["id"] for row in await db._fetchall(
+                        """
+                        SELECT id FROM threats
+                        WHERE url LIKE ? OR domain LIKE ? OR details_json(details) LIKE ?
+                        ORDER BY updated_at DESC
+                        """,
+                        (like_query, like_query, like_query),
+                    )
+                ]
+                found = [row["id"] for row in await db.search_threats(query)]
+                assert found == expected, query
+
+
+# === 집계 카운터 테스트 ===
+
+class TestStatsCounters:
+    """stats_counters 트리거 집계 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_counters_match_group_by(self, temp_db):
+        """추가/수정/삭제/벌크 임포트 후 집계가 GROUP BY와 같음"""
+        async with ThreatDatabase(temp_db) as db:
+            ids = [
+                await db.add_threat(f"http://s{i}.com", level=i % 5, threat_type=t)
+                for i, t in enumerate(["phishing", "malware", "xss", "phishing"])
+            ]
+            await db.add_ioc("domain", "a.com")
+            await db.add_ioc("ip", "1.2.3.4")
+            await db.add_scan_result("http://s0.com", 0.5, {})
+            await _assert_stats_match(db)
+
+            await db.update_threat(ids[0], level=4, threat_type="malware")
+            await db.update_threat(ids[1], details={"changed": True})
+            await _assert_stats_match(db)
+
+            await db.delete_threat(ids[2])
+            await _assert_stats_match(db)
+
+            await db.bulk_import_threats([
+                {"url": f"http://bulk{i}.org", "level": 3, "type": "privacy"}
+                for i in range(50)
+            ])
+            await db.bulk_import_iocs([
+                {"type": "domain", "value": f"b{i}.net"} for i in range(10)
+            ] + [{"type": "domain", "value": "a.com"}])
+            await _assert_stats_match(db)
+
+            stats = await db.get_stats()
+            assert stats["threats_by_type"]["privacy"] == 50
+            assert "xss" not in stats["threats_by_type"]
+
+
+# === 스키마 마이그레이션 테스트 ===
+
+# user_version 도입 전 스키마 (버전 0)
+BASELINE_SCHEMA_SQL = """
+CREATE TABLE threats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL DEFAULT '',
+    hash TEXT NOT NULL DEFAULT '',
+    level INTEGER NOT NULL DEFAULT 0,
+    type TEXT NOT NULL DEFAULT 'unknown',
+    details TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX idx_threats_url ON threats(url);
+CREATE INDEX idx_threats_domain ON threats(domain);
+CREATE INDEX idx_threats_hash ON threats(hash);
+CREATE INDEX idx_threats_level ON threats(level);
+CREATE TABLE iocs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    confidence REAL NOT NULL DEFAULT 0.0
+);
+CREATE INDEX idx_iocs_type_value ON iocs(type, value);
+CREATE TABLE scan_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    score REAL NOT NULL DEFAULT 0.0,
+    report TEXT NOT NULL DEFAULT '{}',
+    timestamp REAL NOT NULL
+);
+CREATE INDEX idx_scan_results_url ON scan_results(url);
+CREATE INDEX idx_scan_results_timestamp ON scan_results(timestamp);
+"""
+
+
+class TestSchemaMigration:
+    """user_version 마이그레이션 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_migrate_baseline_db(self, temp_db):
+        """버전 0 DB — 해시 변환, 전문 색인, 집계, IoC 중복 제거"""
+        now = time.time()
+        hex_hash = "ab" * 32
+        upper_hash = "CD" * 32
+        connection = sqlite3.connect(temp_db)
+        connection.executescript(BASELINE_SCHEMA_SQL)
+        connection.executemany(
+            "INSERT INTO threats (url, domain, hash, level, type, details, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("http://old1.com/a", "old1.com", hex_hash, 3, "phishing",
+                 json.dumps({"note": "legacy row"}), now, now),
+                ("http://old2.com/b", "old2.com", "", 1, "malware", "{}", now, now + 1),
+                ("http://old3.com/c", "old3.com", upper_hash, 2, "malware", "{}", now, now),
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO iocs (type, value, source) VALUES (?, ?, ?)",
+            [("domain", "dup.com", "first"), ("domain", "dup.com", "second"),
+             ("ip", "9.9.9.9", "feed")],
+        )
+        connection.execute(
+            "INSERT INTO scan_results (url, score, report, timestamp) VALUES (?, ?, ?, ?)",
+            ("http://old1.com/a", 0.8, "{}", now),
+        )
+        connection.commit()
+        connection.close()
+
+        async with ThreatDatabase(temp_db) as db:
+            version = (await db._fetchone("PRAGMA user_version"))[0]
+            assert version == _SCHEMA_VERSION
+
+            by_hash = await db.get_threats_by_hash(hex_hash)
+            assert [row["url"] for row in by_hash] == ["http://old1.com/a"]
+            assert by_hash[0]["hash"] == hex_hash
+            # 대문자 해시는 변환하지 않고 원래 표기 유지
+            assert (await db.get_threat_by_url("http://old3.com/c"))["hash"] == upper_hash
+            assert [tuple(row) for row in await db._fetchall(
+                "SELECT url, typeof(hash) FROM threats WHERE length(hash) > 0 ORDER BY id"
+            )] == [("http://old1.com/a", "blob"), ("http://old3.com/c", "text")]
+            assert [row["url"] for row in await db.search_threats("legacy")] == [
+                "http://old1.com/a"
+            ]
+
+            dup = await db.get_ioc("domain", "dup.com")
+            assert dup["source"] == "first"
+            assert (await db.get_stats())["total_iocs"] == 2
+            await _assert_stats_match(db)
+
+            # 새 행도 색인/집계에 반영
+            await db.add_threat("http://new.com/legacy", level=3, threat_type="phishing")
+            assert len(await db.search_threats("legacy")) == 2
+            await _assert_stats_match(db)
+
+        # 다시 열어도 마이그레이션을 반복하지 않음
+        async with ThreatDatabase(temp_db) as db:
+            assert (await db.get_stats())["total_threats"] == 4
+            await _assert_stats_match(db)
+
+
+# === 해시 저장 형식 테스트 ===
+
+class TestHashStorage:
+    """threats.hash 바이트 저장 / 16진 문자열 반환 테스트"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("hash_value,stored_type", [
+        ("ab" * 32, "blob"),      # 소문자 SHA-256 → 32바이트 BLOB
+        ("0f1e", "blob"),
+        ("", "blob"),
+        ("AB" * 32, "text"),      # 대문자/혼합 표기는 그대로 텍스트
+        ("aB" * 32, "text"),
+        ("abc", "text"),          # 홀수 길이
+        ("ab cd", "text"),        # 공백 (bytes.fromhex는 허용)
+        ("not-a-hash", "text"),
+    ])
+    async def test_round_trip_keeps_input(self, temp_db, hash_value, stored_type):
+        """add_threat에 넣은 해시가 대소문자까지 그대로 조회됨"""
+        async with ThreatDatabase(temp_db) as db:
+            await db.add_threat("http://h.com", hash_value=hash_value)
+            row = await db.get_threat_by_url("http://h.com")
+            assert row["hash"] == hash_value
+            assert (await db._fetchone("SELECT typeof(hash) FROM threats"))[0] == stored_type
+            if hash_value:
+                found = await db.get_threats_by_hash(hash_value)
+                assert [r["url"] for r in found] == ["http://h.com"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_round_trip(self, temp_db):
+        """벌크 임포트 경로도 같은 저장 규칙"""
+        hashes = ["12" * 32, "EF" * 32, ""]
+        async with ThreatDatabase(temp_db) as db:
+            await db.bulk_import_threats([
+                {"url": f"http://b{i}.com", "hash": h} for i, h in enumerate(hashes)
+            ])
+            for i, h in enumerate(hashes):
+                assert (await db.get_threat_by_url(f"http://b{i}.com"))["hash"] == h
+
+
+# === IoC 매칭 테스트 ===
+
+MATCH_IOCS = [
+    ("domain", "evil.com", 0.9),
+    ("domain", "Phish.NET", 0.7),
+    ("domain", "évil.com", 0.5),
+    ("url", "http://cdn.bad.org/payload.js", 0.8),
+    ("ip", "10.66.6.6", 0.6),
+    ("hash", "deadbeef", 1.0),  # 매칭 대상 유형 아님
+]
+
+MATCH_TEXTS = [
+    ("https://login.evil.com/auth", ["evil.com"]),
+    ("HTTPS://PHISH.net/x and EVIL.COM", ["evil.com", "Phish.NET"]),
+    ("<script src='http://cdn.bad.org/payload.js'>", ["http://cdn.bad.org/payload.js"]),
+    ("connect 10.66.6.6:443", ["10.66.6.6"]),
+    ("visit ÉVIL.COM", ["évil.com"]),
+    ("deadbeef", []),
+    ("safe.example.org", []),
+    ("", []),
+]
+
+
+class TestMatchIoCs:
+    """match_iocs 다중 리터럴 매칭 테스트"""
+
+    @staticmethod
+    async def _add_iocs(db: ThreatDatabase) -> None:
+        for ioc_type, value, confidence in MATCH_IOCS:
+            await db.add_ioc(ioc_type, value, "feed", confidence)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_hyperscan", [True, False])
+    async def test_matches_substrings(self, temp_db, monkeypatch, use_hyperscan):
+        """대소문자 무시 부분 문자열 매치, 신뢰도 내림차순 (hyperscan/폴백 동일)"""
+        if use_hyperscan and threat_db.hyperscan is None:
+            pytest.skip("hyperscan 미설치")
+        if not use_hyperscan:
+            monkeypatch.setattr(threat_db, "hyperscan", None)
+
+        async with ThreatDatabase(temp_db) as db:
+            await self._add_iocs(db)
+            for text, expected in MATCH_TEXTS:
+                found = [ioc["value"] for ioc in await db.match_iocs(text)]
+                assert found == expected, text
+
+    @pytest.mark.asyncio
+    async def test_matcher_rebuilt_after_changes(self, temp_db):
+        """IoC 추가/삭제/벌크 임포트 후 다음 호출에서 매처 재생성"""
+        async with ThreatDatabase(temp_db) as db:
+            assert await db.match_iocs("evil.com") == []
+
+            ioc_id = await db.add_ioc("domain", "evil.com", "feed", 0.9)
+            assert [ioc["id"] for ioc in await db.match_iocs("evil.com")] == [ioc_id]
+
+            await db.bulk_import_iocs([{"type": "ip", "value": "1.2.3.4", "confidence": 0.1}])
+            assert len(await db.match_iocs("evil.com 1.2.3.4")) == 2
+
+            await db.delete_ioc(ioc_id)
+            assert [ioc["value"] for ioc in await db.match_iocs("evil.com 1.2.3.4")] == [
+                "1.2.3.4"
+            ]
+
+
+# === 대량 임포트 (executor 오프로드) 테스트 ===
+
+class TestOffloadedBulkImport:
+    """_BULK_OFFLOAD_MIN_ROWS행 이상 벌크 임포트 (동기 연결 _insert_rows_sync) 테스트"""
+
+    @staticmethod
+    def _spy_sync_inserts(db: ThreatDatabase) -> list[int]:
+        row_counts: list[int] = []
+        insert_rows_sync = db._insert_rows_sync
+
+        def spy(insert_sql, rows):
+            row_counts.append(len(rows))
+            return insert_rows_sync(insert_sql, rows)
+        db._insert_rows_sync = spy
+        return row_counts
+
+    @pytest.mark.asyncio
+    async def test_threats_offloaded(self, temp_db):
+        """대량 위협 임포트 — 행, 압축 details, 해시, 전문 색인, 집계, 캐시 무효화"""
+        count = _BULK_OFFLOAD_MIN_ROWS + 500
+        async with ThreatDatabase(temp_db) as db:
+            row_counts = self._spy_sync_inserts(db)
+            assert await db.get_threat_by_url("http://big7.org") is None
+
+            imported = await db.bulk_import_threats([
+                {
+                    "url": f"http://big{i}.org",
+                    "domain": f"big{i}.org",
+                    "hash": f"{i:064x}",
+                    "level": i % 5,
+                    "type": "malware",
+                    "details": {"note": f"bulk marker {i}", "tags": ["a", "b"] * 20},
+                }
+                for i in range(count)
+            ])
+            assert imported == count
+            assert row_counts == [count]
+
+            row = await db.get_threat_by_url("http://big7.org")
+            assert row["details"]["note"] == "bulk marker 7"
+            assert row["hash"] == f"{7:064x}"
+            found = await db.search_threats("bulk marker 1234", limit=10)
+            assert [r["url"] for r in found] == ["http://big1234.org"]
+            await _assert_stats_match(db)
+
+    @pytest.mark.asyncio
+    async def test_iocs_offloaded_skip_duplicates(self, temp_db):
+        """대량 IoC 임포트 — 기존/배치 내 중복은 건너뛰고 새 행 수만 반환"""
+        async with ThreatDatabase(temp_db) as db:
+            await db.add_ioc("domain", "d0.net", "existing", 0.9)
+            assert await db.match_iocs("d0.net")
+
+            row_counts = self._spy_sync_inserts(db)
+            iocs = [{"type": "domain", "value": f"d{i}.net"} for i in range(_BULK_OFFLOAD_MIN_ROWS)]
+            added = await db.bulk_import_iocs(iocs + iocs[:10])
+            assert row_counts == [_BULK_OFFLOAD_MIN_ROWS + 10]
+            assert added == _BULK_OFFLOAD_MIN_ROWS - 1
+            assert (await db.get_ioc("domain", "d0.net"))["source"] == "existing"
+            assert len(await db.match_iocs("d1999.net")) == 1
+            await _assert_stats_match(db)
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back_everything(self, temp_db):
+        """중간 행이 실패하면 전체 롤백 — 일부 행만 남지 않음"""
+        async with ThreatDatabase(temp_db) as db:
+            threats = [{"url": f"http://r{i}.org"} for i in range(_BULK_OFFLOAD_MIN_ROWS)]
+            threats[-1]["url"] = None  # url NOT NULL 위반
+            with pytest.raises(sqlite3.IntegrityError):
+                await db.bulk_import_threats(threats)
+
+            assert (await db.get_stats())["total_threats"] == 0
+            await _assert_stats_match(db)
+            # 쓰기 연결은 계속 사용 가능
+            assert await db.add_threat("http://after.org")
+
+    @pytest.mark.asyncio
+    async def test_small_import_stays_on_write_connection(self, temp_db):
+        """임계값 미만은 쓰기 연결에서 처리"""
+        async with ThreatDatabase(temp_db) as db:
+            row_counts = self._spy_sync_inserts(db)
+            await db.bulk_import_threats(
+                [{"url": f"http://s{i}.org"} for i in range(_BULK_OFFLOAD_MIN_ROWS - 1)]
+            )
+            assert row_counts == []
+            assert (await db.get_stats())["total_threats"] == _BULK_OFFLOAD_MIN_ROWS - 1
+
+
+# === details 일부 키 조회 테스트 ===
+
+class TestThreatsProjection:
+    """get_threats_projection json_extract 추출 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_projection_matches_full_rows(self, temp_db):
+        """추출 값/정렬/필터가 get_threats_by_level + details 파싱 결과와 같음"""
+        details_list = [
+            {"brand": "PayPal", "score": 0.9, "flag": True},
+            {"brand": "은행", "nested": {"a": 1}, "list": [1, 2]},
+            {"a.b": "dotted", "[0]": "bracket", "flag": False},
+            {"big": "x" * 4000},  # 압축 BLOB으로 저장되는 details
+            {},
+        ]
+        async with ThreatDatabase(temp_db) as db:
+            for i, details in enumerate(details_list):
+                await db.add_threat(f"http://p{i}.com", f"p{i}.com", level=i % 3, details=details)
+
+            fields = ["brand", "score", "flag", "nested", "list", "a.b", "[0]", "big", "missing"]
+            rows = await db.get_threats_projection(fields, min_level=1)
+            full = await db.get_threats_by_level(1)
+            assert [row["id"] for row in rows] == [row["id"] for row in full]
+
+            for row, expected in zip(rows, full):
+                for key in ("url", "domain", "level", "type", "updated_at"):
+                    assert row[key] == expected[key]
+                for field in fields:
+                    value = expected["details"].get(field)
+                    # json_extract 규칙: bool은 1/0, 중첩 값은 JSON 텍스트
+                    if isinstance(value, bool):
+                        value = int(value)
+                    elif isinstance(value, (dict, list)):
+                        value = json.dumps(value, separators=(",", ":"))
+                    assert row[field] == value, field
+
+    @pytest.mark.asyncio
+    async def test_limit_and_empty_fields(self, temp_db):
+        """fields가 비어도 기본 열만 반환, limit 적용"""
+        async with ThreatDatabase(temp_db) as db:
+            for i in range(5):
+                await db.add_threat(f"http://l{i}.com", level=4)
+            rows = await db.get_threats_projection([], limit=3)
+            assert len(rows) == 3
+            assert set(rows[0]) == {"id", "url", "domain", "level", "type", "updated_at"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("field", ["", 'a"b'])
+    async def test_rejects_unsupported_keys(self, temp_db, field):
+        """빈 키와 큰따옴표가 든 키는 ValueError"""
+        async with ThreatDatabase(temp_db) as db:
+            with pytest.raises(ValueError):
+                await db.get_threats_projection([field])
@@ -0,0 +1,349 @@
+"""URL 검사기 유닛 테스트"""
+import asyncio
+from urllib.parse import urlparse
+
+import pytest
+
+from agent.core.config import ExternalAPIConfig
+from agent.utils.url_checker import URLChecker, _split_url, normalize_url
+
+# === 조회 중 URL 공유 테스트 ===
+
+
+def _slow_lookup(checker: URLChecker, calls: list[str], started: asyncio.Event):
+    """첫 호출만 오래 걸리는 _check_url_uncached 대체 (호출된 URL 기록)"""
+    async def lookup(normalized: str):
+        calls.append(normalized)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return checker._combine_results(normalized, {"threats": []}, None)
+    return lookup
+
+
+class TestInflightSharing:
+    """같은 URL 동시 검사 시 조회 공유 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_owner_cancel_does_not_cancel_waiter(self):
+        """조회를 맡은 호출이 취소되어도 기다리던 호출은 직접 다시 조회"""
+        checker = URLChecker(ExternalAPIConfig())
+        calls: list[str] = []
+        started = asyncio.Event()
+        checker._check_url_uncached = _slow_lookup(checker, calls, started)
+
+        owner = asyncio.create_task(checker.check_url("example.com"))
+        await started.wait()
+        waiter = asyncio.create_task(checker.check_url("example.com"))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        result = await waiter
+        assert owner.cancelled()
+        assert not waiter.cancelled()
+        assert result["safe"] and not result["cached"]
+        assert calls == ["https://example.com/", "https://example.com/"]
+
+    @pytest.mark.asyncio
+    async def test_owner_cancel_does_not_cancel_batch_waiter(self):
+        """일괄 검사가 공유하던 조회의 소유 호출이 취소되어도 결과 반환"""
+        checker = URLChecker(ExternalAPIConfig())
+        calls: list[str] = []
+        started = asyncio.Event()
+        checker._check_url_uncached = _slow_lookup(checker, calls, started)
+
+        async def check_pending_batch(pending, results):
+            for url, future in pending.items():
+                results[url] = checker._combine_results(url, {"threats": []}, None)
+                future.set_result(results[url])
+        checker._check_pending_batch = check_pending_batch
+
+        owner = asyncio.create_task(checker.check_url("example.com"))
+        await started.wait()
+        batch = asyncio.create_task(
+            checker.check_urls_batch(["example.com", "other.com"])
+        )
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        results = await batch
+        assert [r["url"] for r in results] == [
+            "https://example.com/", "https://other.com/",
+        ]
+        assert all(r["safe"] for r in results)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_waiter_cancel_keeps_owner_running(self):
+        """기다리던 호출 자신이 취소되면 취소가 전파되고 소유 호출은 계속 진행"""
+        checker = URLChecker(ExternalAPIConfig())
+        calls: list[str] = []
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def lookup(normalized: str):
+            calls.append(normalized)
+            started.set()
+            await release.wait()
+            return checker._combine_results(normalized, {"threats": []}, None)
+        checker._check_url_uncached = lookup
+
+        owner = asyncio.create_task(checker.check_url("example.com"))
+        await started.wait()
+        waiter = asyncio.create_task(checker.check_url("example.com"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        release.set()
+        result = await owner
+        assert result["safe"]
+        assert calls == ["https://example.com/"]
+
+
+# === GSB 단건 조회 합치기 / 결과 분배 테스트 ===
+
+
+class _FakeResponse:
+    """aiohttp 응답 대역 (async with 지원)"""
+
+    def __init__(self, status: int, data: dict):
+        self.status = status
+        self._data = data
+
+    async def json(self, loads=None):
+        return self._data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class _FakeGSBSession:
+    """
+    GSB threatMatches:find 대역 세션
+
+    요청된 URL 목록을 기록하고, matches_for가 돌려주는 매치로 응답합니다.
+    gate가 주어지면 응답 전에 gate가 열릴 때까지 대기합니다.
+    """
+
+    closed = False
+
+    def __init__(self, matches_for, gate: asyncio.Event = None):
+        self.requests: list[list[str]] = []
+        self.posted = asyncio.Event()
+        self._matches_for = matches_for
+        self._gate = gate
+
+    def post(self, url, json=None, **kwargs):
+        urls = [entry["url"] for entry in json["threatInfo"]["threatEntries"]]
+        self.requests.append(urls)
+        self.posted.set()
+        return self._respond(urls)
+
+    def _respond(self, urls):
+        session = self
+
+        class _Pending:
+            async def __aenter__(self):
+                if session._gate is not None:
+                    await session._gate.wait()
+                return _FakeResponse(200, {"matches": session._matches_for(urls)})
+
+            async def __aexit__(self, *args):
+                return None
+        return _Pending()
+
+    async def close(self):
+        self.closed = True
+
+
+def _gsb_match(url: str) -> dict:
+    return {
+        "threat": {"url": url},
+        "threatType": "MALWARE",
+        "platformType": "ANY_PLATFORM",
+    }
+
+
+def _gsb_checker(session: _FakeGSBSession) -> URLChecker:
+    checker = URLChecker(ExternalAPIConfig(google_safe_browsing_key="test-key"))
+    checker._session = session
+    return checker
+
+
+class TestGSBCoalescing:
+    """단건 GSB 조회 합치기와 URL별 결과 분배 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_share_one_request(self):
+        """동시에 들어온 단건 검사는 threatMatches:find 한 번으로 조회"""
+        session = _FakeGSBSession(
+            lambda urls: [_gsb_match(url) for url in urls if "evil" in url]
+        )
+        checker = _gsb_checker(session)
+        try:
+            results = await asyncio.gather(
+                checker.check_url("evil.com"),
+                checker.check_url("good.org"),
+                checker.check_url("also-good.net"),
+            )
+        finally:
+            await checker.close()
+
+        assert len(session.requests) == 1
+        assert sorted(session.requests[0]) == [
+            "https://also-good.net/", "https://evil.com/", "https://good.org/",
+        ]
+        assert [r["safe"] for r in results] == [False, True, True]
+        assert results[0]["threats"] == ["MALWARE (ANY_PLATFORM)"]
+
+    @pytest.mark.asyncio
+    async def test_single_url_match_without_exact_url(self):
+        """단일 URL 요청은 응답 URL 표기와 무관하게 그 URL의 매치"""
+        session = _FakeGSBSession(lambda urls: [_gsb_match("EVIL.com")])
+        checker = _gsb_checker(session)
+        try:
+            result = await checker.check_url("evil.com")
+        finally:
+            await checker.close()
+        assert not result["safe"]
+
+    @pytest.mark.asyncio
+    async def test_batch_demux_by_url(self, caplog):
+        """여러 URL 요청 — 매치를 URL별로 분배 (표기가 달라도 정규화로 대응)"""
+        session = _FakeGSBSession(lambda urls: [
+            _gsb_match("https://evil.com/"),
+            # 요청은 https://phish.net/login — 응답 표기가 다른 같은 URL
+            _gsb_match("https://phish.net//login"),
+            # 요청하지 않은 URL — 어느 URL에도 배정하지 않음
+            _gsb_match("https://unrelated.org/"),
+        ])
+        checker = _gsb_checker(session)
+        try:
+            results = await checker.check_urls_batch(
+                ["evil.com", "phish.net/login", "good.org"]
+            )
+        finally:
+            await checker.close()
+
+        assert len(session.requests) == 1
+        assert [r["safe"] for r in results] == [False, False, True]
+        assert results[2]["google_safe_browsing"]["match_count"] == 0
+        assert "unrelated.org" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_close_before_flush(self):
+        """전송 전에 닫으면 대기 중인 검사는 GSB 결과 없이 끝나고 요청은 없음"""
+        session = _FakeGSBSession(lambda urls: [])
+        checker = _gsb_checker(session)
+        check = asyncio.create_task(checker.check_url("pending.com"))
+        while not checker._gsb_waiting:
+            await asyncio.sleep(0)
+        await checker.close()
+
+        result = await asyncio.wait_for(check, timeout=2)
+        assert result["google_safe_browsing"] is None
+        assert session.requests == []
+        assert checker._session is None
+
+    @pytest.mark.asyncio
+    async def test_close_while_flush_in_flight(self):
+        """전송 중에 닫으면 전송을 취소하고 세션/정리 태스크를 다시 만들지 않음"""
+        session = _FakeGSBSession(lambda urls: [], gate=asyncio.Event())
+        checker = _gsb_checker(session)
+        check = asyncio.create_task(checker.check_url("inflight.com"))
+        await asyncio.wait_for(session.posted.wait(), timeout=2)
+        await checker.close()
+
+        result = await asyncio.wait_for(check, timeout=2)
+        assert result["google_safe_browsing"] is None
+        assert not checker._gsb_flush_tasks
+        assert checker._session is None
+        assert checker._reaper_task is None
+        assert session.closed
+
+
+# === URL 정규화 테스트 ===
+
+NORMALIZE_CASES = [
+    # 사용자 정보 (비밀번호 유무, 빈 비밀번호/사용자명)
+    ("http://user@Example.com/a", "http://user@example.com/a"),
+    ("http://user:pw@Example.com:8080/a", "http://user:pw@example.com:8080/a"),
+    ("https://user:@example.com/", "https://user@example.com/"),
+    ("https://:pw@example.com/", "https://example.com/"),
+    ("http://a@b@example.com/x", "http://a@b@example.com/x"),
+    # 포트 (기본 포트 제거, 빈 포트, 최댓값, 선행 0)
+    ("http://host:80/", "http://host/"),
+    ("https://host:443/", "https://host/"),
+    ("https://host:80/", "https://host:80/"),
+    ("ftp://host:21/file", "ftp://host/file"),
+    ("ftp://host:2121/file", "ftp://host:2121/file"),
+    ("http://example.com:/", "http://example.com/"),
+    ("http://example.com:65535/", "http://example.com:65535/"),
+    ("http://EXAMPLE.com:0443/", "http://example.com:443/"),
+    # IPv6 (urlparse의 hostname처럼 대괄호 없이 재조립)
+    ("http://[::1]:8080/x", "http://::1:8080/x"),
+    ("http://[2001:DB8::1]/", "http://2001:db8::1/"),
+    # ;params는 경로에서 분리되어 제거
+    ("http://example.com/p;params?q=1", "http://example.com/p?q=1"),
+    # 퍼센트 인코딩 (디코딩 후 재인코딩, %2F는 슬래시로)
+    ("http://example.com/a%20b/%7Euser/%2F", "http://example.com/a%20b/~user/"),
+    ("http://example.com/a b", "http://example.com/a%20b"),
+    ("http://한국.kr/경로", "http://한국.kr/%EA%B2%BD%EB%A1%9C"),
+    # 연속 슬래시, 빈 경로
+    ("http://example.com//a///b//", "http://example.com/a/b/"),
+    ("http://example.com", "http://example.com/"),
+    # 스킴 없음 → https
+    ("Example.COM/Path", "https://example.com/Path"),
+    ("example.com:443/x", "https://example.com/x"),
+    # 쿼리/프래그먼트 (빈 값이면 구분자 생략), 탭 제거
+    ("http://host?q=1#frag", "http://host/?q=1#frag"),
+    ("http://host#frag", "http://host/#frag"),
+    ("http://host/?", "http://host/"),
+    ("http://host/a?b#", "http://host/a?b"),
+    ("http://host/a\tb", "http://host/ab"),
+]
+
+INVALID_PORT_URLS = [
+    "http://example.com:abc/",
+    "http://example.com:99999/",
+    "http://example.com:-1/",
+    "https://user:pw@example.com:65536/x",
+]
+
+
+class TestNormalizeURL:
+    """normalize_url / _split_url 테스트"""
+
+    @pytest.mark.parametrize("url,expected", NORMALIZE_CASES)
+    def test_normalize(self, url, expected):
+        assert normalize_url(url) == expected
+
+    @pytest.mark.parametrize("url", INVALID_PORT_URLS)
+    def test_invalid_port_raises(self, url):
+        """숫자가 아니거나 범위 밖 포트는 urlparse 경로의 ValueError"""
+        with pytest.raises(ValueError):
+            normalize_url(url)
+
+    @pytest.mark.parametrize(
+        "url",
+        [url if "://" in url else "https://" + url for url, _ in NORMALIZE_CASES],
+    )
+    def test_split_matches_urlparse(self, url):
+        """빠른 분할 결과가 urlparse 결과와 같음 (호스트는 소문자 변환 전)"""
+        parsed = urlparse(url)
+        split = _split_url(url)
+        assert (*split[:3], split[3].lower(), *split[4:]) == (
+            parsed.scheme,
+            parsed.username,
+            parsed.password,
+            parsed.hostname or "",
+            parsed.port,
+            parsed.path,
+            parsed.query,
+            parsed.fragment,
+        )
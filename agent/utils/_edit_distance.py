@@ -0,0 +1,213 @@
+"""
+편집 거리 계산
+==============
+
+타이포스쿼팅 탐지용 레벤슈타인 편집 거리를 제공합니다.
+
+rapidfuzz가 설치되어 있으면 C++ 구현 (Myers 비트 병렬 알고리즘)을 사용하고,
+없으면 순수 Python 구현으로 폴백합니다. 폴백은 짧은 쪽 문자열이 64자 이하이면
+Python 정수를 비트 벡터로 쓰는 Myers/Hyyrö 비트 병렬 알고리즘을,
+그보다 길면 동적 계획법 (상한이 주어지면 Ukkonen 대각선 밴드)을 사용합니다.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from typing import Optional
+
+try:
+    from rapidfuzz.distance import Levenshtein as _RapidLevenshtein
+except ImportError:  # rapidfuzz 미설치 — 순수 Python 폴백 사용
+    _RapidLevenshtein = None
+
+# 비트 병렬 경로를 사용할 최대 패턴 길이 (64비트 워드 1개)
+_BIT_PARALLEL_MAX_LEN = 64
+
+
+def levenshtein(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """
+    레벤슈타인 편집 거리 계산
+
+    Args:
+        s1: 첫 번째 문자열
+        s2: 두 번째 문자열
+        max_distance: 거리 상한. 실제 거리가 이를 넘으면 max_distance + 1 반환.
+
+    Returns:
+        편집 거리 (상한 초과 시 max_distance + 1)
+    """
+    if max_distance is not None:
+        # 길이 차이는 편집 거리의 하한 — 명백히 먼 쌍은 즉시 거부
+        if abs(len(s1) - len(s2)) > max_distance:
+            return max_distance + 1
+
+    if _RapidLevenshtein is not None:
+        return _RapidLevenshtein.distance(s1, s2, score_cutoff=max_distance)
+
+    if max_distance is not None and _histogram_lower_bound(s1, s2) > max_distance:
+        return max_distance + 1
+
+    if min(len(s1), len(s2)) <= _BIT_PARALLEL_MAX_LEN:
+        return _levenshtein_bit_parallel(s1, s2, max_distance)
+
+    if max_distance is not None:
+        return _levenshtein_banded(s1, s2, max_distance)
+    return _levenshtein_dp(s1, s2)
+
+
+def _histogram_lower_bound(s1: str, s2: str) -> int:
+    """
+    문자 빈도 차이로 구한 편집 거리 하한
+
+    s1에만 남는 문자는 삭제 또는 치환, s2에만 남는 문자는 삽입 또는 치환이
+    필요하므로 두 초과분 중 큰 값 이상의 편집이 필요합니다.
+    """
+    diff = Counter(s1)
+    diff.subtract(s2)
+    surplus = deficit = 0
+    for count in diff.values():
+        if count > 0:
+            surplus += count
+        else:
+            deficit -= count
+    return max(surplus, deficit)
+
+
+def _levenshtein_bit_parallel(
+    s1: str, s2: str, max_distance: Optional[int] = None
+) -> int:
+    """
+    Myers/Hyyrö 비트 병렬 레벤슈타인 거리 (순수 Python 폴백)
+
+    짧은 문자열을 패턴으로 삼아 DP 열 전체를 VP/VN 비트 벡터로 표현하고,
+    긴 문자열의 문자 하나당 상수 개의 비트 연산으로 열을 갱신합니다.
+    남은 문자를 모두 맞춰도 상한 이하로 내려갈 수 없으면 조기 종료합니다.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    m = len(s2)
+    if m == 0:
+        distance = len(s1)
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
+
+    # 패턴 문자별 출현 위치 비트마스크
+    peq: dict[str, int] = {}
+    for i, c in enumerate(s2):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp = mask
+    vn = 0
+    score = m
+    remaining = len(s1)
+
+    for c in s1:
+        eq = peq.get(c, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        hp = (hp << 1) | 1
+        hn <<= 1
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv & mask
+
+        # 남은 문자마다 최대 1씩만 감소 가능
+        remaining -= 1
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+
+    return score
+
+
+def _levenshtein_dp(s1: str, s2: str) -> int:
+    """동적 계획법 기반 레벤슈타인 거리 (순수 Python 폴백)"""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    m = len(s2)
+    if m == 0:
+        return len(s1)
+
+    # 두 행을 미리 할당한 C int 배열로 번갈아 사용 (append/리스트 확장 없음)
+    prev_row = array("i", range(m + 1))
+    curr_row = array("i", bytes(4 * (m + 1)))
+
+    for i, c1 in enumerate(s1):
+        curr_row[0] = left = i + 1
+        for j in range(m):
+            # 삽입, 삭제, 치환 비용 중 최솟값
+            cost = prev_row[j] + (c1 != s2[j])
+            insertion = prev_row[j + 1] + 1
+            if insertion < cost:
+                cost = insertion
+            if left + 1 < cost:
+                cost = left + 1
+            curr_row[j + 1] = left = cost
+        prev_row, curr_row = curr_row, prev_row
+
+    return prev_row[m]
+
+
+def _levenshtein_banded(s1: str, s2: str, max_distance: int) -> int:
+    """
+    상한이 있는 레벤슈타인 거리 (Ukkonen 대각선 밴드, 순수 Python 폴백)
+
+    거리가 max_distance 이하인 경로는 주대각선에서 max_distance 이상 벗어날
+    수 없으므로 각 행에서 폭 2k+1 밴드만 계산합니다 (O(n·k)).
+    행 최솟값이 상한을 넘으면 즉시 max_distance + 1을 반환합니다.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    n, m = len(s1), len(s2)
+    k = max_distance
+    over = k + 1
+    if n - m > k:
+        return over
+    if m == 0:
+        return n
+
+    # 밴드 밖 셀은 over로 간주 (over 이상은 모두 "상한 초과"로 동일 취급)
+    prev_row = array("i", [j if j <= k else over for j in range(m + 1)])
+    curr_row = array("i", bytes(4 * (m + 1)))
+
+    for i, c1 in enumerate(s1, 1):
+        lo = max(1, i - k)
+        hi = min(m, i + k)
+
+        left = min(i, over) if lo == 1 else over
+        curr_row[lo - 1] = left
+        row_min = left
+        for j in range(lo, hi + 1):
+            cost = prev_row[j - 1] + (c1 != s2[j - 1])
+            insertion = prev_row[j] + 1
+            if insertion < cost:
+                cost = insertion
+            if left + 1 < cost:
+                cost = left + 1
+            if cost > over:
+                cost = over
+            curr_row[j] = left = cost
+            if cost < row_min:
+                row_min = cost
+        # 다음 행이 읽는 밴드 오른쪽 경계
+        if hi < m:
+            curr_row[hi + 1] = over
+
+        if row_min > k:
+            return over
+        prev_row, curr_row = curr_row, prev_row
+
+    return prev_row[m]
@@ -14,32 +14,641 @@ URL, DOM, JavaScript 코드에서 보안 분석용 특징 벡터를 추출합니
 
 from __future__ import annotations
 
+import functools
+import logging
 import math
+import operator
+import os
 import re
-from collections import Counter
-from typing import Any, Optional
-from urllib.parse import urlparse, parse_qs
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Optional
 
 import numpy as np
 
+try:
+    import hyperscan
+except ImportError:  # hyperscan 미설치 — 패턴별 re 스캔으로 폴백
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
 
 # ============================================================
 # 의심스러운 TLD 및 단축 서비스 목록
 # ============================================================
 
-SUSPICIOUS_TLDS: set[str] = {
+SUSPICIOUS_TLDS: frozenset[str] = frozenset({
     "tk", "ml", "ga", "cf", "gq", "top", "xyz", "club",
     "work", "buzz", "icu", "cam", "rest", "surf", "monster",
     "uno", "click", "link", "info", "pw", "cc", "ws",
-}
+})
 
-URL_SHORTENERS: set[str] = {
+URL_SHORTENERS: frozenset[str] = frozenset({
     "bit.ly", "tinyurl.com", "t.co", "goo.gl", "ow.ly",
     "is.gd", "buff.ly", "adf.ly", "bit.do", "mcaf.ee",
     "rebrand.ly", "cutt.ly", "shorte.st", "linktr.ee",
     "rb.gy", "shorturl.at", "tiny.cc", "v.gd", "qr.ae",
+})
+
+
+# ============================================================
+# 사전 컴파일된 정규식 (URL / DOM)
+# ============================================================
+
+# URL — IP 주소 (IPv4), 영숫자 단어, 퍼센트 인코딩
+_RE_IP = re.compile(r"^(\d{1,3}\.){3}\d{1,3}$")
+_RE_WORDS = re.compile(r'[a-zA-Z0-9]+')
+_RE_PERCENT = re.compile(r'%[0-9a-fA-F]{2}')
+
+# URL — scheme://netloc path ?query #fragment 분할 (urlsplit과 같은 경계)
+_RE_URL_SPLIT = re.compile(
+    r'^([^:/?#]+)://([^/?#]*)([^?#]*)(?:\?([^#]*))?(?:#(.*))?\Z', re.DOTALL
+)
+# urlsplit이 파싱 전에 제거하는 문자
+_URL_STRIP_TABLE = str.maketrans("", "", "\t\r\n")
+
+# URL — 개별 카운트하는 문자, 특수문자에서 제외하는 구두점 (ASCII 코드)
+_COUNTED_CHARS = ".-_/@&=~;"
+_PLAIN_PUNCT_CODES = np.array([ord(c) for c in ":/.-_"], dtype=np.intp)
+
+
+def _split_url(url: str) -> tuple[str, str, Optional[int], str, str, str]:
+    """
+    스킴이 붙은 URL을 (scheme, hostname, port, path, query, fragment)로 분할
+
+    urlparse의 hostname/port/path 의미를 그대로 따르되, SplitResult 생성과
+    문자 클래스 검사를 정규식 1회로 대체합니다. 잘못된 포트는 None입니다.
+    """
+    if "\t" in url or "\r" in url or "\n" in url:
+        url = url.translate(_URL_STRIP_TABLE)
+
+    m = _RE_URL_SPLIT.match(url)
+    if m is None:
+        return "", "", None, "", "", ""
+    scheme, netloc, path, query, fragment = m.groups()
+
+    # 사용자 정보 제거 후 호스트/포트 분리 (IPv6 대괄호 표기 포함)
+    hostinfo = netloc.rpartition("@")[2]
+    _, has_bracket, bracketed = hostinfo.partition("[")
+    if has_bracket:
+        host, _, rest = bracketed.partition("]")
+        port_str = rest.partition(":")[2]
+    else:
+        host, _, port_str = hostinfo.partition(":")
+
+    port: Optional[int] = None
+    if port_str.isascii() and port_str.isdigit():
+        port = int(port_str)
+        if port > 65535:
+            port = None
+
+    # urlparse처럼 마지막 경로 세그먼트의 ;params는 경로에서 제외
+    if ";" in path:
+        semi = path.find(";", path.rfind("/"))
+        if semi >= 0:
+            path = path[:semi]
+
+    return scheme.lower(), host.lower(), port, path, query or "", fragment or ""
+
+
+def _count_query_params(query: str) -> int:
+    """
+    값이 있는 고유 쿼리 키 수 (parse_qs 결과 키 수와 동일)
+
+    값을 퍼센트 디코딩하지 않고 원시 키만 비교합니다.
+    """
+    if not query:
+        return 0
+    keys = set()
+    for pair in query.split("&"):
+        key, eq, value = pair.partition("=")
+        if eq and value:
+            keys.add(key)
+    return len(keys)
+
+
+# ============================================================
+# Shannon 엔트로피
+# ============================================================
+
+# H = log2(n) - Σ c·log2(c) / n 로 계산 — 빈도별 c·log2(c)를 미리 계산해 둠
+_CLOG2_TABLE_SIZE = 4096
+_CLOG2: list[float] = [0.0] + [c * math.log2(c) for c in range(1, _CLOG2_TABLE_SIZE)]
+
+
+def _entropy_from_counts(counts: Iterable[int], length: int) -> float:
+    """문자 빈도 목록에서 Shannon 엔트로피 계산"""
+    counts = list(counts)
+    try:
+        total = sum(map(_CLOG2.__getitem__, counts))
+    except IndexError:  # 테이블 범위를 넘는 빈도 (매우 긴 문자열)
+        total = sum(c * math.log2(c) for c in counts if c > 0)
+    return max(0.0, math.log2(length) - total / length)
+
+
+def _entropy_from_histogram(hist: np.ndarray, length: int) -> float:
+    """바이트 히스토그램(np.bincount 결과)에서 Shannon 엔트로피 계산"""
+    counts = hist[hist > 0].astype(np.float64)
+    return max(0.0, math.log2(length) - float((counts * np.log2(counts)).sum()) / length)
+
+
+# ============================================================
+# 사전 컴파일된 정규식 (DOM)
+# ============================================================
+
+# DOM — 폼 / 입력 필드
+_RE_FORM = re.compile(r'<form[^>]*>', re.IGNORECASE)
+_RE_PASSWORD_FIELD = re.compile(
+    r'<input[^>]*type\s*=\s*["\']password["\']', re.IGNORECASE
+)
+_RE_INPUT = re.compile(r'<input[^>]*>', re.IGNORECASE)
+
+# DOM — 스크립트 / 리소스
+_RE_SCRIPT = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+# hyperscan 경로용 script 여는/닫는 태그 (SOM_LEFTMOST로는 .*? 블록 수를 셀 수 없음)
+_RE_SCRIPT_OPEN = re.compile(r'<script[^>]*>', re.IGNORECASE)
+_RE_SCRIPT_CLOSE = re.compile(r'</script>', re.IGNORECASE)
+_RE_EXTERNAL_SCRIPT = re.compile(r'<script[^>]*src\s*=\s*["\']', re.IGNORECASE)
+_RE_EXTERNAL_RESOURCE = re.compile(
+    r'(?:src|href)\s*=\s*["\']?https?://[^"\'\s>]+', re.IGNORECASE
+)
+_RE_RELATIVE_RESOURCE = re.compile(r'(?:src|href)\s*=\s*["\'][^/#]', re.IGNORECASE)
+
+# DOM — 태그 수
+_RE_IMG = re.compile(r'<img[^>]*>', re.IGNORECASE)
+_RE_LINK = re.compile(r'<a[^>]*href', re.IGNORECASE)
+_RE_META = re.compile(r'<meta[^>]*>', re.IGNORECASE)
+_RE_IFRAME = re.compile(r'<iframe[^>]*>', re.IGNORECASE)
+
+# DOM — 숨겨진 요소 / 제목 / 텍스트
+_RE_HIDDEN = re.compile(
+    r'(?:display\s*:\s*none|visibility\s*:\s*hidden|'
+    r'type\s*=\s*["\']hidden["\'])',
+    re.IGNORECASE,
+)
+_RE_TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+_RE_TAG = re.compile(r'<[^>]+>')
+
+# DOM — 피싱 / 사회공학 패턴
+_RE_FAVICON = re.compile(
+    r'<link[^>]*rel\s*=\s*["\'](?:shortcut\s+)?icon["\']', re.IGNORECASE
+)
+_RE_LOGIN_FORM = re.compile(
+    r'<form[^>]*(?:login|signin|log-in|sign-in|auth)', re.IGNORECASE
+)
+_RE_POPUP = re.compile(r'window\.open\s*\(', re.IGNORECASE)
+_RE_NO_RIGHT_CLICK = re.compile(
+    r'oncontextmenu\s*=\s*["\']?\s*(?:return\s+false|event\.preventDefault)',
+    re.IGNORECASE,
+)
+_RE_AUTO_REDIRECT = re.compile(
+    r'(?:meta[^>]*http-equiv\s*=\s*["\']refresh["\']|'
+    r'window\.location\s*=|location\.replace)',
+    re.IGNORECASE,
+)
+_RE_DATA_URI = re.compile(r'(?:src|href)\s*=\s*["\']data:', re.IGNORECASE)
+_RE_EVENT_HANDLER = re.compile(
+    r'\bon(?:click|load|error|mouseover|focus|blur|submit|change)\s*=',
+    re.IGNORECASE,
+)
+_RE_EXTERNAL_FORM_ACTION = re.compile(
+    r'<form[^>]*action\s*=\s*["\']https?://', re.IGNORECASE
+)
+
+
+# DOM 다중 패턴 스캔 대상 (이름 → 패턴)
+# 개수 특징은 비중첩 매치 수, 불리언 특징은 매치 존재 여부로 사용합니다.
+_DOM_SCAN_PATTERNS: dict[str, re.Pattern] = {
+    "form": _RE_FORM,
+    "password_field": _RE_PASSWORD_FIELD,
+    "input": _RE_INPUT,
+    "script": _RE_SCRIPT,
+    "external_script": _RE_EXTERNAL_SCRIPT,
+    "external_resource": _RE_EXTERNAL_RESOURCE,
+    "relative_resource": _RE_RELATIVE_RESOURCE,
+    "img": _RE_IMG,
+    "link": _RE_LINK,
+    "meta": _RE_META,
+    "iframe": _RE_IFRAME,
+    "hidden": _RE_HIDDEN,
+    "data_uri": _RE_DATA_URI,
+    "event_handler": _RE_EVENT_HANDLER,
+    "favicon": _RE_FAVICON,
+    "login_form": _RE_LOGIN_FORM,
+    "popup": _RE_POPUP,
+    "no_right_click": _RE_NO_RIGHT_CLICK,
+    "auto_redirect": _RE_AUTO_REDIRECT,
+    "external_form_action": _RE_EXTERNAL_FORM_ACTION,
 }
 
+# 존재 여부만 필요한 패턴 (re 폴백에서 search 사용)
+_DOM_FLAG_PATTERNS: frozenset[str] = frozenset({
+    "favicon", "login_form", "popup", "no_right_click",
+    "auto_redirect", "external_form_action",
+})
+
+
+def _count_matches(pattern: re.Pattern, text: str) -> int:
+    """매치 수만 계산 (findall처럼 매치 문자열 리스트를 만들지 않음)"""
+    return sum(1 for _ in pattern.finditer(text))
+
+
+def _count_hs_match(
+    pattern_id: int,
+    start: int,
+    end: int,
+    counts: list[int],
+    last_start: list[int],
+    last_end: list[int],
+) -> None:
+    """
+    hyperscan 매치 보고를 re.finditer의 비중첩 매치 수로 환산
+
+    이전에 센 매치 뒤에서 시작하면 새 매치로 세고, 같은 시작 위치의 더 긴
+    매치는 탐욕적 수량자처럼 끝 위치만 연장합니다. 그 외 겹치는 매치는 무시합니다.
+    """
+    if start >= last_end[pattern_id]:
+        counts[pattern_id] += 1
+        last_start[pattern_id] = start
+        last_end[pattern_id] = max(end, start + 1)
+    elif start == last_start[pattern_id]:
+        last_end[pattern_id] = end
+
+
+# hyperscan의 \w, \b, \s는 ASCII 기준 — 비ASCII 문자 또는 re가 공백으로 보는
+# ASCII 제어 문자(\x1c-\x1f)가 있으면 re 경로로 스캔
+_RE_HS_UNSAFE = re.compile(r'[\x1c-\x1f]')
+
+
+def _compile_hyperscan_db(expressions: list[tuple[str, int]], label: str) -> Any:
+    """
+    (패턴 문자열, re 플래그) 목록을 hyperscan 블록 모드 데이터베이스로 컴파일
+
+    hyperscan 미설치 또는 컴파일 실패 시 None을 반환합니다 (호출자는 re 폴백).
+    패턴 ID는 목록 순서의 인덱스입니다.
+    """
+    if hyperscan is None:
+        return None
+
+    flags: list[int] = []
+    for _, re_flags in expressions:
+        hs_flags = hyperscan.HS_FLAG_SOM_LEFTMOST
+        if re_flags & re.IGNORECASE:
+            hs_flags |= hyperscan.HS_FLAG_CASELESS
+        if re_flags & re.DOTALL:
+            hs_flags |= hyperscan.HS_FLAG_DOTALL
+        flags.append(hs_flags)
+
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[expr.encode("utf-8") for expr, _ in expressions],
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=flags,
+        )
+        return db
+    except Exception as e:
+        logger.warning("hyperscan %s 패턴 컴파일 실패 — re 스캔 사용: %s", label, e)
+        return None
+
+
+def _thread_scratch(db: Any, local: threading.local) -> Any:
+    """스레드별 hyperscan scratch (scratch는 스레드 간 공유 불가)"""
+    scratch = getattr(local, "scratch", None)
+    if scratch is None:
+        scratch = hyperscan.Scratch(db)
+        local.scratch = scratch
+    return scratch
+
+
+class _DOMPatternScanner:
+    """
+    DOM 패턴 다중 스캐너
+
+    hyperscan이 설치되어 있으면 모든 패턴을 하나의 DFA 데이터베이스로 컴파일하여
+    HTML을 한 번만 훑고, 없거나 HTML이 ASCII가 아니면 패턴별 re 스캔으로 폴백합니다.
+    hyperscan은 모든 매치 끝 위치를 보고하므로 _count_hs_match로
+    re.findall의 비중첩 매치 수와 맞춥니다.
+    SOM_LEFTMOST는 끝 위치마다 가장 왼쪽 시작만 보고하므로 `.*?` 본문을 가진
+    script 패턴은 여는/닫는 태그로 나눠 스캔한 뒤 짝을 맞춰 셉니다.
+    """
+
+    def __init__(self) -> None:
+        # hyperscan 경로의 패턴 목록 — script는 여는/닫는 태그 쌍으로 대체
+        self._names = [name for name in _DOM_SCAN_PATTERNS if name != "script"]
+        self._patterns = [_DOM_SCAN_PATTERNS[name] for name in self._names]
+        self._script_open_id = len(self._patterns)
+        self._script_close_id = self._script_open_id + 1
+        self._patterns += [_RE_SCRIPT_OPEN, _RE_SCRIPT_CLOSE]
+        self._db = _compile_hyperscan_db(
+            [(p.pattern, p.flags) for p in self._patterns], "DOM"
+        )
+        self._local = threading.local()
+
+    def scan(self, html: str) -> dict[str, int]:
+        """패턴 이름 → 매치 수 (불리언 패턴은 0/1 이상)"""
+        if self._db is None or not html.isascii() or _RE_HS_UNSAFE.search(html):
+            return self._scan_re(html)
+
+        scratch = _thread_scratch(self._db, self._local)
+
+        count = len(self._patterns)
+        counts = [0] * count
+        last_start = [-1] * count
+        last_end = [-1] * count
+        script_open_id = self._script_open_id
+        script_close_id = self._script_close_id
+        # [script 블록 안인지 여부, 완성된 script 블록 수]
+        script_state = [False, 0]
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            if pattern_id == script_open_id:
+                script_state[0] = True
+                return
+            if pattern_id == script_close_id:
+                # 여는 태그 이후 첫 닫는 태그에서 블록 하나 완성 (findall의 .*? 동작)
+                if script_state[0]:
+                    script_state[0] = False
+                    script_state[1] += 1
+                return
+            _count_hs_match(pattern_id, start, end, counts, last_start, last_end)
+
+        self._db.scan(
+            html.encode("ascii"),
+            match_event_handler=on_match,
+            scratch=scratch,
+        )
+        result = dict(zip(self._names, counts))
+        result["script"] = script_state[1]
+        return result
+
+    @staticmethod
+    def _scan_re(html: str) -> dict[str, int]:
+        """re 폴백 — 패턴별 스캔"""
+        return {
+            name: (
+                1 if pattern.search(html) else 0
+            ) if name in _DOM_FLAG_PATTERNS else _count_matches(pattern, html)
+            for name, pattern in _DOM_SCAN_PATTERNS.items()
+        }
+
+
+_DOM_SCANNER = _DOMPatternScanner()
+
+
+# ============================================================
+# 사전 컴파일된 정규식 (JavaScript)
+# ============================================================
+
+# JS — 문자열 리터럴 (주석은 _js_comment_chars의 str.find 스캔)
+_RE_JS_STRING = re.compile(r'(?:"[^"]*"|\'[^\']*\'|`[^`]*`)', re.DOTALL)
+
+# JS — 변수 / 함수 선언
+_RE_JS_VAR_DECL = re.compile(r'\b(?:var|let|const)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)')
+_RE_JS_FUNC_DECL = re.compile(r'\bfunction\s+([a-zA-Z_$][a-zA-Z0-9_$]*)')
+
+# JS — 인코딩 / 난독화
+# 첫 반복을 풀어 써서 '\x'/'\u' 리터럴로 시작 — re가 리터럴 접두사 검색으로
+# 후보 위치로 바로 건너뜀 ((?:\\x..){4,}와 동일한 매치)
+_RE_JS_HEX_STRING = re.compile(r'\\x[0-9a-fA-F]{2}(?:\\x[0-9a-fA-F]{2}){3,}')
+_RE_JS_UNICODE_STRING = re.compile(r'\\u[0-9a-fA-F]{4}(?:\\u[0-9a-fA-F]{4}){2,}')
+_RE_JS_BASE64 = re.compile(r'(?:atob|btoa)\s*\(\s*["\']')
+_RE_JS_FROMCHARCODE = re.compile(r'String\.fromCharCode', re.IGNORECASE)
+_RE_JS_HEX_VAR = re.compile(r'\b_0x[a-f0-9]+\b')
+# re 폴백용 동치 패턴 — 앞의 \b를 '_0x' 뒤의 룩비하인드로 옮겨 리터럴 접두사 검색
+# ('_'는 \w이므로 \b_0x ⇔ '_' 앞이 \w가 아님, hyperscan은 룩비하인드 미지원)
+_RE_JS_HEX_VAR_PREFIXED = re.compile(r'_0x(?<!\w_0x)[a-f0-9]+\b')
+
+# JS — 위험 함수 호출
+_RE_JS_EVAL = re.compile(r'\beval\s*\(')
+_RE_JS_DOCUMENT_WRITE = re.compile(r'\bdocument\.write(?:ln)?\s*\(', re.IGNORECASE)
+_RE_JS_SET_TIMEOUT = re.compile(r'\bsetTimeout\s*\(')
+_RE_JS_SET_INTERVAL = re.compile(r'\bsetInterval\s*\(')
+_RE_JS_FUNCTION_CONSTRUCTOR = re.compile(r'\bnew\s+Function\s*\(', re.IGNORECASE)
+
+# JS — API 호출
+_RE_JS_DOM_ACCESS = re.compile(r'\bdocument\.\w+')
+_RE_JS_COOKIE_ACCESS = re.compile(r'\bdocument\.cookie\b', re.IGNORECASE)
+_RE_JS_STORAGE_ACCESS = re.compile(r'\b(?:localStorage|sessionStorage)\.\w+')
+_RE_JS_XHR_FETCH = re.compile(
+    r'\b(?:XMLHttpRequest|fetch\s*\(|\.ajax\s*\()', re.IGNORECASE
+)
+_RE_JS_WEBSOCKET = re.compile(r'\bnew\s+WebSocket\s*\(', re.IGNORECASE)
+_RE_JS_CRYPTO_API = re.compile(
+    r'\b(?:crypto\.subtle|CryptoJS|sjcl|forge)\b', re.IGNORECASE
+)
+_RE_JS_REDIRECT = re.compile(
+    r'(?:window\.location|location\.href|location\.replace)\s*=', re.IGNORECASE
+)
+_RE_JS_IFRAME_CREATE = re.compile(
+    r'createElement\s*\(\s*["\']iframe["\']', re.IGNORECASE
+)
+_RE_JS_EVENT_LISTENER = re.compile(r'\baddEventListener\s*\(')
+_RE_JS_TRY_CATCH = re.compile(r'\btry\s*\{')
+
+# 매치 수만 세는 JS 패턴 (특징 이름 → 패턴)
+_JS_COUNT_PATTERNS: dict[str, re.Pattern] = {
+    "eval": _RE_JS_EVAL,
+    "document_write": _RE_JS_DOCUMENT_WRITE,
+    "set_timeout": _RE_JS_SET_TIMEOUT,
+    "set_interval": _RE_JS_SET_INTERVAL,
+    "function_constructor": _RE_JS_FUNCTION_CONSTRUCTOR,
+    "hex_string": _RE_JS_HEX_STRING,
+    "unicode_string": _RE_JS_UNICODE_STRING,
+    "base64": _RE_JS_BASE64,
+    "fromcharcode": _RE_JS_FROMCHARCODE,
+    "hex_var": _RE_JS_HEX_VAR,
+    "cookie_access": _RE_JS_COOKIE_ACCESS,
+    "storage_access": _RE_JS_STORAGE_ACCESS,
+    "xhr_fetch": _RE_JS_XHR_FETCH,
+    "websocket": _RE_JS_WEBSOCKET,
+    "crypto_api": _RE_JS_CRYPTO_API,
+    "redirect": _RE_JS_REDIRECT,
+    "iframe_create": _RE_JS_IFRAME_CREATE,
+    "event_listener": _RE_JS_EVENT_LISTENER,
+    "try_catch": _RE_JS_TRY_CATCH,
+    "dom_access": _RE_JS_DOM_ACCESS,
+}
+
+# re 폴백 스캔용 패턴 (hyperscan이 컴파일할 수 없는 동치 패턴으로 교체)
+_JS_RE_COUNT_PATTERNS: dict[str, re.Pattern] = {
+    **_JS_COUNT_PATTERNS,
+    "hex_var": _RE_JS_HEX_VAR_PREFIXED,
+}
+
+# 패턴별 필수 리터럴 (소문자, 하나라도 포함돼야 매치 가능)
+# str 포함 검사(C 수준 memmem)로 매치될 수 없는 패턴을 정규식 스캔에서 제외
+_JS_PATTERN_LITERALS: dict[str, tuple[str, ...]] = {
+    "eval": ("eval",),
+    "document_write": ("document.write",),
+    "set_timeout": ("settimeout",),
+    "set_interval": ("setinterval",),
+    "function_constructor": ("function",),
+    "hex_string": ("\\x",),
+    "unicode_string": ("\\u",),
+    "base64": ("atob", "btoa"),
+    "fromcharcode": ("string.fromcharcode",),
+    "hex_var": ("_0x",),
+    "cookie_access": ("document.cookie",),
+    "storage_access": ("storage.",),
+    "xhr_fetch": ("xmlhttprequest", "fetch", ".ajax"),
+    "websocket": ("websocket",),
+    "crypto_api": ("crypto.subtle", "cryptojs", "sjcl", "forge"),
+    "redirect": ("location",),
+    "iframe_create": ("createelement",),
+    "event_listener": ("addeventlistener",),
+    "try_catch": ("try",),
+    "dom_access": ("document.",),
+}
+
+
+# 변수 선언 키워드 (_RE_JS_VAR_DECL의 필수 리터럴)
+_JS_VAR_KEYWORDS: tuple[str, ...] = ("var", "let", "const")
+
+
+def _js_fold(code: str) -> str:
+    """리터럴 사전 검사용 소문자 코드 (re.IGNORECASE의 유니코드 대소문자 대응 포함)"""
+    return code.lower() if code.isascii() else code.casefold()
+
+
+def _has_any(text: str, literals: tuple[str, ...]) -> bool:
+    """텍스트에 리터럴 중 하나라도 포함되는지 여부"""
+    for literal in literals:
+        if literal in text:
+            return True
+    return False
+
+
+# 줄 통계를 numpy로 계산할 조건 — 짧은 줄이 많을 때만 줄 단위 루프보다 빠름
+# (줄이 길면 split/strip 루프의 C 수준 처리가 문자당 numpy 연산보다 빠름)
+_JS_NUMPY_LINE_STATS_MIN_LINES = 512
+_JS_NUMPY_LINE_STATS_MAX_AVG_LINE = 48
+
+# str.strip()이 제거하는 ASCII 공백 문자 조회 테이블
+_ASCII_WHITESPACE_LUT = np.zeros(256, dtype=bool)
+_ASCII_WHITESPACE_LUT[[ord(c) for c in " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"]] = True
+
+
+def _js_comment_chars(code: str) -> int:
+    """
+    단일줄(//...) 주석과 다중줄(/* ... */) 주석의 문자 수 합
+
+    r'//[^\\n]*'와 r'/\\*.*?\\*/'(DOTALL)를 각각 finditer로 훑은 매치 길이의
+    합과 같습니다. 닫히지 않은 '/*'가 있으면 정규식은 이후 모든 '/*' 위치에서
+    끝까지 다시 탐색하지만 (O(n²)), str.find는 그 시점에 멈추므로 항상 선형이고
+    매치 리스트도 만들지 않습니다.
+    """
+    total = 0
+
+    # 단일줄 주석 — '//'부터 줄바꿈 직전(또는 끝)까지, 매치 끝에서 다음 탐색
+    find = code.find
+    end = len(code)
+    i = find("//")
+    while i >= 0:
+        j = find("\n", i + 2)
+        if j < 0:
+            total += end - i
+            break
+        total += j - i
+        i = find("//", j)
+
+    # 다중줄 주석 — '/*' 다음의 첫 '*/'까지 ('/*/'는 닫는 기호가 아님)
+    i = find("/*")
+    while i >= 0:
+        j = find("*/", i + 2)
+        if j < 0:
+            break
+        total += j + 2 - i
+        i = find("/*", j + 2)
+
+    return total
+
+
+def _js_line_stats(code: str) -> tuple[int, int, int]:
+    """
+    비어 있지 않은 줄(공백만 있는 줄 제외)의 (수, 길이 합, 최대 길이)
+
+    짧은 줄이 많은 ASCII 코드는 바이트 버퍼의 줄바꿈 위치로 줄 경계를 구하고
+    줄별 비공백 여부를 logical_or.reduceat으로 한 번에 계산합니다.
+    그 외에는 줄 단위 루프로 계산합니다.
+    """
+    newline_count = code.count("\n")
+    if (
+        newline_count >= _JS_NUMPY_LINE_STATS_MIN_LINES
+        and len(code) <= _JS_NUMPY_LINE_STATS_MAX_AVG_LINE * newline_count
+        and code.isascii()
+    ):
+        # 끝에 줄바꿈을 하나 덧붙여 마지막 줄도 [시작, 줄바꿈) 구간으로 다룸
+        buf = np.frombuffer(code.encode("ascii") + b"\n", dtype=np.uint8)
+        starts = np.concatenate(([0], np.flatnonzero(buf == 0x0A)[:-1] + 1))
+        lengths = np.diff(np.append(starts, buf.size)) - 1
+        non_empty = np.logical_or.reduceat(~_ASCII_WHITESPACE_LUT[buf], starts)
+        selected = lengths[non_empty & (lengths > 0)]
+        if selected.size == 0:
+            return 0, 0, 0
+        return int(selected.size), int(selected.sum()), int(selected.max())
+
+    count = total = longest = 0
+    for line in code.split("\n"):
+        if line.strip():
+            length = len(line)
+            count += 1
+            total += length
+            if length > longest:
+                longest = length
+    return count, total, longest
+
+
+class _JSPatternScanner:
+    """
+    JavaScript 패턴 다중 스캐너
+
+    hyperscan이 설치되어 있으면 개수 패턴 전체를 하나의 데이터베이스로
+    컴파일하여 코드를 한 번만 훑습니다. 없거나 코드가 ASCII가 아니면 패턴별
+    re 스캔으로 폴백하되, 필수 리터럴이 코드에 없는 패턴은 건너뜁니다
+    (대부분의 스크립트는 일부 패턴의 리터럴만 포함).
+    """
+
+    def __init__(self) -> None:
+        self._names = list(_JS_COUNT_PATTERNS)
+        self._db = _compile_hyperscan_db(
+            [(p.pattern, p.flags) for p in _JS_COUNT_PATTERNS.values()], "JS"
+        )
+        self._local = threading.local()
+
+    def scan(self, code: str) -> dict[str, int]:
+        """패턴 이름 → 비중첩 매치 수"""
+        if self._db is None or not code.isascii() or _RE_HS_UNSAFE.search(code):
+            return self._scan_re(code, _js_fold(code))
+
+        scratch = _thread_scratch(self._db, self._local)
+
+        count = len(self._names)
+        counts = [0] * count
+        last_start = [-1] * count
+        last_end = [-1] * count
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            _count_hs_match(pattern_id, start, end, counts, last_start, last_end)
+
+        self._db.scan(code.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+        return dict(zip(self._names, counts))
+
+    @staticmethod
+    def _scan_re(code: str, folded: str) -> dict[str, int]:
+        """re 폴백 — 필수 리터럴이 코드에 있는 패턴만 스캔"""
+        return {
+            name: _count_matches(pattern, code)
+            if _has_any(folded, _JS_PATTERN_LITERALS[name]) else 0
+            for name, pattern in _JS_RE_COUNT_PATTERNS.items()
+        }
+
+
+_JS_SCANNER = _JSPatternScanner()
+
 
 # ============================================================
 # URL 특징 추출기
@@ -53,8 +662,7 @@ class URLFeatureExtractor:
     피싱 탐지, 악성 URL 분류 등 ML 모델 입력으로 사용됩니다.
     """
 
-    # IP 주소 패턴 (IPv4)
-    _IP_PATTERN = re.compile(r"^(\d{1,3}\.){3}\d{1,3}$")
+    __slots__ = ()
 
     # 특징 이름 목록 (순서 고정)
     FEATURE_NAMES: list[str] = [
@@ -112,8 +720,10 @@ class URLFeatureExtractor:
         Returns:
             특징명 → 값 딕셔너리 (numpy 배열 포함)
         """
-        features = self._extract_raw(url)
-        features["feature_vector"] = self.extract_vector(url)
+        values, meta = self._compute(url)
+        features: dict[str, Any] = dict(zip(self.FEATURE_NAMES, values))
+        features.update(meta)
+        features["feature_vector"] = np.array(values, dtype=np.float32)
         return features
 
     def extract_vector(self, url: str) -> np.ndarray:
@@ -126,145 +736,174 @@ class URLFeatureExtractor:
         Returns:
             float32 numpy 배열 (shape: [42])
         """
-        features = self._extract_raw(url)
-        vector = np.array(
-            [features[name] for name in self.FEATURE_NAMES],
-            dtype=np.float32,
-        )
-        return vector
+        # 캐시된 배열은 읽기 전용 — 호출자가 수정할 수 있도록 복사본 반환
+        return _cached_url_vector(url).copy()
+
+    def extract_vector_batch(self, urls: list[str]) -> np.ndarray:
+        """
+        여러 URL의 특징 벡터를 하나의 연속 행렬로 추출
+
+        URL마다 작은 배열을 만들지 않고, 미리 할당한 (N, 42) 버퍼의
+        각 행에 직접 기록합니다. 결과는 그대로 모델 입력으로 쓸 수 있습니다.
+
+        Args:
+            urls: 분석할 URL 목록
+
+        Returns:
+            float32 numpy 배열 (shape: [N, 42])
+        """
+        out = np.empty((len(urls), len(self.FEATURE_NAMES)), dtype=np.float32)
+        for i, url in enumerate(urls):
+            self._fill_row(url, out[i])
+        return out
+
+    def _fill_row(self, url: str, row: np.ndarray) -> None:
+        """특징 값을 중간 딕셔너리 없이 출력 행(row 뷰)에 직접 기록"""
+        row[:] = _cached_url_vector(url)
 
     def _extract_raw(self, url: str) -> dict[str, Any]:
         """URL에서 원시 특징 딕셔너리 추출"""
+        values, meta = self._compute(url)
+        features: dict[str, Any] = dict(zip(self.FEATURE_NAMES, values))
+        features.update(meta)
+        return features
+
+    def _compute(self, url: str) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """
+        URL 특징 계산
+
+        Returns:
+            (FEATURE_NAMES 순서의 특징 값 튜플, 벡터에 포함되지 않는 메타 정보)
+        """
         # URL 파싱
         if not url.startswith(("http://", "https://", "ftp://")):
             url = "https://" + url
 
-        parsed = urlparse(url)
-        domain = parsed.hostname or ""
-        path = parsed.path or ""
-        query = parsed.query or ""
-        fragment = parsed.fragment or ""
+        # 호스트명은 _split_url에서 한 번만 소문자화 — TLD/단축 서비스 조회에 그대로 사용
+        scheme, domain, port, path, query, fragment = _split_url(url)
+        is_ip = _RE_IP.match(domain) is not None
 
         # 도메인 토큰 분할
         domain_parts = domain.split(".") if domain else []
         # 경로 토큰 분할
         path_tokens = [t for t in path.split("/") if t]
-        # 쿼리 파라미터
-        params = parse_qs(query)
+        # 쿼리 파라미터 수
+        num_params = _count_query_params(query)
 
         # 서브도메인 부분 (TLD와 SLD 제외)
         subdomain = ".".join(domain_parts[:-2]) if len(domain_parts) > 2 else ""
         tld = domain_parts[-1] if domain_parts else ""
 
         # 숫자/문자/특수문자 카운트
-        num_digits = sum(1 for c in url if c.isdigit())
-        num_letters = sum(1 for c in url if c.isalpha())
-        num_special = sum(1 for c in url if not c.isalnum() and c not in ":/.-_")
+        if url.isascii():
+            # 바이트 히스토그램 1회로 모든 문자 클래스 카운트
+            bc = np.bincount(
+                np.frombuffer(url.encode("ascii"), dtype=np.uint8), minlength=256
+            )
+            num_digits = int(bc[48:58].sum())
+            num_letters = int(bc[65:91].sum() + bc[97:123].sum())
+            num_special = (
+                len(url) - num_digits - num_letters
+                - int(bc[_PLAIN_PUNCT_CODES].sum())
+            )
+            char_counts = {c: int(bc[ord(c)]) for c in _COUNTED_CHARS}
+            # 같은 히스토그램으로 URL 엔트로피까지 계산
+            url_entropy = _entropy_from_histogram(bc, len(url))
+        else:
+            # 비 ASCII URL은 유니코드 문자 분류를 그대로 사용
+            num_digits = sum(1 for c in url if c.isdigit())
+            num_letters = sum(1 for c in url if c.isalpha())
+            num_special = sum(
+                1 for c in url if not c.isalnum() and c not in ":/.-_"
+            )
+            char_counts = {c: url.count(c) for c in _COUNTED_CHARS}
+            url_entropy = self._shannon_entropy(url)
         url_len = max(len(url), 1)
 
         # 단어 분할 (영숫자 토큰)
-        words = re.findall(r'[a-zA-Z0-9]+', url)
+        words = _RE_WORDS.findall(url)
         word_lengths = [len(w) for w in words] if words else [0]
 
         # 퍼센트 인코딩 수
-        percent_encoded = len(re.findall(r'%[0-9a-fA-F]{2}', url))
-
-        features: dict[str, Any] = {
-            # 기본 길이 특징
-            "url_length": len(url),
-            "domain_length": len(domain),
-            "path_length": len(path),
-
-            # 문자 개수 특징
-            "num_dots": url.count("."),
-            "num_hyphens": url.count("-"),
-            "num_underscores": url.count("_"),
-            "num_slashes": url.count("/"),
-            "num_digits": num_digits,
-
-            # 비율 특징
-            "digit_ratio": num_digits / url_len,
-            "letter_ratio": num_letters / url_len,
-            "special_char_ratio": num_special / url_len,
-
-            # 불리언 특징 (0/1)
-            "has_ip": 1.0 if self._IP_PATTERN.match(domain) else 0.0,
-            "has_port": 1.0 if (parsed.port and parsed.port not in (80, 443)) else 0.0,
-
-            # 도메인 구조 특징
-            "num_subdomains": max(0, len(domain_parts) - 2),
-            "tld_length": len(tld),
-            "is_https": 1.0 if parsed.scheme == "https" else 0.0,
-
-            # 엔트로피 특징
-            "entropy": self._shannon_entropy(url),
-            "domain_entropy": self._shannon_entropy(domain),
-            "path_entropy": self._shannon_entropy(path),
-
-            # 단어 특징
-            "longest_word": max(word_lengths),
-            "avg_word_length": sum(word_lengths) / max(len(word_lengths), 1),
-
-            # 쿼리 특징
-            "num_params": len(params),
-            "param_length": len(query),
-
-            # 패턴 특징
-            "has_at_symbol": 1.0 if "@" in url else 0.0,
-            "has_double_slash_redirect": 1.0 if "//" in path else 0.0,
-            "prefix_suffix_in_domain": 1.0 if "-" in domain else 0.0,
-
-            # 서비스 특징
-            "shortening_service": 1.0 if domain in URL_SHORTENERS else 0.0,
-            "suspicious_tld_score": 1.0 if tld.lower() in SUSPICIOUS_TLDS else 0.0,
-
-            # 프래그먼트 / 인코딩 특징
-            "num_fragments": 1.0 if fragment else 0.0,
-            "num_percent_encoded": float(percent_encoded),
-
-            # 추가 특수문자 카운트
-            "num_at_symbols": float(url.count("@")),
-            "num_ampersands": float(url.count("&")),
-            "num_equals": float(url.count("=")),
-            "num_tildes": float(url.count("~")),
-            "num_semicolons": float(url.count(";")),
-
-            # 추가 패턴 특징
-            "has_double_hyphen": 1.0 if "--" in domain else 0.0,
-            "query_length": float(len(query)),
-            "subdomain_length": float(len(subdomain)),
-
-            # 도메인/경로 토큰 특징
-            "domain_token_count": float(len(domain_parts)),
-            "path_token_count": float(len(path_tokens)),
-            "max_domain_token_length": float(
-                max((len(p) for p in domain_parts), default=0)
-            ),
-            "avg_domain_token_length": float(
+        percent_encoded = _count_matches(_RE_PERCENT, url)
+
+        values = (
+            len(url),                                       # 0: url_length
+            len(domain),                                    # 1: domain_length
+            len(path),                                      # 2: path_length
+            char_counts["."],                               # 3: num_dots
+            char_counts["-"],                               # 4: num_hyphens
+            char_counts["_"],                               # 5: num_underscores
+            char_counts["/"],                               # 6: num_slashes
+            num_digits,                                     # 7: num_digits
+            num_digits / url_len,                           # 8: digit_ratio
+            num_letters / url_len,                          # 9: letter_ratio
+            num_special / url_len,                          # 10: special_char_ratio
+            1.0 if is_ip else 0.0,                          # 11: has_ip
+            1.0 if (port and port not in (80, 443)) else 0.0,    # 12: has_port
+            max(0, len(domain_parts) - 2),                  # 13: num_subdomains
+            len(tld),                                       # 14: tld_length
+            1.0 if scheme == "https" else 0.0,              # 15: is_https
+            url_entropy,                                    # 16: entropy
+            max(word_lengths),                              # 17: longest_word
+            sum(word_lengths) / max(len(word_lengths), 1),  # 18: avg_word_length
+            num_params,                                     # 19: num_params
+            len(query),                                     # 20: param_length
+            1.0 if "@" in url else 0.0,                     # 21: has_at_symbol
+            1.0 if "//" in path else 0.0,                   # 22: has_double_slash_redirect
+            1.0 if "-" in domain else 0.0,                  # 23: prefix_suffix_in_domain
+            1.0 if domain in URL_SHORTENERS else 0.0,       # 24: shortening_service
+            1.0 if tld in SUSPICIOUS_TLDS else 0.0,         # 25: suspicious_tld_score
+            self._shannon_entropy(domain),                  # 26: domain_entropy
+            self._shannon_entropy(path),                    # 27: path_entropy
+            1.0 if fragment else 0.0,                       # 28: num_fragments
+            float(percent_encoded),                         # 29: num_percent_encoded
+            float(char_counts["@"]),                        # 30: num_at_symbols
+            float(char_counts["&"]),                        # 31: num_ampersands
+            float(char_counts["="]),                        # 32: num_equals
+            float(char_counts["~"]),                        # 33: num_tildes
+            float(char_counts[";"]),                        # 34: num_semicolons
+            1.0 if "--" in domain else 0.0,                 # 35: has_double_hyphen
+            float(len(query)),                              # 36: query_length
+            float(len(subdomain)),                          # 37: subdomain_length
+            float(len(domain_parts)),                       # 38: domain_token_count
+            float(len(path_tokens)),                        # 39: path_token_count
+            float(max((len(p) for p in domain_parts), default=0)),  # 40: max_domain_token_length
+            float(
                 sum(len(p) for p in domain_parts) / max(len(domain_parts), 1)
-            ),
+            ),                                              # 41: avg_domain_token_length
+        )
 
-            # 메타 정보 (벡터에는 포함 안 됨)
+        # 메타 정보 (벡터에는 포함 안 됨)
+        meta: dict[str, Any] = {
             "domain": domain,
             "subdomain_count": max(0, len(domain_parts) - 2),
-            "is_ip_address": bool(self._IP_PATTERN.match(domain)),
+            "is_ip_address": is_ip,
             "length": len(url),
         }
 
-        return features
+        return values, meta
 
     @staticmethod
     def _shannon_entropy(text: str) -> float:
         """Shannon 엔트로피 계산"""
         if not text:
             return 0.0
-        counter = Counter(text)
-        length = len(text)
-        return -sum(
-            (c / length) * math.log2(c / length)
-            for c in counter.values()
-            if c > 0
-        )
+        return _entropy_from_counts(Counter(text).values(), len(text))
+
+
+# URL 특징 벡터 LRU 캐시 크기 (크롤링/배치 분석에서 같은 URL이 반복됨)
+_URL_VECTOR_CACHE_SIZE = 16384
+
+_URL_EXTRACTOR = URLFeatureExtractor()
+
+
+@functools.lru_cache(maxsize=_URL_VECTOR_CACHE_SIZE)
+def _cached_url_vector(url: str) -> np.ndarray:
+    """URL 특징 벡터 계산 (읽기 전용 배열로 캐시)"""
+    vector = np.array(_URL_EXTRACTOR._compute(url)[0], dtype=np.float32)
+    vector.flags.writeable = False
+    return vector
 
 
 # ============================================================
@@ -279,6 +918,8 @@ class DOMFeatureExtractor:
     폼, 스크립트, 외부 리소스, 숨겨진 요소 등을 분석합니다.
     """
 
+    __slots__ = ()
+
     # 특징 이름 목록
     FEATURE_NAMES: list[str] = [
         "form_count",                  # 0: 폼 수
@@ -307,6 +948,9 @@ class DOMFeatureExtractor:
         "external_form_action",        # 23: 외부 폼 액션 여부
     ]
 
+    # FEATURE_NAMES 순서로 특징 값을 꺼내는 C 수준 getter (클래스 정의 시 1회 생성)
+    _VECTOR_GETTER = operator.itemgetter(*FEATURE_NAMES)
+
     # 의심 키워드 (피싱/소셜 엔지니어링)
     _SUSPICIOUS_KEYWORDS: list[str] = [
         "verify", "confirm", "update", "suspend", "restrict",
@@ -325,7 +969,9 @@ class DOMFeatureExtractor:
             특징명 → 값 딕셔너리 (numpy 배열 포함)
         """
         features = self._extract_raw(html)
-        features["feature_vector"] = self.extract_vector(html)
+        features["feature_vector"] = np.array(
+            self._VECTOR_GETTER(features), dtype=np.float32
+        )
         return features
 
     def extract_vector(self, html: str) -> np.ndarray:
@@ -338,138 +984,64 @@ class DOMFeatureExtractor:
         Returns:
             float32 numpy 배열 (shape: [24])
         """
-        features = self._extract_raw(html)
-        vector = np.array(
-            [features[name] for name in self.FEATURE_NAMES],
-            dtype=np.float32,
+        return np.array(
+            self._VECTOR_GETTER(self._extract_raw(html)), dtype=np.float32
         )
-        return vector
 
     def _extract_raw(self, html: str) -> dict[str, Any]:
         """HTML에서 원시 특징 추출"""
         html_lower = html.lower()
 
-        # 폼 관련
-        forms = re.findall(r'<form[^>]*>', html, re.IGNORECASE)
-        password_fields = re.findall(
-            r'<input[^>]*type\s*=\s*["\']password["\']', html, re.IGNORECASE
-        )
-        input_fields = re.findall(r'<input[^>]*>', html, re.IGNORECASE)
+        # 패턴 매치 수 (hyperscan 사용 시 단일 패스)
+        counts = _DOM_SCANNER.scan(html)
 
         # 스크립트 관련
-        all_scripts = re.findall(r'<script[^>]*>(.*?)</script>', html, re.DOTALL | re.IGNORECASE)
-        external_scripts = re.findall(
-            r'<script[^>]*src\s*=\s*["\']', html, re.IGNORECASE
-        )
-        inline_scripts = len(all_scripts) - len(external_scripts)
+        inline_scripts = counts["script"] - counts["external_script"]
 
         # 외부 리소스
-        all_resources = re.findall(
-            r'(?:src|href)\s*=\s*["\']?(https?://[^"\'\s>]+)', html, re.IGNORECASE
-        )
-        external_resources = len(all_resources)
-
-        # 이미지, 링크, 메타, iframe
-        img_count = len(re.findall(r'<img[^>]*>', html, re.IGNORECASE))
-        link_count = len(re.findall(r'<a[^>]*href', html, re.IGNORECASE))
-        meta_count = len(re.findall(r'<meta[^>]*>', html, re.IGNORECASE))
-        iframe_count = len(re.findall(r'<iframe[^>]*>', html, re.IGNORECASE))
-
-        # 숨겨진 요소
-        hidden_count = len(re.findall(
-            r'(?:display\s*:\s*none|visibility\s*:\s*hidden|'
-            r'type\s*=\s*["\']hidden["\'])',
-            html, re.IGNORECASE,
-        ))
+        external_resources = counts["external_resource"]
 
         # 제목 추출
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', html, re.DOTALL | re.IGNORECASE)
+        title_match = _RE_TITLE.search(html)
         title = title_match.group(1).strip() if title_match else ""
 
         # 텍스트/HTML 비율 (태그 제거 후 텍스트 길이)
-        text_only = re.sub(r'<[^>]+>', '', html)
-        text_only = re.sub(r'\s+', ' ', text_only).strip()
+        # 태그 제거 후 공백 런을 한 칸으로 압축 (str.split/join은 C 수준 단일 패스)
+        text_only = " ".join(_RE_TAG.sub('', html).split())
         text_ratio = len(text_only) / max(len(html), 1)
 
-        # 파비콘 여부
-        has_favicon = bool(re.search(
-            r'<link[^>]*rel\s*=\s*["\'](?:shortcut\s+)?icon["\']',
-            html, re.IGNORECASE,
-        ))
-
-        # 로그인 폼
-        has_login = bool(re.search(
-            r'<form[^>]*(?:login|signin|log-in|sign-in|auth)',
-            html, re.IGNORECASE,
-        ))
-
-        # 팝업
-        has_popup = bool(re.search(
-            r'window\.open\s*\(', html, re.IGNORECASE
-        ))
-
-        # 우클릭 차단
-        has_no_right_click = bool(re.search(
-            r'oncontextmenu\s*=\s*["\']?\s*(?:return\s+false|event\.preventDefault)',
-            html, re.IGNORECASE,
-        ))
-
-        # 자동 리다이렉트
-        has_auto_redirect = bool(re.search(
-            r'(?:meta[^>]*http-equiv\s*=\s*["\']refresh["\']|'
-            r'window\.location\s*=|location\.replace)',
-            html, re.IGNORECASE,
-        ))
-
-        # data: URI
-        data_uris = len(re.findall(r'(?:src|href)\s*=\s*["\']data:', html, re.IGNORECASE))
-
-        # 인라인 이벤트 핸들러
-        event_handlers = len(re.findall(
-            r'\bon(?:click|load|error|mouseover|focus|blur|submit|change)\s*=',
-            html, re.IGNORECASE,
-        ))
-
         # 의심 키워드
         suspicious_count = sum(
             1 for kw in self._SUSPICIOUS_KEYWORDS if kw.lower() in html_lower
         )
 
-        # 외부 폼 액션 여부
-        external_action = bool(re.search(
-            r'<form[^>]*action\s*=\s*["\']https?://', html, re.IGNORECASE
-        ))
-
-        total_resources = max(
-            external_resources + len(re.findall(r'(?:src|href)\s*=\s*["\'](?!/|#)', html, re.IGNORECASE)),
-            1,
-        )
+        total_resources = max(external_resources + counts["relative_resource"], 1)
 
         return {
-            "form_count": float(len(forms)),
-            "password_field_count": float(len(password_fields)),
-            "input_field_count": float(len(input_fields)),
-            "external_script_count": float(len(external_scripts)),
+            "form_count": float(counts["form"]),
+            "password_field_count": float(counts["password_field"]),
+            "input_field_count": float(counts["input"]),
+            "external_script_count": float(counts["external_script"]),
             "inline_script_count": float(max(inline_scripts, 0)),
             "external_resource_count": float(external_resources),
             "external_resource_ratio": external_resources / total_resources,
-            "iframe_count": float(iframe_count),
-            "hidden_element_count": float(hidden_count),
-            "img_count": float(img_count),
-            "link_count": float(link_count),
-            "meta_count": float(meta_count),
+            "iframe_count": float(counts["iframe"]),
+            "hidden_element_count": float(counts["hidden"]),
+            "img_count": float(counts["img"]),
+            "link_count": float(counts["link"]),
+            "meta_count": float(counts["meta"]),
             "title_length": float(len(title)),
             "html_length": float(len(html)),
             "text_to_html_ratio": text_ratio,
-            "has_favicon": 1.0 if has_favicon else 0.0,
-            "has_login_form": 1.0 if has_login else 0.0,
-            "has_popup": 1.0 if has_popup else 0.0,
-            "has_right_click_disabled": 1.0 if has_no_right_click else 0.0,
-            "has_auto_redirect": 1.0 if has_auto_redirect else 0.0,
-            "data_uri_count": float(data_uris),
-            "event_handler_count": float(event_handlers),
+            "has_favicon": 1.0 if counts["favicon"] else 0.0,
+            "has_login_form": 1.0 if counts["login_form"] else 0.0,
+            "has_popup": 1.0 if counts["popup"] else 0.0,
+            "has_right_click_disabled": 1.0 if counts["no_right_click"] else 0.0,
+            "has_auto_redirect": 1.0 if counts["auto_redirect"] else 0.0,
+            "data_uri_count": float(counts["data_uri"]),
+            "event_handler_count": float(counts["event_handler"]),
             "suspicious_keyword_count": float(suspicious_count),
-            "external_form_action": 1.0 if external_action else 0.0,
+            "external_form_action": 1.0 if counts["external_form_action"] else 0.0,
             # 메타 (벡터에는 미포함)
             "title": title,
         }
@@ -479,6 +1051,46 @@ class DOMFeatureExtractor:
 # JavaScript 특징 추출기
 # ============================================================
 
+# 변수명 엔트로피를 numpy로 일괄 계산할 최소 이름 수
+_JS_NAMES_NUMPY_MIN = 64
+
+# 식별자 문자 → 대소문자 무시 기호 번호 (a-z, 0-9, _, $ → 0..37)
+_JS_IDENT_SYMBOLS = 38
+_JS_IDENT_SYMBOL_LUT = np.zeros(256, dtype=np.intp)
+for _index, _char in enumerate("abcdefghijklmnopqrstuvwxyz0123456789_$"):
+    _JS_IDENT_SYMBOL_LUT[ord(_char)] = _index
+    _JS_IDENT_SYMBOL_LUT[ord(_char.upper())] = _index
+del _index, _char
+
+# JS 특징 LRU 캐시 ((hash(code), len(code)) → FEATURE_NAMES 순서의 특징 값 튜플)
+_JS_FEATURE_CACHE_SIZE = 1024
+_JS_FEATURE_CACHE: OrderedDict[tuple[int, int], tuple[float, ...]] = OrderedDict()
+_JS_FEATURE_CACHE_LOCK = threading.Lock()
+
+# 캐시에 넣을 최소 코드 길이 (문자) — 더 짧으면 매번 계산
+_JS_CACHE_MIN_LENGTH = 256
+
+# 배치 추출을 프로세스 풀로 병렬화할 최소 총 코드 길이 (문자)
+_JS_PARALLEL_MIN_CHARS = 2 << 20
+
+
+def _js_cache_lookup(key: tuple[int, int]) -> Optional[tuple[float, ...]]:
+    """JS 특징 캐시 조회 (적중 시 최근 사용으로 갱신)"""
+    with _JS_FEATURE_CACHE_LOCK:
+        values = _JS_FEATURE_CACHE.get(key)
+        if values is not None:
+            _JS_FEATURE_CACHE.move_to_end(key)
+        return values
+
+
+def _js_cache_store(key: tuple[int, int], values: tuple[float, ...]) -> None:
+    """JS 특징 캐시 저장 (용량 초과 시 가장 오래된 항목 제거)"""
+    with _JS_FEATURE_CACHE_LOCK:
+        _JS_FEATURE_CACHE[key] = values
+        if len(_JS_FEATURE_CACHE) > _JS_FEATURE_CACHE_SIZE:
+            _JS_FEATURE_CACHE.popitem(last=False)
+
+
 class JSFeatureExtractor:
     """
     JavaScript 코드 특징 추출기
@@ -532,8 +1144,9 @@ class JSFeatureExtractor:
         Returns:
             특징명 → 값 딕셔너리 (numpy 배열 포함)
         """
-        features = self._extract_raw(code)
-        features["feature_vector"] = self.extract_vector(code)
+        values = self._cached_values(code)
+        features: dict[str, Any] = dict(zip(self.FEATURE_NAMES, values))
+        features["feature_vector"] = np.array(values, dtype=np.float32)
         return features
 
     def extract_vector(self, code: str) -> np.ndarray:
@@ -546,51 +1159,133 @@ class JSFeatureExtractor:
         Returns:
             float32 numpy 배열 (shape: [32])
         """
-        features = self._extract_raw(code)
-        vector = np.array(
-            [features[name] for name in self.FEATURE_NAMES],
-            dtype=np.float32,
-        )
-        return vector
+        return np.array(self._cached_values(code), dtype=np.float32)
+
+    def extract_vector_batch(
+        self, codes: list[str], max_workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        여러 스크립트의 특징 벡터를 하나의 연속 행렬로 추출
+
+        캐시에 없는 스크립트의 총 길이가 충분히 크면 프로세스 풀에서 병렬로
+        추출합니다 (re 스캔과 특징 조립이 GIL에 묶여 스레드로는 확장되지 않음).
+        작은 배치는 프로세스 기동 비용이 더 크므로 순차 처리합니다.
+
+        Args:
+            codes: JavaScript 소스 코드 목록
+            max_workers: 최대 작업 프로세스 수 (None이면 CPU 수)
+
+        Returns:
+            float32 numpy 배열 (shape: [N, 32])
+        """
+        out = np.empty((len(codes), len(self.FEATURE_NAMES)), dtype=np.float32)
+
+        # 캐시에 없는 고유 스크립트 (키 → 코드) — 짧은 스니펫은 캐시를 조회하지 않음
+        pending: dict[tuple[int, int], str] = {}
+        for code in codes:
+            key = (hash(code), len(code))
+            if key in pending:
+                continue
+            if len(code) < _JS_CACHE_MIN_LENGTH or _js_cache_lookup(key) is None:
+                pending[key] = code
+
+        computed: dict[tuple[int, int], tuple[float, ...]] = {}
+        workers = max_workers or os.cpu_count() or 1
+        if (
+            workers > 1
+            and len(pending) > 1
+            and sum(map(len, pending.values())) >= _JS_PARALLEL_MIN_CHARS
+        ):
+            chunksize = max(1, len(pending) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_js_compute, pending.values(), chunksize=chunksize)
+                for (key, code), values in zip(pending.items(), results):
+                    computed[key] = values
+                    # _cached_values와 같은 기준 — 짧은 스니펫은 캐시하지 않음
+                    if len(code) >= _JS_CACHE_MIN_LENGTH:
+                        _js_cache_store(key, values)
+
+        for i, code in enumerate(codes):
+            values = computed.get((hash(code), len(code)))
+            if values is None:
+                values = self._cached_values(code)
+            out[i] = values
+        return out
+
+    def _cached_values(self, code: str) -> tuple[float, ...]:
+        """
+        특징 값 튜플 조회 (LRU 캐시)
+
+        같은 스크립트가 여러 페이지/iframe에서 반복되므로 (hash, 길이) 키로
+        결과를 재사용합니다. 코드 문자열 자체는 캐시에 보관하지 않습니다.
+        """
+        # 짧은 인라인 스니펫은 재계산이 캐시 조회만큼 싸므로 캐시하지 않음
+        # (스니펫이 캐시를 채워 재계산 비용이 큰 대형 번들을 밀어내지 않도록)
+        if len(code) < _JS_CACHE_MIN_LENGTH:
+            return self._compute(code)
+
+        key = (hash(code), len(code))
+        values = _js_cache_lookup(key)
+        if values is None:
+            values = self._compute(code)
+            _js_cache_store(key, values)
+        return values
 
     def _extract_raw(self, code: str) -> dict[str, Any]:
-        """JavaScript에서 원시 특징 추출"""
-        # 기본 코드 통계
-        lines = code.split("\n")
-        non_empty_lines = [ln for ln in lines if ln.strip()]
-        line_lengths = [len(ln) for ln in non_empty_lines] if non_empty_lines else [0]
+        """JavaScript에서 원시 특징 딕셔너리 추출"""
+        return dict(zip(self.FEATURE_NAMES, self._compute(code)))
+
+    def _compute(self, code: str) -> tuple[float, ...]:
+        """
+        JavaScript 특징 계산
+
+        Returns:
+            FEATURE_NAMES 순서의 특징 값 튜플 (중간 딕셔너리 없이 벡터로 변환)
+        """
+        # 비어 있거나 공백뿐인 코드 (빈 인라인 <script> 등) — 스캔 생략
+        if not code or code.isspace():
+            return self._blank_values(code)
+
+        # 기본 코드 통계 (비어 있지 않은 줄 기준)
+        line_count, line_total, max_line = _js_line_stats(code)
+        avg_line = line_total / max(line_count, 1)
+        code_length = max(len(code), 1)
 
         # 주석 추출 (단일줄, 다중줄)
-        single_comments = re.findall(r'//[^\n]*', code)
-        multi_comments = re.findall(r'/\*.*?\*/', code, re.DOTALL)
-        comment_chars = sum(len(c) for c in single_comments) + sum(len(c) for c in multi_comments)
-        comment_ratio = comment_chars / max(len(code), 1)
+        comment_chars = _js_comment_chars(code)
+        comment_ratio = comment_chars / code_length
 
         # 문자열 비율
-        strings = re.findall(r'(?:"[^"]*"|\'[^\']*\'|`[^`]*`)', code, re.DOTALL)
-        string_chars = sum(len(s) for s in strings)
-        string_ratio = string_chars / max(len(code), 1)
+        string_chars = sum(map(len, _RE_JS_STRING.findall(code)))
+        string_ratio = string_chars / code_length
 
-        # 코드 밀도 (공백 제거 후 비율)
-        stripped = code.replace(" ", "").replace("\n", "").replace("\t", "")
-        code_density = len(stripped) / max(len(code), 1)
+        # 코드 밀도 (공백 제거 후 비율) — 복사본 대신 공백 문자 수를 셈
+        whitespace = code.count(" ") + code.count("\n") + code.count("\t")
+        code_density = (len(code) - whitespace) / code_length
 
         # 변수/함수 추출
-        var_names = re.findall(r'\b(?:var|let|const)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)', code)
-        func_names = re.findall(r'\bfunction\s+([a-zA-Z_$][a-zA-Z0-9_$]*)', code)
+        # (키워드가 없으면 \b로 시작해 느린 정규식 스캔을 생략)
+        var_names = (
+            _RE_JS_VAR_DECL.findall(code)
+            if _has_any(code, _JS_VAR_KEYWORDS) else []
+        )
+        func_names = _RE_JS_FUNC_DECL.findall(code) if "function" in code else []
         all_names = var_names + func_names
 
         # 변수명 엔트로피 계산
         var_entropy = self._names_entropy(all_names)
 
+        # 패턴별 매치 수 (hyperscan 단일 패스 또는 리터럴 사전 검사 + re)
+        counts = _JS_SCANNER.scan(code)
+
         # 인코딩된 문자열 수
-        hex_strings = len(re.findall(r'(?:\\x[0-9a-fA-F]{2}){4,}', code))
-        unicode_strings = len(re.findall(r'(?:\\u[0-9a-fA-F]{4}){3,}', code))
-        base64_count = len(re.findall(r'(?:atob|btoa)\s*\(\s*["\']', code))
-        fromcharcode = len(re.findall(r'String\.fromCharCode', code, re.IGNORECASE))
+        hex_strings = counts["hex_string"]
+        unicode_strings = counts["unicode_string"]
+        base64_count = counts["base64"]
+        fromcharcode = counts["fromcharcode"]
 
         # _0x 변수 수
-        hex_vars = len(re.findall(r'\b_0x[a-f0-9]+\b', code))
+        hex_vars = counts["hex_var"]
 
         # 난독화 점수 계산
         obfuscation_score = self._calc_obfuscation(
@@ -599,99 +1294,105 @@ class JSFeatureExtractor:
             unicode_count=unicode_strings,
             base64_count=base64_count,
             code_density=code_density,
-            avg_line=sum(line_lengths) / max(len(line_lengths), 1),
+            avg_line=avg_line,
             hex_vars=hex_vars,
         )
 
-        return {
+        return (
             # 기본 통계
-            "code_length": float(len(code)),
-            "line_count": float(len(non_empty_lines)),
-            "avg_line_length": sum(line_lengths) / max(len(line_lengths), 1),
-            "max_line_length": float(max(line_lengths)),
+            float(len(code)),
+            float(line_count),
+            avg_line,
+            float(max_line),
 
             # 위험 함수 호출
-            "eval_count": float(len(re.findall(r'\beval\s*\(', code))),
-            "document_write_count": float(len(re.findall(
-                r'\bdocument\.write(?:ln)?\s*\(', code, re.IGNORECASE
-            ))),
-            "set_timeout_count": float(len(re.findall(r'\bsetTimeout\s*\(', code))),
-            "set_interval_count": float(len(re.findall(r'\bsetInterval\s*\(', code))),
-            "function_constructor_count": float(len(re.findall(
-                r'\bnew\s+Function\s*\(', code, re.IGNORECASE
-            ))),
+            float(counts["eval"]),
+            float(counts["document_write"]),
+            float(counts["set_timeout"]),
+            float(counts["set_interval"]),
+            float(counts["function_constructor"]),
 
             # 인코딩 패턴
-            "encoded_string_count": float(hex_strings + unicode_strings + base64_count),
-            "base64_count": float(base64_count),
-            "hex_string_count": float(hex_strings),
-            "unicode_string_count": float(unicode_strings),
-            "string_fromcharcode_count": float(fromcharcode),
+            float(hex_strings + unicode_strings + base64_count),
+            float(base64_count),
+            float(hex_strings),
+            float(unicode_strings),
+            float(fromcharcode),
 
             # 코드 구조
-            "variable_name_entropy": var_entropy,
-            "variable_count": float(len(var_names)),
-            "function_count": float(len(func_names)),
-            "obfuscation_score": obfuscation_score,
-            "code_density": code_density,
-            "comment_ratio": comment_ratio,
-            "string_ratio": string_ratio,
+            var_entropy,
+            float(len(var_names)),
+            float(len(func_names)),
+            obfuscation_score,
+            code_density,
+            comment_ratio,
+            string_ratio,
 
             # API 호출
-            "dom_access_count": float(len(re.findall(
-                r'\bdocument\.\w+', code
-            ))),
-            "cookie_access_count": float(len(re.findall(
-                r'\bdocument\.cookie\b', code, re.IGNORECASE
-            ))),
-            "storage_access_count": float(len(re.findall(
-                r'\b(?:localStorage|sessionStorage)\.\w+', code
-            ))),
-            "xhr_fetch_count": float(len(re.findall(
-                r'\b(?:XMLHttpRequest|fetch\s*\(|\.ajax\s*\()', code, re.IGNORECASE
-            ))),
-            "websocket_count": float(len(re.findall(
-                r'\bnew\s+WebSocket\s*\(', code, re.IGNORECASE
-            ))),
-            "crypto_api_count": float(len(re.findall(
-                r'\b(?:crypto\.subtle|CryptoJS|sjcl|forge)\b', code, re.IGNORECASE
-            ))),
-            "redirect_count": float(len(re.findall(
-                r'(?:window\.location|location\.href|location\.replace)\s*=',
-                code, re.IGNORECASE,
-            ))),
-            "iframe_create_count": float(len(re.findall(
-                r'createElement\s*\(\s*["\']iframe["\']', code, re.IGNORECASE
-            ))),
-            "event_listener_count": float(len(re.findall(
-                r'\baddEventListener\s*\(', code
-            ))),
-            "try_catch_count": float(len(re.findall(
-                r'\btry\s*\{', code
-            ))),
-            "hex_var_count": float(hex_vars),
-        }
+            float(counts["dom_access"]),
+            float(counts["cookie_access"]),
+            float(counts["storage_access"]),
+            float(counts["xhr_fetch"]),
+            float(counts["websocket"]),
+            float(counts["crypto_api"]),
+            float(counts["redirect"]),
+            float(counts["iframe_create"]),
+            float(counts["event_listener"]),
+            float(counts["try_catch"]),
+            float(hex_vars),
+        )
+
+    def _blank_values(self, code: str) -> tuple[float, ...]:
+        """
+        공백뿐인 코드의 특징 값 (전체 계산과 동일한 결과)
+
+        매치 가능한 패턴, 주석, 문자열, 비어 있지 않은 줄이 없으므로
+        코드 길이, 코드 밀도, 밀도에서 나오는 난독화 점수만 0이 아닐 수 있습니다.
+        """
+        whitespace = code.count(" ") + code.count("\n") + code.count("\t")
+        code_density = (len(code) - whitespace) / max(len(code), 1)
+        obfuscation_score = self._calc_obfuscation(
+            var_entropy=0.0,
+            hex_count=0,
+            unicode_count=0,
+            base64_count=0,
+            code_density=code_density,
+            avg_line=0.0,
+            hex_vars=0,
+        )
+        # 0: 코드 길이, 1~16: 0, 17: 난독화 점수, 18: 코드 밀도, 19~31: 0
+        return (
+            (float(len(code)),) + (0.0,) * 16
+            + (obfuscation_score, code_density) + (0.0,) * 13
+        )
 
     @staticmethod
     def _names_entropy(names: list[str]) -> float:
-        """변수/함수명의 평균 문자 엔트로피"""
+        """변수/함수명의 평균 문자 엔트로피 (2자 미만 이름 제외)"""
+        names = [name for name in names if len(name) >= 2]
         if not names:
             return 0.0
 
-        entropies: list[float] = []
-        for name in names:
-            if len(name) < 2:
-                continue
-            counter = Counter(name.lower())
-            length = len(name)
-            entropy = -sum(
-                (c / length) * math.log2(c / length)
-                for c in counter.values()
-                if c > 0
-            )
-            entropies.append(entropy)
-
-        return sum(entropies) / max(len(entropies), 1)
+        if len(names) < _JS_NAMES_NUMPY_MIN:
+            return sum(
+                _entropy_from_counts(Counter(name.lower()).values(), len(name))
+                for name in names
+            ) / len(names)
+
+        # 식별자는 ASCII [A-Za-z0-9_$]만 허용 — 대소문자 무시 38개 기호로 매핑해
+        # (이름 번호, 기호) 쌍을 한 번의 bincount로 집계
+        lengths = np.fromiter(map(len, names), dtype=np.intp, count=len(names))
+        symbols = _JS_IDENT_SYMBOL_LUT[
+            np.frombuffer("".join(names).encode("ascii"), dtype=np.uint8)
+        ]
+        owners = np.repeat(np.arange(len(names)), lengths)
+        counts = np.bincount(
+            owners * _JS_IDENT_SYMBOLS + symbols,
+            minlength=len(names) * _JS_IDENT_SYMBOLS,
+        ).reshape(len(names), _JS_IDENT_SYMBOLS).astype(np.float64)
+        clog2 = (counts * np.log2(np.maximum(counts, 1.0))).sum(axis=1)
+        entropies = np.maximum(np.log2(lengths) - clog2 / lengths, 0.0)
+        return float(entropies.mean())
 
     @staticmethod
     def _calc_obfuscation(
@@ -732,3 +1433,11 @@ class JSFeatureExtractor:
             score += min(1.0, hex_vars / 20.0) * 0.20
 
         return min(1.0, max(0.0, score))
+
+
+_JS_EXTRACTOR = JSFeatureExtractor()
+
+
+def _js_compute(code: str) -> tuple[float, ...]:
+    """프로세스 풀 작업 함수 — 모듈 수준이어야 피클 가능"""
+    return _JS_EXTRACTOR._compute(code)
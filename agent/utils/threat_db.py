@@ -6,26 +6,49 @@ aiosqlite 기반 비동기 위협 정보 저장소.
 
 스키마:
 - threats: URL/도메인별 위협 정보 (id, url, domain, hash, level, type, details, created_at, updated_at)
+  (details는 JSON 텍스트, 또는 크기가 줄어들면 zlib 프리셋 사전 압축 BLOB;
+   hash는 소문자 16진 다이제스트를 원시 바이트 BLOB으로 저장하고 조회 시 16진 문자열로
+   반환 — 그 외 값은 입력 그대로 텍스트로 저장)
 - iocs: 침해 지표 (id, type, value, source, confidence)
 - scan_results: 스캔 결과 (id, url, score, report, timestamp)
 
 기능:
-- 비동기 CRUD 연산
+- 비동기 CRUD 연산 (단건 쓰기는 쓰기 큐에서 한 트랜잭션으로 묶어 커밋)
+- 쓰기 연결 1개 + 읽기 전용 연결 풀 (WAL 동시 읽기)
 - 벌크 임포트
+- 텍스트 내 IoC 다중 리터럴 매칭
 - 통계 쿼리
 - 컨텍스트 매니저 (자동 연결/종료)
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import itertools
 import json
 import logging
+import re
+import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterator, Optional
 
 import aiosqlite
 
+try:
+    import hyperscan
+except ImportError:  # hyperscan 미설치 — IoC별 부분 문자열 검사로 폴백
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 — 표준 json으로 파싱
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,22 +62,48 @@ CREATE TABLE IF NOT EXISTS threats (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     url TEXT NOT NULL,
     domain TEXT NOT NULL DEFAULT '',
-    hash TEXT NOT NULL DEFAULT '',
+    -- 16진 다이제스트의 원시 바이트 (SHA-256 64자 → 32바이트), 16진이 아닌 값은 텍스트
+    hash BLOB NOT NULL DEFAULT x'',
     level INTEGER NOT NULL DEFAULT 0,
     type TEXT NOT NULL DEFAULT 'unknown',
+    -- JSON 텍스트 또는 압축 BLOB (SQLite는 열 선언과 무관하게 BLOB을 그대로 저장)
     details TEXT NOT NULL DEFAULT '{}',
     created_at REAL NOT NULL,
     updated_at REAL NOT NULL
 );
 
--- URL 인덱스 (빠른 조회)
-CREATE INDEX IF NOT EXISTS idx_threats_url ON threats(url);
--- 도메인 인덱스
-CREATE INDEX IF NOT EXISTS idx_threats_domain ON threats(domain);
--- 해시 인덱스
-CREATE INDEX IF NOT EXISTS idx_threats_hash ON threats(hash);
--- 위협 수준 인덱스
-CREATE INDEX IF NOT EXISTS idx_threats_level ON threats(level);
+-- 조회 열+갱신 시각 복합 인덱스 (각 조회의 ORDER BY updated_at 정렬을 인덱스 역순
+-- 스캔으로 처리, 조회 열 단독 조건도 선두 컬럼으로 처리하므로 단일 열 인덱스는 제거)
+DROP INDEX IF EXISTS idx_threats_url;
+CREATE INDEX IF NOT EXISTS idx_threats_url_updated ON threats(url, updated_at);
+DROP INDEX IF EXISTS idx_threats_domain;
+CREATE INDEX IF NOT EXISTS idx_threats_domain_updated ON threats(domain, updated_at);
+DROP INDEX IF EXISTS idx_threats_hash;
+CREATE INDEX IF NOT EXISTS idx_threats_hash_updated ON threats(hash, updated_at);
+-- 위협 수준 조회 (level >= ? ORDER BY level DESC, updated_at DESC)
+DROP INDEX IF EXISTS idx_threats_level;
+CREATE INDEX IF NOT EXISTS idx_threats_level_updated ON threats(level, updated_at);
+
+-- 위협 검색용 트라이그램 전문 색인 (search_threats의 부분 문자열 검색 후보 축소)
+-- 내용 없는(contentless) 테이블: details는 압축을 푼 JSON 텍스트를 색인하므로
+-- 트리거가 details_json()을 호출 — threats에 쓰는 연결은 이 SQL 함수를 등록해야 함
+CREATE VIRTUAL TABLE IF NOT EXISTS threats_fts USING fts5(
+    url, domain, details, content='', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS threats_fts_ai AFTER INSERT ON threats BEGIN
+    INSERT INTO threats_fts(rowid, url, domain, details)
+    VALUES (new.id, new.url, new.domain, details_json(new.details));
+END;
+CREATE TRIGGER IF NOT EXISTS threats_fts_ad AFTER DELETE ON threats BEGIN
+    INSERT INTO threats_fts(threats_fts, rowid, url, domain, details)
+    VALUES ('delete', old.id, old.url, old.domain, details_json(old.details));
+END;
+CREATE TRIGGER IF NOT EXISTS threats_fts_au AFTER UPDATE OF url, domain, details ON threats BEGIN
+    INSERT INTO threats_fts(threats_fts, rowid, url, domain, details)
+    VALUES ('delete', old.id, old.url, old.domain, details_json(old.details));
+    INSERT INTO threats_fts(rowid, url, domain, details)
+    VALUES (new.id, new.url, new.domain, details_json(new.details));
+END;
 
 -- 침해 지표 (IoC) 테이블
 CREATE TABLE IF NOT EXISTS iocs (
@@ -65,8 +114,10 @@ CREATE TABLE IF NOT EXISTS iocs (
     confidence REAL NOT NULL DEFAULT 0.0
 );
 
--- IoC 타입+값 인덱스
-CREATE INDEX IF NOT EXISTS idx_iocs_type_value ON iocs(type, value);
+-- IoC 타입+값 고유 인덱스 (중복 IoC는 INSERT OR IGNORE로 B-tree에서 걸러짐)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_iocs_type_value ON iocs(type, value);
+-- IoC 타입별 신뢰도순 조회
+CREATE INDEX IF NOT EXISTS idx_iocs_type_confidence ON iocs(type, confidence);
 
 -- 스캔 결과 테이블
 CREATE TABLE IF NOT EXISTS scan_results (
@@ -77,13 +128,433 @@ CREATE TABLE IF NOT EXISTS scan_results (
     timestamp REAL NOT NULL
 );
 
--- 스캔 결과 URL 인덱스
-CREATE INDEX IF NOT EXISTS idx_scan_results_url ON scan_results(url);
+-- 스캔 결과 URL+시각 인덱스 (URL별 최근 스캔 조회)
+DROP INDEX IF EXISTS idx_scan_results_url;
+CREATE INDEX IF NOT EXISTS idx_scan_results_url_timestamp ON scan_results(url, timestamp);
 -- 스캔 결과 타임스탬프 인덱스
 CREATE INDEX IF NOT EXISTS idx_scan_results_timestamp ON scan_results(timestamp);
+
+-- get_stats용 집계 카운터 (트리거로 유지, 전체 테이블 COUNT/GROUP BY 생략)
+-- kind: 'scalar' (total_threats, total_iocs, total_scans, score_sum) 또는 그룹 이름
+-- 그룹 카운터는 0이 되면 삭제 (GROUP BY 결과처럼 빈 그룹은 없음)
+CREATE TABLE IF NOT EXISTS stats_counters (
+    kind TEXT NOT NULL,
+    name NOT NULL,
+    value NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, name)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS stats_threats_ai AFTER INSERT ON threats BEGIN
+    UPDATE stats_counters SET value = value + 1 WHERE kind = 'scalar' AND name = 'total_threats';
+    INSERT INTO stats_counters(kind, name, value) VALUES ('threats_by_level', new.level, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+    INSERT INTO stats_counters(kind, name, value) VALUES ('threats_by_type', new.type, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS stats_threats_ad AFTER DELETE ON threats BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'scalar' AND name = 'total_threats';
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'threats_by_level' AND name = old.level;
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'threats_by_type' AND name = old.type;
+    DELETE FROM stats_counters WHERE kind IN ('threats_by_level', 'threats_by_type') AND value = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS stats_threats_au AFTER UPDATE OF level, type ON threats BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'threats_by_level' AND name = old.level;
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'threats_by_type' AND name = old.type;
+    INSERT INTO stats_counters(kind, name, value) VALUES ('threats_by_level', new.level, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+    INSERT INTO stats_counters(kind, name, value) VALUES ('threats_by_type', new.type, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+    DELETE FROM stats_counters WHERE kind IN ('threats_by_level', 'threats_by_type') AND value = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_iocs_ai AFTER INSERT ON iocs BEGIN
+    UPDATE stats_counters SET value = value + 1 WHERE kind = 'scalar' AND name = 'total_iocs';
+    INSERT INTO stats_counters(kind, name, value) VALUES ('iocs_by_type', new.type, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS stats_iocs_ad AFTER DELETE ON iocs BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'scalar' AND name = 'total_iocs';
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'iocs_by_type' AND name = old.type;
+    DELETE FROM stats_counters WHERE kind = 'iocs_by_type' AND value = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS stats_iocs_au AFTER UPDATE OF type ON iocs BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'iocs_by_type' AND name = old.type;
+    INSERT INTO stats_counters(kind, name, value) VALUES ('iocs_by_type', new.type, 1)
+        ON CONFLICT(kind, name) DO UPDATE SET value = value + 1;
+    DELETE FROM stats_counters WHERE kind = 'iocs_by_type' AND value = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_scans_ai AFTER INSERT ON scan_results BEGIN
+    UPDATE stats_counters SET value = value + 1 WHERE kind = 'scalar' AND name = 'total_scans';
+    UPDATE stats_counters SET value = value + new.score WHERE kind = 'scalar' AND name = 'score_sum';
+END;
+CREATE TRIGGER IF NOT EXISTS stats_scans_ad AFTER DELETE ON scan_results BEGIN
+    UPDATE stats_counters SET value = value - 1 WHERE kind = 'scalar' AND name = 'total_scans';
+    UPDATE stats_counters SET value = value - old.score WHERE kind = 'scalar' AND name = 'score_sum';
+END;
+CREATE TRIGGER IF NOT EXISTS stats_scans_au AFTER UPDATE OF score ON scan_results BEGIN
+    UPDATE stats_counters SET value = value - old.score + new.score
+        WHERE kind = 'scalar' AND name = 'score_sum';
+END;
+"""
+
+# 비운 stats_counters를 현재 테이블 내용으로 다시 채움 (스키마 버전 3 마이그레이션)
+_STATS_COUNTERS_REBUILD_SQL = """
+INSERT INTO stats_counters(kind, name, value)
+SELECT 'scalar', 'total_threats', COUNT(*) FROM threats
+UNION ALL SELECT 'scalar', 'total_iocs', COUNT(*) FROM iocs
+UNION ALL SELECT 'scalar', 'total_scans', COUNT(*) FROM scan_results
+UNION ALL SELECT 'scalar', 'score_sum', TOTAL(score) FROM scan_results
+UNION ALL SELECT 'threats_by_level', level, COUNT(*) FROM threats GROUP BY level
+UNION ALL SELECT 'threats_by_type', type, COUNT(*) FROM threats GROUP BY type
+UNION ALL SELECT 'iocs_by_type', type, COUNT(*) FROM iocs GROUP BY type
 """
 
 
+# 연결 시 적용하는 PRAGMA (synchronous, cache_size는 생성자 인자로 조정)
+# - WAL: 읽기와 쓰기 동시 진행, 커밋 시 이중 쓰기 없음
+# - wal_autocheckpoint: WAL이 1000페이지를 넘으면 자동 체크포인트
+# - temp_store=MEMORY: 정렬/임시 인덱스를 메모리에서 처리
+# - mmap_size: 256MB까지 메모리 맵 읽기 (read() 시스템 콜 생략)
+_CONNECTION_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+# PRAGMA synchronous 허용 값
+# NORMAL은 WAL 모드에서 체크포인트 시에만 fsync하며 (커밋마다 fsync 안 함)
+# 전원 장애 시 마지막 커밋 일부가 유실될 수 있으나 DB가 손상되지는 않음
+_SYNCHRONOUS_MODES: tuple[str, ...] = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# 기본 페이지 캐시 크기 (MB, 연결별)
+_DEFAULT_CACHE_MB = 64
+
+# 기본 읽기 연결 수 — WAL은 쓰기 1개와 동시에 여러 읽기를 허용하므로
+# 조회/통계/검색이 쓰기 연결의 커밋 뒤에 줄 서지 않도록 별도 연결로 처리
+_DEFAULT_READ_POOL_SIZE = 4
+
+# 연결별 준비문(prepared statement) 캐시 크기 (sqlite3 기본값 128)
+_CACHED_STATEMENTS = 256
+
+# 쓰기 큐에서 한 트랜잭션으로 묶는 최대 쓰기 수
+# 대기 시간 없이 큐에 쌓여 있는 쓰기만 모음 — 순차 호출은 지연 없이 즉시 커밋되고,
+# 동시 호출은 앞선 커밋이 진행되는 동안 쌓인 만큼 한 번의 커밋(fsync)으로 처리
+_WRITE_BATCH_MAX = 500
+
+# 다중 행 조회에서 한 번에 가져오는 행 수 — limit이 이보다 크면 청크 단위로
+# 가져와 바로 변환 (전체 Row 목록과 딕셔너리 목록을 동시에 들고 있지 않음)
+_FETCH_CHUNK_ROWS = 256
+
+# 문장당 바인드 변수 상한 (구버전 SQLITE_MAX_VARIABLE_NUMBER 기본값)
+# 벌크 임포트는 이 한도 안에서 여러 행을 INSERT … VALUES (…), (…) 한 문장으로 묶음
+_SQL_MAX_VARIABLES = 999
+
+# 이 행 수 이상의 벌크 임포트는 별도 동기 sqlite3 연결로 executor 스레드에서
+# 한 번에 실행 (청크마다 aiosqlite 스레드를 오가지 않음, 연결 생성 비용 때문에
+# 작은 임포트는 기존 쓰기 연결 사용)
+_BULK_OFFLOAD_MIN_ROWS = 2000
+
+
+def _is_memory_db(db_path: str) -> bool:
+    """인메모리 DB 경로 여부 (연결마다 별개 DB라 읽기 풀을 쓸 수 없음)"""
+    return db_path in (":memory:", "")
+
+
+def _multi_row_inserts(
+    insert_sql: str, rows: list[tuple[Any, ...]]
+) -> Iterator[tuple[str, list[Any]]]:
+    """
+    행 목록을 바인드 변수 상한 이내의 다중 행 INSERT 문으로 분할
+
+    Args:
+        insert_sql: VALUES 절을 뺀 INSERT 문 (열 목록 포함)
+        rows: 열 목록과 같은 길이의 값 튜플 리스트 (비어 있지 않음)
+
+    Yields:
+        ("INSERT … VALUES (…), (…), …", 평탄화된 바인드 값)
+    """
+    column_count = len(rows[0])
+    rows_per_statement = max(1, _SQL_MAX_VARIABLES // column_count)
+    row_placeholder = "(" + ", ".join("?" * column_count) + ")"
+
+    for start in range(0, len(rows), rows_per_statement):
+        chunk = rows[start:start + rows_per_statement]
+        # 마지막 청크를 제외하면 SQL이 같아 준비문 캐시를 재사용
+        sql = f"{insert_sql} VALUES " + ", ".join([row_placeholder] * len(chunk))
+        yield sql, list(itertools.chain.from_iterable(chunk))
+
+
+# ============================================================
+# details 압축
+# ============================================================
+
+# details 압축용 zlib 프리셋 사전
+# 위협 상세 정보는 분석기/모니터별로 키 구성이 거의 같으므로, 공통 키/값을
+# 미리 넣어두면 짧은 JSON도 사전 없이 압축할 때보다 훨씬 작아집니다.
+_DETAILS_ZDICT = json.dumps(
+    {
+        "url": "https://www.",
+        "src": "http://",
+        "method": ["GET", "POST"],
+        "pattern": "",
+        "content": "<script",
+        "node": "<iframe",
+        "body_preview": "",
+        "old_action": "",
+        "new_action": "",
+        "error": "",
+        "malicious": 0,
+        "total": 0,
+        "is_threat": False,
+        "is_phishing": False,
+        "is_malware": False,
+        "domain_info": {
+            "domain": "",
+            "age_days": None,
+            "registrar": "",
+            "is_suspicious": True,
+        },
+        "threat_summary": {
+            "virustotal_detections": 0,
+            "safe_browsing_threat": False,
+            "phishtank_phishing": False,
+            "urlhaus_malware": False,
+        },
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+# 압축 BLOB 형식 표시 바이트 (사전 변경 시 새 값을 추가하고 이전 값도 계속 해독)
+_DETAILS_FORMAT_ZLIB_V1 = 0x01
+
+# 이보다 짧은 JSON은 압축하지 않음 (헤더 오버헤드로 오히려 커짐)
+_DETAILS_COMPRESS_MIN_BYTES = 64
+
+
+def _encode_details(details: dict[str, Any]) -> str | bytes:
+    """
+    details 딕셔너리를 저장 형식으로 변환
+
+    압축 결과가 원본 JSON보다 작을 때만 형식 바이트 + zlib 압축 BLOB을,
+    그 외에는 JSON 텍스트를 반환합니다.
+    """
+    text = json.dumps(details, ensure_ascii=False)
+    raw = text.encode("utf-8")
+    if len(raw) < _DETAILS_COMPRESS_MIN_BYTES:
+        return text
+
+    compressor = zlib.compressobj(zdict=_DETAILS_ZDICT)
+    blob = bytes((_DETAILS_FORMAT_ZLIB_V1,)) + compressor.compress(raw) + compressor.flush()
+    return blob if len(blob) < len(raw) else text
+
+
+def _details_json(value: Any) -> Any:
+    """
+    저장된 details 값을 JSON 텍스트로 변환 (_encode_details의 역변환)
+
+    SQL 함수 details_json()으로도 등록되어 압축된 행의 LIKE 검색에 사용됩니다.
+    """
+    if not isinstance(value, bytes):
+        return value
+    if value[:1] != bytes((_DETAILS_FORMAT_ZLIB_V1,)):
+        raise ValueError(f"알 수 없는 details 형식: {value[:1]!r}")
+    decompressor = zlib.decompressobj(zdict=_DETAILS_ZDICT)
+    return (decompressor.decompress(value[1:]) + decompressor.flush()).decode("utf-8")
+
+
+def _json_loads(text: str) -> Any:
+    """
+    저장된 JSON 텍스트 파싱 (orjson이 있으면 사용)
+
+    orjson이 거부하는 표준 json 출력 (NaN/Infinity, 64비트를 넘는 정수 등)은
+    json으로 다시 파싱합니다. 저장(json.dumps)은 LIKE 검색 대상인 텍스트 형식과
+    압축 사전이 바뀌지 않도록 표준 json을 그대로 사용합니다.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+# ============================================================
+# 해시 저장 형식
+# ============================================================
+
+# 스키마 버전 (PRAGMA user_version) — 최신 버전 DB는 연결 시 _SCHEMA_SQL을 실행하지
+# 않으므로, _SCHEMA_SQL을 바꾸면 버전도 올려야 기존 DB에 적용됨
+# 1: hash 열을 원시 바이트로 저장, 2: threats_fts 전문 색인, 3: stats_counters,
+# 4: 조회 정렬용 복합 인덱스
+_SCHEMA_VERSION = 4
+
+# get_stats 통계 쿼리 — 집계 카운터와 최근 24시간 스캔 수를 (종류, 키, 값) 행으로
+# 한 번에 조회 (최근 스캔 수는 시각 기준이라 카운터 대신 타임스탬프 인덱스 범위 조회)
+_STATS_SQL = """
+SELECT kind, name, value FROM stats_counters
+UNION ALL SELECT 'scalar', 'recent_scan_count_24h', COUNT(*) FROM scan_results WHERE timestamp > ?
+"""
+
+# 트라이그램 색인으로 후보를 줄일 수 있는 최소 검색어 길이
+_FTS_MIN_QUERY_LENGTH = 3
+
+# 바이트로 변환할 16진 다이제스트 (bytes.fromhex는 공백도 허용하므로 별도 검사)
+# — 조회 시 bytes.hex()가 소문자를 돌려주므로 소문자만 변환해 원래 표기를 보존
+_RE_HEX_DIGEST = re.compile(r"[0-9a-f]+")
+
+
+def _hash_to_db(hash_value: Any) -> Any:
+    """
+    16진 다이제스트 문자열을 원시 바이트로 변환 (저장 형식)
+
+    짝수 길이의 소문자 16진 문자열만 변환하며, 대문자가 섞인 다이제스트 등
+    그 외 값은 그대로 둡니다 (조회 시 입력한 표기 그대로 반환).
+    이전 스키마의 텍스트 해시 변환용 SQL 함수 hash_to_blob()으로도 등록됩니다.
+    """
+    if not isinstance(hash_value, str):
+        return hash_value
+    if not hash_value:
+        return b""
+    if len(hash_value) % 2 or not _RE_HEX_DIGEST.fullmatch(hash_value):
+        return hash_value
+    return bytes.fromhex(hash_value)
+
+
+# ============================================================
+# IoC 다중 리터럴 매칭
+# ============================================================
+
+# 텍스트(URL, 페이지 내용 등)에 부분 문자열로 등장하는지 검사하는 IoC 유형
+_MATCHABLE_IOC_TYPES: tuple[str, ...] = ("domain", "url", "ip")
+
+
+class _IoCMatcher:
+    """
+    IoC 값 다중 리터럴 매처 (대소문자 무시)
+
+    hyperscan이 설치되어 있으면 모든 IoC 값을 리터럴 모드 데이터베이스로
+    컴파일하여 IoC 수와 무관하게 텍스트를 한 번만 훑고, 없으면 IoC별
+    부분 문자열 검사로 폴백합니다.
+    """
+
+    def __init__(self, iocs: list[dict[str, Any]]) -> None:
+        self._iocs = [ioc for ioc in iocs if ioc["value"]]
+        self._values = [ioc["value"].lower() for ioc in self._iocs]
+        self._db: Any = None
+        self._local = threading.local()
+
+        if hyperscan is None or not self._iocs:
+            return
+
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[value.encode("utf-8") for value in self._values],
+                ids=list(range(len(self._values))),
+                elements=len(self._values),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH,
+                literal=True,
+            )
+            self._db = db
+        except Exception as e:
+            logger.warning("hyperscan IoC 컴파일 실패 — 부분 문자열 검사 사용: %s", e)
+
+    def match(self, text: str) -> list[dict[str, Any]]:
+        """텍스트에 포함된 IoC 목록 (신뢰도 내림차순)"""
+        if self._db is None:
+            lowered = text.lower()
+            matched = [
+                ioc for ioc, value in zip(self._iocs, self._values) if value in lowered
+            ]
+        else:
+            # hyperscan scratch는 스레드 간 공유 불가 — 스레드별 생성
+            scratch = getattr(self._local, "scratch", None)
+            if scratch is None:
+                scratch = hyperscan.Scratch(self._db)
+                self._local.scratch = scratch
+
+            # HS_FLAG_CASELESS는 ASCII만 대소문자를 무시 — 비 ASCII 텍스트는
+            # 폴백과 같도록 먼저 소문자로 변환 (IoC 값은 이미 소문자)
+            if not text.isascii():
+                text = text.lower()
+
+            ids: list[int] = []
+
+            def on_match(ioc_id: int, start: int, end: int, flags: int, context: Any) -> None:
+                ids.append(ioc_id)
+
+            self._db.scan(
+                text.encode("utf-8", "replace"), match_event_handler=on_match, scratch=scratch
+            )
+            matched = [self._iocs[i] for i in ids]
+
+        matched.sort(key=lambda ioc: ioc["confidence"], reverse=True)
+        return matched
+
+    def __len__(self) -> int:
+        return len(self._iocs)
+
+
+# ============================================================
+# 조회 결과 캐시
+# ============================================================
+
+# 단건 조회 캐시 (get_threat_by_url, get_ioc) 최대 항목 수 / 유효 기간 (초)
+_LOOKUP_CACHE_SIZE = 4096
+_LOOKUP_CACHE_TTL = 300.0
+
+
+class _LookupCache:
+    """
+    TTL이 있는 LRU 조회 캐시 (단일 이벤트 루프 전용)
+
+    원시 행(sqlite3.Row, 없으면 None)을 저장하므로 히트마다 새 딕셔너리를
+    만들어 호출자가 결과를 수정해도 캐시가 오염되지 않습니다.
+    무효화할 때마다 세대 번호가 올라가며, 조회 시작 시점의 세대와 다르면
+    저장하지 않아 진행 중이던 조회가 방금 무효화된 결과를 되살리지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = _LOOKUP_CACHE_SIZE, ttl: float = _LOOKUP_CACHE_TTL) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._store: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> tuple[bool, Any]:
+        """(히트 여부, 행) — 만료된 항목은 제거 후 미스"""
+        entry = self._store.get(key)
+        if entry is None:
+            return False, None
+        expires_at, row = entry
+        if expires_at <= time.monotonic():
+            del self._store[key]
+            return False, None
+        self._store.move_to_end(key)
+        return True, row
+
+    def put(self, key: Any, row: Any, generation: int) -> None:
+        """행 저장 (조회 중 무효화가 있었으면 무시, 크기 초과 시 가장 오래된 항목 제거)"""
+        if generation != self.generation:
+            return
+        self._store[key] = (time.monotonic() + self.ttl, row)
+        self._store.move_to_end(key)
+        if len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+    def discard(self, key: Any) -> None:
+        """항목 하나 무효화"""
+        self.generation += 1
+        self._store.pop(key, None)
+
+    def clear(self) -> None:
+        """전체 무효화"""
+        self.generation += 1
+        self._store.clear()
+
+
 # ============================================================
 # 위협 데이터베이스
 # ============================================================
@@ -101,16 +572,57 @@ class ThreatDatabase:
             threat = await db.get_threat_by_url("http://evil.com")
     """
 
-    def __init__(self, db_path: str = "data/threats.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "data/threats.db",
+        cache_mb: int = _DEFAULT_CACHE_MB,
+        synchronous: str = "NORMAL",
+        read_pool_size: int = _DEFAULT_READ_POOL_SIZE,
+    ) -> None:
         """
         위협 DB 초기화
 
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            cache_mb: 연결별 SQLite 페이지 캐시 크기 (MB)
+            synchronous: PRAGMA synchronous 모드 (OFF, NORMAL, FULL, EXTRA).
+                WAL 모드에서 NORMAL은 충돌 시에도 DB 무결성을 보장합니다.
+            read_pool_size: 읽기 전용 연결 수 (0이면 쓰기 연결로 조회).
+                인메모리 DB는 연결마다 별개 DB이므로 항상 0으로 처리합니다.
         """
+        synchronous = synchronous.upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"지원하지 않는 synchronous 모드: {synchronous} "
+                f"(허용: {', '.join(_SYNCHRONOUS_MODES)})"
+            )
+        if cache_mb <= 0:
+            raise ValueError(f"cache_mb는 양수여야 합니다: {cache_mb}")
+        if read_pool_size < 0:
+            raise ValueError(f"read_pool_size는 0 이상이어야 합니다: {read_pool_size}")
+
         self._db_path = db_path
+        self._cache_mb = cache_mb
+        self._synchronous = synchronous
+        self._read_pool_size = 0 if _is_memory_db(db_path) else read_pool_size
+        # 쓰기 연결 (스키마 초기화, 모든 쓰기, 읽기 풀이 없을 때의 조회)
         self._connection: Optional[aiosqlite.Connection] = None
+        # 읽기 전용 연결 풀 (PRAGMA query_only) — 대여 가능한 연결 큐와 전체 목록
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_connections: list[aiosqlite.Connection] = []
         self._initialized = False
+        # IoC 매처 (첫 match_iocs 호출 시 생성, IoC 변경 시 무효화)
+        self._ioc_matcher: Optional[_IoCMatcher] = None
+        # 단건 조회 캐시 — URL → 최신 위협 행, (유형, 값) → IoC 행
+        self._url_cache = _LookupCache()
+        self._ioc_cache = _LookupCache()
+        # 단건 쓰기 큐와 이를 커밋하는 백그라운드 태스크 (connect에서 시작)
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # close 진행 중 여부 (종료 센티널 이후 쓰기가 큐에 들어가지 않도록)
+        self._closing = False
+        # 쓰기 트랜잭션 직렬화 (쓰기 큐 배치와 벌크 임포트가 겹치지 않도록)
+        self._write_lock = asyncio.Lock()
         logger.info("ThreatDatabase 인스턴스 생성: %s", db_path)
 
     # ============================
@@ -143,30 +655,313 @@ class ThreatDatabase:
         db_dir = Path(self._db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
 
-        # aiosqlite 연결
-        self._connection = await aiosqlite.connect(self._db_path)
-        # WAL 모드 (동시 읽기 성능 향상)
-        await self._connection.execute("PRAGMA journal_mode=WAL")
-        # 외래 키 제약 활성화
-        await self._connection.execute("PRAGMA foreign_keys=ON")
-        # Row 팩토리 설정 (딕셔너리 형태)
-        self._connection.row_factory = aiosqlite.Row
+        # 쓰기 연결 (인스턴스 수명 동안 재사용)
+        self._connection = await self._open_connection()
 
-        # 스키마 초기화
-        await self._connection.executescript(_SCHEMA_SQL)
-        await self._connection.commit()
+        # 스키마 초기화 — user_version이 최신이면 생략 (매 연결마다 스크립트를
+        # 다시 실행하며 쓰기 잠금을 잡지 않음)
+        cursor = await self._connection.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        if row[0] < _SCHEMA_VERSION:
+            # 고유 인덱스 생성 전에 이전 스키마의 중복 IoC 정리
+            await self._migrate_legacy_ioc_index()
+            # 스키마 스크립트 전체를 한 트랜잭션으로 실행
+            await self._connection.executescript(f"BEGIN IMMEDIATE;\n{_SCHEMA_SQL}\nCOMMIT;")
+            await self._migrate_schema_version()
+
+        # 읽기 풀은 스키마(WAL 전환 포함)가 준비된 뒤에 연결
+        if self._read_pool_size:
+            self._readers = asyncio.Queue()
+            for _ in range(self._read_pool_size):
+                reader = await self._open_connection(read_only=True)
+                self._reader_connections.append(reader)
+                self._readers.put_nowait(reader)
+
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._closing = False
 
         self._initialized = True
         logger.info("ThreatDatabase 연결 완료: %s", self._db_path)
 
     async def close(self) -> None:
-        """DB 연결 종료"""
+        """DB 연결 종료 (대기 중인 쓰기를 모두 커밋한 뒤 종료)"""
+        if self._writer_task is not None:
+            # 종료 표시 후 센티널 전송 — 이후 _write는 큐에 넣지 않고 즉시 실패
+            self._closing = True
+            self._write_queue.put_nowait(None)
+            try:
+                await self._writer_task
+            finally:
+                self._fail_pending_writes()
+                self._writer_task = None
+                self._write_queue = None
+
+        self._url_cache.clear()
+        self._ioc_cache.clear()
+
+        for reader in self._reader_connections:
+            await reader.close()
+        self._reader_connections = []
+        self._readers = None
+
         if self._connection is not None:
             await self._connection.close()
             self._connection = None
             self._initialized = False
             logger.info("ThreatDatabase 연결 종료")
 
+    async def _open_connection(self, read_only: bool = False) -> aiosqlite.Connection:
+        """
+        PRAGMA, Row 팩토리, SQL 함수가 설정된 연결 생성
+
+        Args:
+            read_only: True면 PRAGMA query_only로 쓰기를 차단한 읽기 연결
+        """
+        # 쿼리 SQL은 모두 고정 문자열이므로 sqlite3 준비문 캐시로 재파싱을 생략
+        connection = await aiosqlite.connect(
+            self._db_path, cached_statements=_CACHED_STATEMENTS
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            await connection.execute(pragma)
+        await connection.execute(f"PRAGMA synchronous={self._synchronous}")
+        # 음수 = KiB 단위
+        await connection.execute(f"PRAGMA cache_size=-{self._cache_mb * 1024}")
+        if read_only:
+            await connection.execute("PRAGMA query_only=1")
+        # Row 팩토리 설정 (딕셔너리 형태)
+        connection.row_factory = aiosqlite.Row
+        # 압축 details 검색 / 해시 마이그레이션용 SQL 함수
+        await connection.create_function(
+            "details_json", 1, _details_json, deterministic=True
+        )
+        await connection.create_function(
+            "hash_to_blob", 1, _hash_to_db, deterministic=True
+        )
+        return connection
+
+    async def _migrate_legacy_ioc_index(self) -> None:
+        """
+        이전 스키마의 비고유 IoC 인덱스를 고유 인덱스로 전환하기 위한 정리
+
+        (type, value) 중복 행은 가장 먼저 추가된 행만 남기고 삭제한 뒤
+        기존 인덱스를 제거합니다. 이전 인덱스가 없으면 아무 작업도 하지 않습니다.
+        """
+        cursor = await self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_iocs_type_value'"
+        )
+        if await cursor.fetchone() is None:
+            return
+
+        await self._connection.execute(
+            "DELETE FROM iocs WHERE id NOT IN (SELECT MIN(id) FROM iocs GROUP BY type, value)"
+        )
+        await self._connection.execute("DROP INDEX idx_iocs_type_value")
+        await self._connection.commit()
+        logger.info("IoC 인덱스 마이그레이션 완료 (중복 제거 후 고유 인덱스 적용)")
+
+    async def _migrate_schema_version(self) -> None:
+        """
+        PRAGMA user_version 기준 데이터 마이그레이션
+
+        버전 0 → 1: 텍스트로 저장된 16진 해시를 원시 바이트로 변환합니다.
+        버전 1 → 2: 기존 위협을 threats_fts 전문 색인에 추가합니다
+        (이후 행은 트리거가 색인).
+        버전 2 → 3: stats_counters 집계 카운터를 현재 내용으로 계산합니다
+        (이후 변경은 트리거가 반영).
+        버전 3 → 4: 인덱스 변경만 있음 (_SCHEMA_SQL에서 처리).
+        """
+        cursor = await self._connection.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        version = row[0]
+        if version >= _SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            await self._connection.execute(
+                "UPDATE threats SET hash = hash_to_blob(hash) WHERE typeof(hash) = 'text'"
+            )
+        if version < 2:
+            await self._connection.execute(
+                """
+                INSERT INTO threats_fts(rowid, url, domain, details)
+                SELECT id, url, domain, details_json(details) FROM threats
+                """
+            )
+        if version < 3:
+            await self._connection.execute("DELETE FROM stats_counters")
+            await self._connection.execute(_STATS_COUNTERS_REBUILD_SQL)
+        await self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        await self._connection.commit()
+        logger.info("스키마 마이그레이션 완료: user_version=%d", _SCHEMA_VERSION)
+
+    # ============================
+    # 쓰기 큐
+    # ============================
+
+    async def _write(self, sql: str, params: tuple[Any, ...]) -> tuple[int, int]:
+        """
+        단건 쓰기를 쓰기 큐에 넣고 커밋될 때까지 대기
+
+        Returns:
+            (lastrowid, rowcount) — RETURNING 절이 있는 문장이면 (lastrowid, 첫 반환 행)
+        """
+        if self._closing or self._write_queue is None:
+            raise RuntimeError("ThreatDatabase가 종료 중이거나 연결되지 않았습니다.")
+        future = asyncio.get_running_loop().create_future()
+        # 크기 제한 없는 큐 — 종료 확인과 삽입 사이에 양보하지 않음
+        self._write_queue.put_nowait((sql, params, future))
+        return await future
+
+    def _fail_pending_writes(self) -> None:
+        """쓰기 태스크 종료 후 큐에 남은 쓰기에 예외 전달 (호출자가 영원히 대기하지 않도록)"""
+        while True:
+            try:
+                item = self._write_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if item is not None and not item[2].done():
+                item[2].set_exception(
+                    RuntimeError("ThreatDatabase가 종료되어 쓰기를 처리하지 못했습니다.")
+                )
+
+    async def _writer_loop(self) -> None:
+        """쓰기 큐를 비우며 쌓인 쓰기를 한 트랜잭션씩 커밋 (None을 받으면 종료)"""
+        queue = self._write_queue
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < _WRITE_BATCH_MAX:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            async with self._write_lock:
+                await self._commit_batch(batch)
+            if stop:
+                return
+
+    async def _commit_batch(
+        self, batch: list[tuple[str, tuple[Any, ...], asyncio.Future]]
+    ) -> None:
+        """
+        쓰기 배치를 BEGIN IMMEDIATE … COMMIT 한 번으로 실행
+
+        개별 문장이 실패하면 (예: 제약 조건 위반) SQLite는 그 문장만 되돌리므로
+        해당 호출에만 예외를 전달하고 나머지는 커밋합니다. 트랜잭션 자체가
+        중단되거나 커밋이 실패하면 배치 전체를 롤백하고 모든 호출에 예외를 전달합니다.
+        """
+        results: list[Any] = []
+        try:
+            await self._connection.execute("BEGIN IMMEDIATE")
+            for sql, params, _ in batch:
+                try:
+                    cursor = await self._connection.execute(sql, params)
+                except Exception as e:
+                    if not self._connection.in_transaction:
+                        raise
+                    results.append(e)
+                else:
+                    if cursor.description is None:
+                        results.append((cursor.lastrowid, cursor.rowcount))
+                    else:
+                        # RETURNING 문 — 커밋 전에 문장을 끝까지 실행해야 함
+                        returned = await cursor.fetchall()
+                        results.append((cursor.lastrowid, returned[0] if returned else None))
+            await self._connection.commit()
+        except Exception as e:
+            logger.error("쓰기 배치 커밋 실패 (%d건): %s", len(batch), e)
+            if self._connection.in_transaction:
+                await self._connection.rollback()
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    # ============================
+    # 조회 헬퍼
+    # ============================
+
+    async def _fetchone(self, sql: str, params: Any = ()) -> Any:
+        """
+        단일 행 조회 (없으면 None)
+
+        execute_fetchall은 실행과 조회를 aiosqlite 스레드 왕복 한 번으로 처리합니다
+        (execute 후 fetchone은 두 번). 결과가 최대 한 행인 쿼리에만 사용합니다.
+        """
+        rows = await self._fetchall(sql, params)
+        return rows[0] if rows else None
+
+    async def _fetchall(self, sql: str, params: Any = ()) -> list[Any]:
+        """
+        전체 행 조회 (aiosqlite 스레드 왕복 한 번)
+
+        읽기 풀이 있으면 읽기 연결을 빌려 조회합니다. 쓰기 큐는 커밋 후에
+        호출자를 깨우므로 자신이 쓴 행은 읽기 연결에서도 보입니다.
+        """
+        async with self._read_connection() as connection:
+            return list(await connection.execute_fetchall(sql, params))
+
+    async def _fetch_dicts(
+        self, sql: str, params: Any = (), limit: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """
+        여러 행을 딕셔너리 리스트로 조회
+
+        limit이 청크 크기 이하면 한 번에 가져오고 (스레드 왕복 한 번), 더 크거나
+        상한이 없으면 fetchmany로 청크씩 가져와 곧바로 변환합니다.
+
+        Args:
+            sql: SELECT 문
+            params: 바인드 값
+            limit: 쿼리의 LIMIT 값 (없으면 None)
+        """
+        if limit is not None and limit <= _FETCH_CHUNK_ROWS:
+            return self._rows_to_dicts(await self._fetchall(sql, params))
+
+        result: list[dict[str, Any]] = []
+        async with self._read_connection() as connection:
+            cursor = await connection.execute(sql, params)
+            try:
+                while True:
+                    rows = await cursor.fetchmany(_FETCH_CHUNK_ROWS)
+                    result.extend(self._rows_to_dicts(rows))
+                    if len(rows) < _FETCH_CHUNK_ROWS:
+                        break
+            finally:
+                await cursor.close()
+        return result
+
+    @contextlib.asynccontextmanager
+    async def _read_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """조회용 연결 대여 (읽기 풀이 없으면 쓰기 연결)"""
+        if self._readers is None:
+            yield self._connection
+            return
+
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+
     def _ensure_connected(self) -> None:
         """연결 상태 확인"""
         if self._connection is None or not self._initialized:
@@ -205,18 +1000,17 @@ class ThreatDatabase:
         self._ensure_connected()
 
         now = time.time()
-        details_json = json.dumps(details or {}, ensure_ascii=False)
+        details_value = _encode_details(details or {})
 
-        cursor = await self._connection.execute(
+        record_id, _ = await self._write(
             """
             INSERT INTO threats (url, domain, hash, level, type, details, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (url, domain, hash_value, level, threat_type, details_json, now, now),
+            (url, domain, _hash_to_db(hash_value), level, threat_type, details_value, now, now),
         )
-        await self._connection.commit()
+        self._url_cache.discard(url)
 
-        record_id = cursor.lastrowid
         logger.debug("위협 추가: id=%d, url=%s, type=%s", record_id, url, threat_type)
         return record_id
 
@@ -232,16 +1026,17 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        row = await self._fetchone(
             "SELECT * FROM threats WHERE id = ?", (threat_id,)
         )
-        row = await cursor.fetchone()
         return self._row_to_dict(row) if row else None
 
     async def get_threat_by_url(self, url: str) -> Optional[dict[str, Any]]:
         """
         URL로 위협 조회 (가장 최근 항목)
 
+        결과(없음 포함)는 TTL LRU 캐시에 보관하며 위협 추가/수정/삭제 시 무효화됩니다.
+
         Args:
             url: 검색할 URL
 
@@ -250,11 +1045,14 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
-            "SELECT * FROM threats WHERE url = ? ORDER BY updated_at DESC LIMIT 1",
-            (url,),
-        )
-        row = await cursor.fetchone()
+        hit, row = self._url_cache.get(url)
+        if not hit:
+            generation = self._url_cache.generation
+            row = await self._fetchone(
+                "SELECT * FROM threats WHERE url = ? ORDER BY updated_at DESC LIMIT 1",
+                (url,),
+            )
+            self._url_cache.put(url, row, generation)
         return self._row_to_dict(row) if row else None
 
     async def get_threats_by_domain(
@@ -272,12 +1070,11 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        return await self._fetch_dicts(
             "SELECT * FROM threats WHERE domain = ? ORDER BY updated_at DESC LIMIT ?",
             (domain, limit),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
 
     async def get_threats_by_level(
         self, min_level: int = 0, limit: int = 100
@@ -294,12 +1091,72 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        return await self._fetch_dicts(
             "SELECT * FROM threats WHERE level >= ? ORDER BY level DESC, updated_at DESC LIMIT ?",
             (min_level, limit),
+            limit,
+        )
+
+    async def get_threats_by_hash(
+        self, hash_value: str, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """
+        콘텐츠 해시로 위협 목록 조회
+
+        Args:
+            hash_value: 16진 다이제스트 (저장한 표기와 대소문자까지 일치)
+            limit: 최대 결과 수
+
+        Returns:
+            위협 정보 리스트
+        """
+        self._ensure_connected()
+
+        return await self._fetch_dicts(
+            "SELECT * FROM threats WHERE hash = ? ORDER BY updated_at DESC LIMIT ?",
+            (_hash_to_db(hash_value), limit),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
+
+    async def get_threats_projection(
+        self, fields: list[str], min_level: int = 0, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """
+        위협 수준 이상의 위협 목록을 details 일부 키만 뽑아 조회
+
+        details 키는 SQLite json_extract()로 추출하므로 details 전체 JSON을 연결
+        스레드 밖으로 옮기거나 Python에서 파싱하지 않습니다. 정렬은
+        get_threats_by_level과 같습니다.
+
+        추출 값은 json_extract 규칙을 따릅니다: 없는 키는 None, true/false는 1/0,
+        중첩 객체/배열은 JSON 텍스트.
+
+        Args:
+            fields: 추출할 details 최상위 키 목록
+            min_level: 최소 위협 수준 (0~4)
+            limit: 최대 결과 수
+
+        Returns:
+            id, url, domain, level, type, updated_at과 fields 키를 담은 딕셔너리 리스트
+        """
+        self._ensure_connected()
+
+        for field in fields:
+            if not field or '"' in field:
+                raise ValueError(f"지원하지 않는 details 키: {field!r}")
+        # 키를 큰따옴표로 감싼 JSON 경로 ($."키") — 점/대괄호가 든 키도 그대로 매치
+        paths = [f'$."{field}"' for field in fields]
+        extracts = "".join(", json_extract(details_json(details), ?)" for _ in paths)
+
+        rows = await self._fetchall(
+            f"""
+            SELECT id, url, domain, level, type, updated_at{extracts} FROM threats
+            WHERE level >= ? ORDER BY level DESC, updated_at DESC LIMIT ?
+            """,
+            (*paths, min_level, limit),
+        )
+        columns = ("id", "url", "domain", "level", "type", "updated_at", *fields)
+        return [dict(zip(columns, row)) for row in rows]
 
     async def update_threat(
         self,
@@ -334,7 +1191,7 @@ class ThreatDatabase:
             values.append(threat_type)
         if details is not None:
             updates.append("details = ?")
-            values.append(json.dumps(details, ensure_ascii=False))
+            values.append(_encode_details(details))
 
         if not updates:
             return False
@@ -344,11 +1201,12 @@ class ThreatDatabase:
         values.append(threat_id)
 
         query = f"UPDATE threats SET {', '.join(updates)} WHERE id = ?"
-        cursor = await self._connection.execute(query, values)
-        await self._connection.commit()
+        _, rowcount = await self._write(query, tuple(values))
 
-        updated = cursor.rowcount > 0
+        updated = rowcount > 0
         if updated:
+            # ID만 알고 URL은 모르므로 URL 캐시 전체 무효화
+            self._url_cache.clear()
             logger.debug("위협 업데이트: id=%d", threat_id)
         return updated
 
@@ -364,13 +1222,11 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
-            "DELETE FROM threats WHERE id = ?", (threat_id,)
-        )
-        await self._connection.commit()
+        _, rowcount = await self._write("DELETE FROM threats WHERE id = ?", (threat_id,))
 
-        deleted = cursor.rowcount > 0
+        deleted = rowcount > 0
         if deleted:
+            self._url_cache.clear()
             logger.debug("위협 삭제: id=%d", threat_id)
         return deleted
 
@@ -388,6 +1244,8 @@ class ThreatDatabase:
         """
         침해 지표 (IoC) 추가
 
+        같은 (유형, 값)의 IoC가 이미 있으면 추가하지 않습니다 (기존 출처/신뢰도 유지).
+
         Args:
             ioc_type: 지표 유형 (ip, domain, hash, url, email)
             value: 지표 값
@@ -395,16 +1253,26 @@ class ThreatDatabase:
             confidence: 신뢰도 (0.0~1.0)
 
         Returns:
-            생성된 레코드 ID
+            생성된 (또는 이미 존재하는) 레코드 ID
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
-            "INSERT INTO iocs (type, value, source, confidence) VALUES (?, ?, ?, ?)",
+        # 중복이면 아무 열도 바꾸지 않는 갱신으로 기존 행 ID를 같은 문장에서 반환
+        # (source는 트리거 감시 열이 아님) — 중복 시 별도 SELECT 왕복 없음
+        lastrowid, row = await self._write(
+            """
+            INSERT INTO iocs (type, value, source, confidence) VALUES (?, ?, ?, ?)
+            ON CONFLICT(type, value) DO UPDATE SET source = source
+            RETURNING id
+            """,
             (ioc_type, value, source, confidence),
         )
-        await self._connection.commit()
-        return cursor.lastrowid
+        record_id = row[0]
+        # 새로 삽입된 경우에만 lastrowid가 이 행을 가리킴 (중복이면 이전 삽입의 값)
+        if lastrowid == record_id:
+            self._ioc_matcher = None
+            self._ioc_cache.discard((ioc_type, value))
+        return record_id
 
     async def get_ioc(
         self, ioc_type: str, value: str
@@ -412,6 +1280,8 @@ class ThreatDatabase:
         """
         IoC 타입+값으로 조회
 
+        결과(없음 포함)는 TTL LRU 캐시에 보관하며 IoC 추가/삭제 시 무효화됩니다.
+
         Args:
             ioc_type: 지표 유형
             value: 지표 값
@@ -421,11 +1291,15 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
-            "SELECT * FROM iocs WHERE type = ? AND value = ? LIMIT 1",
-            (ioc_type, value),
-        )
-        row = await cursor.fetchone()
+        key = (ioc_type, value)
+        hit, row = self._ioc_cache.get(key)
+        if not hit:
+            generation = self._ioc_cache.generation
+            row = await self._fetchone(
+                "SELECT * FROM iocs WHERE type = ? AND value = ? LIMIT 1",
+                (ioc_type, value),
+            )
+            self._ioc_cache.put(key, row, generation)
         return self._row_to_dict(row) if row else None
 
     async def get_iocs_by_type(
@@ -443,22 +1317,49 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        return await self._fetch_dicts(
             "SELECT * FROM iocs WHERE type = ? ORDER BY confidence DESC LIMIT ?",
             (ioc_type, limit),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
 
     async def delete_ioc(self, ioc_id: int) -> bool:
         """IoC 삭제"""
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
-            "DELETE FROM iocs WHERE id = ?", (ioc_id,)
-        )
-        await self._connection.commit()
-        return cursor.rowcount > 0
+        _, rowcount = await self._write("DELETE FROM iocs WHERE id = ?", (ioc_id,))
+        if rowcount > 0:
+            self._ioc_matcher = None
+            self._ioc_cache.clear()
+            return True
+        return False
+
+    async def match_iocs(self, text: str) -> list[dict[str, Any]]:
+        """
+        텍스트에 포함된 IoC 조회 (도메인, URL, IP 유형)
+
+        IoC 값 전체를 다중 리터럴 매처로 한 번에 검사하므로 IoC 수가 늘어도
+        텍스트당 비용이 거의 일정합니다. 매처는 처음 호출할 때 만들고,
+        IoC가 추가/삭제되면 다음 호출에서 다시 만듭니다.
+
+        Args:
+            text: 검사할 텍스트 (URL, 페이지 내용 등)
+
+        Returns:
+            포함된 IoC 리스트 (신뢰도 내림차순)
+        """
+        self._ensure_connected()
+
+        if self._ioc_matcher is None:
+            placeholders = ", ".join("?" * len(_MATCHABLE_IOC_TYPES))
+            iocs = await self._fetch_dicts(
+                f"SELECT * FROM iocs WHERE type IN ({placeholders})",
+                _MATCHABLE_IOC_TYPES,
+            )
+            self._ioc_matcher = _IoCMatcher(iocs)
+            logger.debug("IoC 매처 생성: %d개", len(self._ioc_matcher))
+
+        return self._ioc_matcher.match(text)
 
     # ============================
     # Scan Results CRUD
@@ -486,12 +1387,11 @@ class ThreatDatabase:
         report_json = json.dumps(report or {}, ensure_ascii=False)
         now = time.time()
 
-        cursor = await self._connection.execute(
+        record_id, _ = await self._write(
             "INSERT INTO scan_results (url, score, report, timestamp) VALUES (?, ?, ?, ?)",
             (url, score, report_json, now),
         )
-        await self._connection.commit()
-        return cursor.lastrowid
+        return record_id
 
     async def get_scan_results_by_url(
         self, url: str, limit: int = 10
@@ -508,12 +1408,11 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        return await self._fetch_dicts(
             "SELECT * FROM scan_results WHERE url = ? ORDER BY timestamp DESC LIMIT ?",
             (url, limit),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
 
     async def get_recent_scans(
         self, limit: int = 50
@@ -529,12 +1428,11 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        cursor = await self._connection.execute(
+        return await self._fetch_dicts(
             "SELECT * FROM scan_results ORDER BY timestamp DESC LIMIT ?",
             (limit,),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
 
     # ============================
     # 벌크 임포트
@@ -558,11 +1456,11 @@ class ThreatDatabase:
         now = time.time()
         rows = []
         for t in threats:
-            details = json.dumps(t.get("details", {}), ensure_ascii=False)
+            details = _encode_details(t.get("details", {}))
             rows.append((
                 t.get("url", ""),
                 t.get("domain", ""),
-                t.get("hash", ""),
+                _hash_to_db(t.get("hash", "")),
                 t.get("level", 0),
                 t.get("type", "unknown"),
                 details,
@@ -570,14 +1468,11 @@ class ThreatDatabase:
                 now,
             ))
 
-        await self._connection.executemany(
-            """
-            INSERT INTO threats (url, domain, hash, level, type, details, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        await self._insert_rows_in_transaction(
+            "INSERT INTO threats (url, domain, hash, level, type, details, created_at, updated_at)",
             rows,
         )
-        await self._connection.commit()
+        self._url_cache.clear()
 
         count = len(rows)
         logger.info("벌크 임포트 완료: %d개 위협", count)
@@ -589,12 +1484,14 @@ class ThreatDatabase:
         """
         IoC 벌크 임포트
 
+        이미 있는 (유형, 값)의 IoC는 건너뜁니다 (고유 인덱스 + INSERT OR IGNORE).
+
         Args:
             iocs: IoC 딕셔너리 리스트.
                   각 항목: {"type": ..., "value": ..., "source": ..., "confidence": ...}
 
         Returns:
-            임포트된 레코드 수
+            새로 추가된 레코드 수
         """
         self._ensure_connected()
 
@@ -608,16 +1505,88 @@ class ThreatDatabase:
             for ioc in iocs
         ]
 
-        await self._connection.executemany(
-            "INSERT INTO iocs (type, value, source, confidence) VALUES (?, ?, ?, ?)",
+        count = await self._insert_rows_in_transaction(
+            "INSERT OR IGNORE INTO iocs (type, value, source, confidence)",
             rows,
         )
-        await self._connection.commit()
 
-        count = len(rows)
-        logger.info("벌크 IoC 임포트 완료: %d개", count)
+        if count:
+            self._ioc_matcher = None
+            self._ioc_cache.clear()
+        logger.info("벌크 IoC 임포트 완료: %d개 (중복 %d개 제외)", count, len(rows) - count)
+        return count
+
+    async def _insert_rows_in_transaction(
+        self, insert_sql: str, rows: list[tuple[Any, ...]]
+    ) -> int:
+        """
+        단일 트랜잭션으로 다중 행 INSERT (추가된 행 수 반환)
+
+        행을 바인드 변수 상한 이내의 청크로 나눠 청크마다
+        "INSERT … VALUES (…), (…), …" 한 문장으로 실행합니다
+        (행마다 문장을 실행하는 executemany보다 문장 실행 횟수가 적음).
+        전체 행을 한 번의 커밋(fsync)으로 기록하며, 중간에 실패하면
+        롤백하여 일부 행만 남지 않도록 합니다. BEGIN IMMEDIATE로 시작 시점에
+        쓰기 잠금을 잡아, 읽기 트랜잭션에서 쓰기로 승격하다 SQLITE_BUSY로
+        실패하는 경우를 피합니다.
+
+        파일 DB에 _BULK_OFFLOAD_MIN_ROWS행 이상을 넣을 때는 트랜잭션 전체를
+        executor 스레드의 새 동기 연결에서 실행합니다 (_insert_rows_sync).
+
+        Args:
+            insert_sql: VALUES 절을 뺀 INSERT 문 (열 목록 포함)
+            rows: 열 목록과 같은 길이의 값 튜플 리스트
+        """
+        if not rows:
+            return 0
+
+        offload = len(rows) >= _BULK_OFFLOAD_MIN_ROWS and not _is_memory_db(self._db_path)
+        count = 0
+        async with self._write_lock:
+            if offload:
+                # 쓰기 잠금을 쥔 동안 쓰기 연결은 쉬므로 별도 연결과 경합하지 않음
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, self._insert_rows_sync, insert_sql, rows
+                )
+
+            try:
+                await self._connection.execute("BEGIN IMMEDIATE")
+                for sql, params in _multi_row_inserts(insert_sql, rows):
+                    cursor = await self._connection.execute(sql, params)
+                    count += cursor.rowcount
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
         return count
 
+    def _insert_rows_sync(self, insert_sql: str, rows: list[tuple[Any, ...]]) -> int:
+        """
+        새 동기 sqlite3 연결로 다중 행 INSERT 트랜잭션 실행 (executor 스레드용)
+
+        트리거가 쓰는 details_json() SQL 함수와 쓰기 연결과 같은 synchronous를
+        설정하고, 끝나면 연결을 닫습니다.
+        """
+        connection = sqlite3.connect(self._db_path, isolation_level=None)
+        try:
+            connection.execute(f"PRAGMA synchronous={self._synchronous}")
+            connection.create_function(
+                "details_json", 1, _details_json, deterministic=True
+            )
+            count = 0
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                for sql, params in _multi_row_inserts(insert_sql, rows):
+                    count += connection.execute(sql, params).rowcount
+                connection.execute("COMMIT")
+            except Exception:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+            return count
+        finally:
+            connection.close()
+
     # ============================
     # 통계 쿼리
     # ============================
@@ -641,61 +1610,38 @@ class ThreatDatabase:
         """
         self._ensure_connected()
 
-        stats: dict[str, Any] = {}
-
-        # 위협 총 수
-        cursor = await self._connection.execute("SELECT COUNT(*) FROM threats")
-        row = await cursor.fetchone()
-        stats["total_threats"] = row[0]
-
-        # 수준별 위협 수
-        cursor = await self._connection.execute(
-            "SELECT level, COUNT(*) FROM threats GROUP BY level ORDER BY level"
-        )
-        rows = await cursor.fetchall()
-        stats["threats_by_level"] = {row[0]: row[1] for row in rows}
-
-        # 유형별 위협 수
-        cursor = await self._connection.execute(
-            "SELECT type, COUNT(*) FROM threats GROUP BY type ORDER BY COUNT(*) DESC"
-        )
-        rows = await cursor.fetchall()
-        stats["threats_by_type"] = {row[0]: row[1] for row in rows}
-
-        # IoC 총 수
-        cursor = await self._connection.execute("SELECT COUNT(*) FROM iocs")
-        row = await cursor.fetchone()
-        stats["total_iocs"] = row[0]
-
-        # 유형별 IoC 수
-        cursor = await self._connection.execute(
-            "SELECT type, COUNT(*) FROM iocs GROUP BY type ORDER BY COUNT(*) DESC"
-        )
-        rows = await cursor.fetchall()
-        stats["iocs_by_type"] = {row[0]: row[1] for row in rows}
-
-        # 스캔 총 수
-        cursor = await self._connection.execute("SELECT COUNT(*) FROM scan_results")
-        row = await cursor.fetchone()
-        stats["total_scans"] = row[0]
-
-        # 평균 스캔 점수
-        cursor = await self._connection.execute(
-            "SELECT AVG(score) FROM scan_results"
-        )
-        row = await cursor.fetchone()
-        stats["avg_scan_score"] = round(row[0] or 0.0, 4)
-
-        # 최근 24시간 스캔 수
         cutoff = time.time() - 86400
-        cursor = await self._connection.execute(
-            "SELECT COUNT(*) FROM scan_results WHERE timestamp > ?",
-            (cutoff,),
-        )
-        row = await cursor.fetchone()
-        stats["recent_scan_count_24h"] = row[0]
-
-        return stats
+        rows = await self._fetchall(_STATS_SQL, (cutoff,))
+
+        scalars: dict[str, Any] = {}
+        groups: dict[str, dict[Any, int]] = {
+            "threats_by_level": {},
+            "threats_by_type": {},
+            "iocs_by_type": {},
+        }
+        for kind, key, value in rows:
+            if kind == "scalar":
+                scalars[key] = value
+            else:
+                groups[kind][key] = value
+
+        # 수준별은 수준 오름차순, 유형별은 개수 내림차순
+        def by_count(counts: dict[Any, int]) -> dict[Any, int]:
+            return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+        total_scans = scalars.get("total_scans", 0)
+        avg_scan_score = scalars.get("score_sum", 0.0) / total_scans if total_scans else 0.0
+
+        return {
+            "total_threats": scalars.get("total_threats", 0),
+            "threats_by_level": dict(sorted(groups["threats_by_level"].items())),
+            "threats_by_type": by_count(groups["threats_by_type"]),
+            "total_iocs": scalars.get("total_iocs", 0),
+            "iocs_by_type": by_count(groups["iocs_by_type"]),
+            "total_scans": total_scans,
+            "avg_scan_score": round(avg_scan_score, 4),
+            "recent_scan_count_24h": scalars["recent_scan_count_24h"],
+        }
 
     # ============================
     # 검색
@@ -709,6 +1655,11 @@ class ThreatDatabase:
         """
         위협 정보 텍스트 검색 (URL, 도메인, 상세정보)
 
+        부분 문자열 LIKE 검색입니다. 검색어가 3자 이상이고 LIKE 와일드카드
+        (%, _)가 없으면 트라이그램 전문 색인으로 후보 행을 먼저 좁힌 뒤 같은
+        LIKE 조건으로 다시 거릅니다. 트라이그램 매치(유니코드 대소문자 무시)는
+        LIKE 매치(ASCII 대소문자 무시)를 모두 포함하므로 결과는 전체 스캔과 같습니다.
+
         Args:
             query: 검색 키워드
             limit: 최대 결과 수
@@ -719,42 +1670,78 @@ class ThreatDatabase:
         self._ensure_connected()
 
         like_query = f"%{query}%"
-        cursor = await self._connection.execute(
+        if len(query) >= _FTS_MIN_QUERY_LENGTH and "%" not in query and "_" not in query:
+            # 검색어 전체를 하나의 구(phrase)로 매치 — 큰따옴표는 두 번 써서 이스케이프
+            phrase = '"' + query.replace('"', '""') + '"'
+            return await self._fetch_dicts(
+                """
+                SELECT * FROM threats
+                WHERE id IN (SELECT rowid FROM threats_fts WHERE threats_fts MATCH ?)
+                  AND (url LIKE ? OR domain LIKE ? OR details_json(details) LIKE ?)
+                ORDER BY updated_at DESC LIMIT ?
+                """,
+                (phrase, like_query, like_query, like_query, limit),
+                limit,
+            )
+        return await self._fetch_dicts(
             """
             SELECT * FROM threats
-            WHERE url LIKE ? OR domain LIKE ? OR details LIKE ?
+            WHERE url LIKE ? OR domain LIKE ? OR details_json(details) LIKE ?
             ORDER BY updated_at DESC LIMIT ?
             """,
             (like_query, like_query, like_query, limit),
+            limit,
         )
-        rows = await cursor.fetchall()
-        return [self._row_to_dict(row) for row in rows]
 
     # ============================
     # 유틸리티
     # ============================
 
-    @staticmethod
-    def _row_to_dict(row: Any) -> dict[str, Any]:
+    @classmethod
+    def _row_to_dict(cls, row: Any) -> dict[str, Any]:
         """
         aiosqlite.Row를 딕셔너리로 변환
 
-        JSON 필드(details, report)는 자동 파싱합니다.
+        JSON 필드(details, report)는 자동 파싱합니다 (압축된 details는 해제 후 파싱).
         """
         if row is None:
             return {}
+        return cls._rows_to_dicts([row])[0]
 
-        d = dict(row)
-
-        # JSON 필드 자동 파싱
-        for json_field in ("details", "report"):
-            if json_field in d and isinstance(d[json_field], str):
-                try:
-                    d[json_field] = json.loads(d[json_field])
-                except (json.JSONDecodeError, TypeError):
-                    pass
+    @staticmethod
+    def _rows_to_dicts(rows: list[Any]) -> list[dict[str, Any]]:
+        """
+        여러 aiosqlite.Row를 딕셔너리 리스트로 변환 (변환 규칙은 _row_to_dict와 같음)
 
-        return d
+        열 이름과 변환할 열(hash, details, report)은 첫 행에서 한 번만 확인하고,
+        각 행은 dict(zip(열 이름, 행))으로 만듭니다 (dict(row)는 행마다 keys()를
+        호출하고 이름으로 값을 다시 찾음).
+        """
+        if not rows:
+            return []
+
+        columns = rows[0].keys()
+        has_hash = "hash" in columns
+        has_details = "details" in columns
+        json_fields = [field for field in ("details", "report") if field in columns]
+
+        result = []
+        for row in rows:
+            d = dict(zip(columns, row))
+            if has_details and isinstance(d["details"], bytes):
+                d["details"] = _details_json(d["details"])
+            if has_hash and isinstance(d["hash"], bytes):
+                d["hash"] = d["hash"].hex()
+
+            # JSON 필드 자동 파싱
+            for json_field in json_fields:
+                if isinstance(d[json_field], str):
+                    try:
+                        d[json_field] = _json_loads(d[json_field])
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+            result.append(d)
+        return result
 
     @property
     def is_connected(self) -> bool:
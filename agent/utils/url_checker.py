@@ -11,7 +11,7 @@ URL 안전성 검사기
 기능:
 - 비동기 aiohttp 세션 관리
 - 응답 캐싱 (1시간 TTL)
-- 속도 제한 (asyncio.Semaphore)
+- API별 동시 요청 수 제한 (asyncio.Semaphore) 및 분당 요청 수 제한
 - URL 정규화 (urllib.parse)
 """
 
@@ -19,14 +19,23 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import hashlib
+import contextlib
+import functools
+import json
 import logging
+import re
 import time
-from typing import Any, Optional
-from urllib.parse import urlparse, urlunparse, quote, unquote
+from collections import OrderedDict
+from typing import Any, Awaitable, Iterable, Optional
+from urllib.parse import urlparse, quote, unquote
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 — 표준 json으로 파싱
+    orjson = None
+
 from agent.core.config import ExternalAPIConfig
 
 logger = logging.getLogger(__name__)
@@ -37,31 +46,220 @@ logger = logging.getLogger(__name__)
 # ============================================================
 
 class _CacheEntry:
-    """TTL 기반 응답 캐시 항목"""
+    """TTL 기반 응답 캐시 항목 (시각은 time.monotonic 기준)"""
 
-    __slots__ = ("result", "created_at", "ttl")
+    __slots__ = ("result", "expires_at")
 
     def __init__(self, result: dict[str, Any], created_at: float, ttl: float) -> None:
         self.result = result
-        self.created_at = created_at
-        self.ttl = ttl
+        self.expires_at = created_at + ttl
 
-    @property
-    def is_expired(self) -> bool:
-        return (time.time() - self.created_at) > self.ttl
+    def is_expired(self, now: float) -> bool:
+        """now 시각 기준 만료 여부 (호출자가 시각을 한 번 구해 전달)"""
+        return now > self.expires_at
+
+
+# ============================================================
+# HTTP 연결
+# ============================================================
+
+# 연결 풀 크기 — 요청은 사실상 GSB/VT 두 호스트로만 가므로 호스트별 상한을 둠
+_CONNECTOR_LIMIT = 200
+_CONNECTOR_LIMIT_PER_HOST = 64
+
+# DNS 결과 캐시 시간 (초, aiohttp 기본 10초)
+_DNS_CACHE_TTL = 300
+
+# 유휴 keep-alive 연결 유지 시간 (초, aiohttp 기본 15초) — 검사 사이 간격이 있어도
+# 다음 요청이 TLS 핸드셰이크 없이 기존 연결을 재사용
+_KEEPALIVE_TIMEOUT = 75
+
+
+# ============================================================
+# Google Safe Browsing 요청 본문
+# ============================================================
+
+# threatMatches:find 요청의 고정 부분 (요청마다 threatEntries만 추가)
+_GSB_CLIENT = {
+    "clientId": "ordinalv8",
+    "clientVersion": "0.1.0",
+}
+_GSB_THREAT_INFO = {
+    "threatTypes": [
+        "MALWARE",
+        "SOCIAL_ENGINEERING",
+        "UNWANTED_SOFTWARE",
+        "POTENTIALLY_HARMFUL_APPLICATION",
+    ],
+    "platformTypes": ["ANY_PLATFORM"],
+    "threatEntryTypes": ["URL"],
+}
+
+
+# ============================================================
+# 응답 파싱
+# ============================================================
+
+# API 응답 JSON 파서 (orjson이 있으면 사용)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 오류 응답에서 로그로 남길 본문 최대 바이트 (GSB 오류 HTML 등은 길 수 있음)
+_ERROR_BODY_MAX_BYTES = 512
+
+
+async def _read_error_body(response: aiohttp.ClientResponse) -> str:
+    """오류 응답 본문 앞부분만 읽어 로그용 문자열로 반환"""
+    body = await response.content.read(_ERROR_BODY_MAX_BYTES)
+    return body.decode("utf-8", errors="replace")
+
+
+# ============================================================
+# VirusTotal URL ID
+# ============================================================
+
+# 입력 바이트 수 % 3 → base64 패딩 '=' 개수
+_B64_PADDING = (0, 2, 1)
+
+# URL ID 캐시 크기 (캐시 만료 후 같은 URL을 다시 조회하는 경우가 많음)
+_VT_URL_ID_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_VT_URL_ID_CACHE_SIZE)
+def _vt_url_id(url: str) -> str:
+    """VirusTotal URL ID: 패딩 없는 URL-safe Base64(URL)"""
+    raw = url.encode()
+    encoded = base64.urlsafe_b64encode(raw)
+    padding = _B64_PADDING[len(raw) % 3]
+    return (encoded[:-padding] if padding else encoded).decode("ascii")
+
+
+# ============================================================
+# 요청 속도 제한
+# ============================================================
+
+class _RateLimiter:
+    """
+    기간당 요청 수 제한 (리키 버킷, async with로 사용)
+
+    버킷이 찰 때까지(max_rate개)는 즉시 통과시키고, 그 뒤로는 period 동안
+    max_rate개 비율로 버킷이 비워지는 만큼만 통과시킵니다.
+    """
+
+    __slots__ = ("_max_rate", "_drain_per_second", "_level", "_last")
+
+    def __init__(self, max_rate: float, period: float = 60.0) -> None:
+        if max_rate < 1:
+            raise ValueError(f"max_rate는 1 이상이어야 합니다: {max_rate}")
+        self._max_rate = max_rate
+        self._drain_per_second = max_rate / period
+        self._level = 0.0
+        self._last = time.monotonic()
+
+    async def acquire(self) -> None:
+        """요청 한 건을 보낼 수 있을 때까지 대기"""
+        while True:
+            now = time.monotonic()
+            self._level = max(0.0, self._level - (now - self._last) * self._drain_per_second)
+            self._last = now
+            if self._level + 1 <= self._max_rate:
+                self._level += 1
+                return
+            await asyncio.sleep((self._level + 1 - self._max_rate) / self._drain_per_second)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
 
 
 # ============================================================
 # URL 정규화
 # ============================================================
 
+# 연속 슬래시
+_RE_MULTI_SLASH = re.compile(r"/{2,}")
+
+# 경로 재인코딩 시 그대로 두는 문자
+_PATH_SAFE_CHARS = "/:@!$&'()*+,;=-._~"
+
+# 디코딩/재인코딩해도 바뀌지 않는 경로 (퍼센트 인코딩 없이 안전 문자만)
+_RE_PLAIN_PATH = re.compile(r"[A-Za-z0-9/:@!$&'()*+,;=\-._~]+")
+
+# 스킴별 기본 포트 (명시돼 있으면 제거)
+_DEFAULT_PORTS = {"http": 80, "https": 443, "ftp": 21}
+
+# 빠른 분할 대신 urlparse로 처리할 문자 (IPv6 대괄호, 경로 매개변수 ;,
+# urlsplit이 제거하는 탭/개행) — 비 ASCII URL도 urlparse로 처리
+_SPLIT_FALLBACK_CHARS = frozenset("[];\t\r\n")
+
+# 정규화 결과 LRU 캐시 크기 (탐색 중 같은 URL이 반복해서 검사됨)
+_NORMALIZE_CACHE_SIZE = 8192
+
+
+def _split_url(
+    url: str,
+) -> tuple[str, Optional[str], Optional[str], str, Optional[int], str, str, str]:
+    """
+    스킴이 붙은 URL을 구성 요소로 분할
+
+    흔한 ASCII URL은 str.find/partition으로 한 번에 나누고 (urlparse처럼
+    ParseResult를 만들거나 hostname/port/username 접근마다 netloc을 다시
+    파싱하지 않음), 그 외 입력은 urlparse 결과를 그대로 사용합니다.
+    두 경로의 결과는 호스트 대소문자를 빼면 같습니다 (빠른 경로는 소문자
+    변환을 호출자에게 맡김, 잘못된 포트는 urlparse 경로에서 ValueError).
+
+    Args:
+        url: http://, https://, ftp://로 시작하는 URL
+
+    Returns:
+        (스킴, 사용자명, 비밀번호, 호스트, 포트, 경로, 쿼리, 프래그먼트)
+    """
+    if url.isascii() and _SPLIT_FALLBACK_CHARS.isdisjoint(url):
+        scheme, _, rest = url.partition("://")
+
+        # netloc은 첫 /, ?, # 앞까지
+        end = len(rest)
+        for delimiter in "/?#":
+            index = rest.find(delimiter, 0, end)
+            if index >= 0:
+                end = index
+        netloc, rest = rest[:end], rest[end:]
+        rest, _, fragment = rest.partition("#")
+        path, _, query = rest.partition("?")
+
+        userinfo, has_userinfo, hostinfo = netloc.rpartition("@")
+        hostname, _, port_text = hostinfo.partition(":")
+        if not port_text or (port_text.isdigit() and int(port_text) <= 65535):
+            username = password = None
+            if has_userinfo:
+                username, has_password, password = userinfo.partition(":")
+                if not has_password:
+                    password = None
+            port = int(port_text) if port_text else None
+            return scheme, username, password, hostname, port, path, query, fragment
+
+    parsed = urlparse(url)
+    return (
+        parsed.scheme,
+        parsed.username,
+        parsed.password,
+        parsed.hostname or "",
+        parsed.port,
+        parsed.path,
+        parsed.query,
+        parsed.fragment,
+    )
+
+
+@functools.lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_url(url: str) -> str:
     """
-    URL 정규화
+    URL 정규화 (결과는 LRU 캐시)
 
     - 스킴 소문자 변환
     - 호스트 소문자 변환
-    - 기본 포트 제거 (80/443)
+    - 기본 포트 제거 (http 80, https 443, ftp 21)
     - 경로 정규화 (연속 슬래시, 트레일링 슬래시)
     - 퍼센트 인코딩 정규화
 
@@ -75,42 +273,44 @@ def normalize_url(url: str) -> str:
     if not url.startswith(("http://", "https://", "ftp://")):
         url = "https://" + url
 
-    parsed = urlparse(url)
+    scheme, username, password, hostname, port, path, query, fragment = _split_url(url)
 
-    # 스킴/호스트 소문자
-    scheme = parsed.scheme.lower()
-    hostname = (parsed.hostname or "").lower()
+    # 호스트 소문자 (스킴은 위 접두사 검사로 이미 소문자)
+    hostname = hostname.lower()
 
     # 기본 포트 제거
-    port = parsed.port
-    if (scheme == "http" and port == 80) or (scheme == "https" and port == 443):
+    if port is not None and _DEFAULT_PORTS.get(scheme) == port:
         port = None
 
     # netloc 재구성
     netloc = hostname
-    if parsed.username:
-        userinfo = parsed.username
-        if parsed.password:
-            userinfo += f":{parsed.password}"
+    if username:
+        userinfo = username
+        if password:
+            userinfo += f":{password}"
         netloc = f"{userinfo}@{hostname}"
     if port is not None:
         netloc += f":{port}"
 
-    # 경로 정규화: 디코딩 후 재인코딩 (일관성)
-    path = unquote(parsed.path or "/")
-    # 연속 슬래시 제거
-    while "//" in path:
-        path = path.replace("//", "/")
-    # 빈 경로는 /
-    if not path:
-        path = "/"
-    path = quote(path, safe="/:@!$&'()*+,;=-._~")
-
-    # 쿼리 및 프래그먼트 유지
-    query = parsed.query
-    fragment = parsed.fragment
-
-    return urlunparse((scheme, netloc, path, "", query, fragment))
+    # 경로 정규화: 디코딩 후 재인코딩 (일관성) — 흔한 평범한 경로는 결과가
+    # 같으므로 unquote/정규식 치환/quote를 건너뜀
+    path = path or "/"
+    if "//" in path or not _RE_PLAIN_PATH.fullmatch(path):
+        path = unquote(path)
+        # 연속 슬래시 제거
+        path = _RE_MULTI_SLASH.sub("/", path)
+        # 빈 경로는 /
+        if not path:
+            path = "/"
+        path = quote(path, safe=_PATH_SAFE_CHARS)
+
+    # 쿼리 및 프래그먼트 유지 (urlunparse와 같이 빈 값이면 구분자 생략)
+    normalized = f"{scheme}://{netloc}{path}"
+    if query:
+        normalized += f"?{query}"
+    if fragment:
+        normalized += f"#{fragment}"
+    return normalized
 
 
 # ============================================================
@@ -124,12 +324,30 @@ class URLChecker:
     Google Safe Browsing API v4와 VirusTotal API v3을 사용하여
     URL의 악성 여부를 비동기로 검사합니다.
 
-    속도 제한, 응답 캐싱, URL 정규화를 지원합니다.
+    API별 동시 요청/분당 요청 제한, 응답 캐싱, URL 정규화를 지원합니다.
     """
 
     # 캐시 TTL (1시간)
     CACHE_TTL = 3600.0
 
+    # 모든 API 조회가 실패한 결과의 캐시 TTL (장애 중 재요청 폭주 방지, 빠른 복구)
+    NEGATIVE_CACHE_TTL = 60.0
+
+    # 캐시 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+    CACHE_MAX_SIZE = 10000
+
+    # 만료 캐시 항목 정리 주기 (초)
+    CACHE_REAP_INTERVAL = CACHE_TTL / 10
+
+    # 만료 항목 정리 시 이벤트 루프에 양보하기 전까지 검사하는 항목 수
+    CACHE_REAP_CHUNK = 256
+
+    # GSB threatMatches:find 요청당 최대 URL 수 (API 제한 500)
+    GSB_BATCH_SIZE = 500
+
+    # 단건 GSB 조회를 모아 한 요청으로 보내기 전 대기 시간 (초)
+    GSB_COALESCE_WINDOW = 0.005
+
     def __init__(self, config: Optional[ExternalAPIConfig] = None) -> None:
         """
         URL 검사기 초기화
@@ -142,19 +360,42 @@ class URLChecker:
         # aiohttp 세션 (지연 초기화)
         self._session: Optional[aiohttp.ClientSession] = None
 
-        # 응답 캐시 (URL 해시 → _CacheEntry)
-        self._cache: dict[str, _CacheEntry] = {}
+        # 응답 캐시 (정규화된 URL → _CacheEntry, 최근 사용 순서 = 삽입/적중 순서)
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self._cache_lock = asyncio.Lock()
-
-        # 속도 제한 세마포어 (분당 요청 수 제한)
-        self._rate_limiter = asyncio.Semaphore(
-            self.config.rate_limit_per_minute
-        )
+        # 만료 항목 정리 태스크 (세션 생성 시 시작, close에서 취소)
+        self._reaper_task: Optional[asyncio.Task] = None
+        # 조회 중인 URL (정규화된 URL → 결과 Future) — 동시에 들어온 같은 URL은 API를
+        # 다시 호출하지 않고 먼저 시작한 조회의 결과를 기다림
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        # 모아 보낼 단건 GSB 조회 (URL → 결과 Future)와 예약된 전송 콜백/진행 중 전송
+        self._gsb_waiting: dict[str, asyncio.Future] = {}
+        self._gsb_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._gsb_flush_tasks: set[asyncio.Task] = set()
+
+        # API별 동시 요청 수 제한 (한 API가 밀려도 다른 API 조회는 진행)
+        self._gsb_semaphore = asyncio.Semaphore(self.config.gsb_concurrency)
+        self._vt_semaphore = asyncio.Semaphore(self.config.vt_concurrency)
+        # API별 분당 요청 수 제한
+        self._gsb_rate_limiter = _RateLimiter(self.config.rate_limit_per_minute)
+        self._vt_rate_limiter = _RateLimiter(self.config.rate_limit_per_minute)
 
         # API 사용 가능 여부
         self._gsb_available = bool(self.config.google_safe_browsing_key)
         self._vt_available = bool(self.config.virustotal_key)
 
+        # VT 요청 헤더 (설정이 바뀌지 않으므로 한 번만 구성) — API 키가 GSB 요청에
+        # 실리지 않도록 세션 기본 헤더가 아닌 요청별 헤더로 전달
+        self._vt_headers = {
+            "x-apikey": self.config.virustotal_key,
+            "Accept": "application/json",
+        }
+        self._vt_submit_headers = {
+            "x-apikey": self.config.virustotal_key,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
         logger.info(
             "URLChecker 초기화 — GSB: %s, VT: %s",
             self._gsb_available, self._vt_available,
@@ -175,6 +416,26 @@ class URLChecker:
 
     async def close(self) -> None:
         """aiohttp 세션 종료 및 리소스 해제"""
+        # 아직 보내지 않은 단건 GSB 조회는 결과 없음으로 종료
+        if self._gsb_flush_handle is not None:
+            self._gsb_flush_handle.cancel()
+            self._gsb_flush_handle = None
+        waiting, self._gsb_waiting = self._gsb_waiting, {}
+        for future in waiting.values():
+            if not future.done():
+                future.set_result(None)
+        # 전송 중인 단건 GSB 조회 취소 (닫은 뒤 세션/정리 태스크를 다시 만들지 않도록)
+        flush_tasks = list(self._gsb_flush_tasks)
+        for task in flush_tasks:
+            task.cancel()
+        await asyncio.gather(*flush_tasks, return_exceptions=True)
+
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reaper_task
+            self._reaper_task = None
+
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
@@ -205,34 +466,191 @@ class URLChecker:
                 "cached": bool,
             }
         """
-        # URL 정규화
-        normalized = normalize_url(url)
-
-        # 캐시 확인
-        cache_key = self._make_cache_key(normalized)
-        cached = await self._get_cached(cache_key)
-        if cached is not None:
-            cached["cached"] = True
-            return cached
-
-        # Google Safe Browsing + VirusTotal 동시 조회
-        tasks = []
-        if self._gsb_available:
-            tasks.append(self._check_google_safe_browsing(normalized))
-        else:
-            tasks.append(asyncio.coroutine(lambda: None)() if False else self._noop())
-
-        if self._vt_available:
-            tasks.append(self._check_virustotal(normalized))
-        else:
-            tasks.append(self._noop())
-
-        gsb_result, vt_result = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # 예외 처리
-        if isinstance(gsb_result, Exception):
-            logger.error("Google Safe Browsing 오류: %s", gsb_result)
-            gsb_result = None
+        # URL 정규화 후 조회 — 캐시/다른 호출과 공유하는 딕셔너리는 복사해 반환
+        result, hit = await self._check_normalized(normalize_url(url))
+        result = result.copy()
+        if hit:
+            result["cached"] = True
+        return result
+
+    async def _check_normalized(self, normalized: str) -> tuple[dict[str, Any], bool]:
+        """
+        정규화된 URL 하나 검사 (캐시 → 다른 호출의 조회 공유 → 직접 조회)
+
+        Returns:
+            (캐시/다른 호출과 공유하는 결과 딕셔너리, 캐시 적중 여부)
+        """
+        while True:
+            # 캐시 확인
+            cached = await self._get_cached(normalized)
+            if cached is not None:
+                return cached, True
+
+            # 같은 URL을 조회 중인 호출이 있으면 그 결과를 공유
+            inflight = self._inflight.get(normalized)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight), False
+            except asyncio.CancelledError:
+                if not self._owner_cancelled(inflight):
+                    raise
+                # 조회를 맡은 호출이 취소됨 → 캐시부터 다시 확인하고 필요하면 직접 조회
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[normalized] = future
+        try:
+            result = await self._check_url_uncached(normalized)
+            # 캐시 저장
+            await self._set_cached(normalized, result, ttl=self._result_ttl(result))
+            future.set_result(result)
+        except Exception as e:
+            self._fail_future(future, e)
+            raise
+        finally:
+            self._inflight.pop(normalized, None)
+            if not future.done():
+                future.cancel()
+
+        return result, False
+
+    async def _check_url_uncached(self, normalized: str) -> dict[str, Any]:
+        """정규화된 URL 하나를 GSB/VT에 조회해 통합 결과 생성 (캐시 미사용)"""
+        # Google Safe Browsing + VirusTotal 동시 조회 (사용 가능한 API만)
+        gsb_task = vt_task = None
+        async with asyncio.TaskGroup() as tg:
+            if self._gsb_available:
+                gsb_task = tg.create_task(self._none_on_error(
+                    self._check_google_safe_browsing(normalized),
+                    "Google Safe Browsing",
+                ))
+            if self._vt_available:
+                vt_task = tg.create_task(self._none_on_error(
+                    self._check_virustotal(normalized), "VirusTotal",
+                ))
+
+        gsb_result = gsb_task.result() if gsb_task is not None else None
+        vt_result = vt_task.result() if vt_task is not None else None
+
+        return self._combine_results(normalized, gsb_result, vt_result)
+
+    async def check_urls_batch(
+        self, urls: list[str]
+    ) -> list[dict[str, Any]]:
+        """
+        여러 URL 일괄 검사
+
+        URL을 정규화해 중복을 합치고 캐시 적중분과 다른 호출이 조회 중인 URL을
+        제외한 뒤, Google Safe Browsing은 최대 GSB_BATCH_SIZE개씩 묶어 한 번에 조회합니다.
+        VirusTotal은 일괄 조회 엔드포인트가 없어 URL별로 동시에 조회합니다.
+
+        Args:
+            urls: 검사할 URL 리스트
+
+        Returns:
+            검사 결과 리스트 (입력 순서 유지)
+        """
+        normalized_urls = [normalize_url(url) for url in urls]
+
+        # 중복 제거 (순서 유지) 및 캐시 확인
+        # pending: 이 호출이 조회할 URL → 결과 Future, shared: 다른 호출이 조회 중인 URL
+        # results의 값은 캐시/다른 호출과 공유하는 딕셔너리 — 반환 시 복사
+        results: dict[str, dict[str, Any]] = {}
+        hits: set[str] = set()
+        pending: dict[str, asyncio.Future] = {}
+        shared: dict[str, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        for normalized in dict.fromkeys(normalized_urls):
+            cached = await self._get_cached(normalized)
+            if cached is not None:
+                results[normalized] = cached
+                hits.add(normalized)
+                continue
+
+            inflight = self._inflight.get(normalized)
+            if inflight is not None:
+                shared[normalized] = inflight
+            else:
+                pending[normalized] = self._inflight[normalized] = loop.create_future()
+
+        if pending:
+            try:
+                await self._check_pending_batch(pending, results)
+            except Exception as e:
+                for future in pending.values():
+                    if not future.done():
+                        self._fail_future(future, e)
+                raise
+            finally:
+                for url, future in pending.items():
+                    self._inflight.pop(url, None)
+                    if not future.done():
+                        future.cancel()
+
+        for url, future in shared.items():
+            try:
+                results[url] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not self._owner_cancelled(future):
+                    raise
+                # 조회를 맡은 호출이 취소됨 → 이 URL은 직접 다시 검사
+                results[url], hit = await self._check_normalized(url)
+                if hit:
+                    hits.add(url)
+
+        # 같은 URL이 여러 번 요청되어도 호출자별로 독립된 결과 반환
+        output = []
+        for normalized in normalized_urls:
+            result = results[normalized].copy()
+            if normalized in hits:
+                result["cached"] = True
+            output.append(result)
+        return output
+
+    async def _check_pending_batch(
+        self,
+        pending: dict[str, asyncio.Future],
+        results: dict[str, dict[str, Any]],
+    ) -> None:
+        """
+        캐시에 없는 URL들을 일괄 조회해 캐시에 저장하고 results와 각 Future에 기록
+
+        Args:
+            pending: 정규화된 URL → 조회를 기다리는 Future
+            results: 정규화된 URL → 검사 결과 (이 메서드가 채움)
+        """
+        urls = list(pending)
+
+        # GSB 청크 조회와 VT URL별 조회를 동시에 수행 (사용 가능한 API만)
+        gsb_task = vt_task = None
+        async with asyncio.TaskGroup() as tg:
+            if self._gsb_available:
+                gsb_task = tg.create_task(self._none_on_error(
+                    self._check_google_safe_browsing_many(urls),
+                    "Google Safe Browsing 일괄 조회",
+                ))
+            if self._vt_available:
+                # VT 조회 코루틴은 동시 실행 한도만큼만 만들어 진행
+                vt_task = tg.create_task(self._bounded_gather(
+                    (self._check_virustotal(url) for url in urls),
+                    self.config.batch_concurrency,
+                ))
+
+        gsb_results = gsb_task.result() if gsb_task is not None else None
+        vt_results = vt_task.result() if vt_task is not None else [None] * len(urls)
+
+        for url, vt_result in zip(urls, vt_results):
+            gsb_result = gsb_results.get(url) if gsb_results else None
+            result = self._combine_results(url, gsb_result, vt_result)
+            await self._set_cached(url, result, ttl=self._result_ttl(result))
+            results[url] = result
+            pending[url].set_result(result)
+
+    def _combine_results(
+        self, url: str, gsb_result: Any, vt_result: Any
+    ) -> dict[str, Any]:
+        """GSB / VT 조회 결과를 하나의 검사 결과로 통합"""
+        # 예외 처리 (일괄 VT 조회는 실패한 URL 자리에 예외를 담아 전달)
         if isinstance(vt_result, Exception):
             logger.error("VirusTotal 오류: %s", vt_result)
             vt_result = None
@@ -253,8 +671,8 @@ class URLChecker:
             )
             safe = False
 
-        result: dict[str, Any] = {
-            "url": normalized,
+        return {
+            "url": url,
             "safe": safe,
             "threats": threats,
             "google_safe_browsing": gsb_result,
@@ -262,26 +680,6 @@ class URLChecker:
             "cached": False,
         }
 
-        # 캐시 저장
-        await self._set_cached(cache_key, result)
-
-        return result
-
-    async def check_urls_batch(
-        self, urls: list[str]
-    ) -> list[dict[str, Any]]:
-        """
-        여러 URL 일괄 검사
-
-        Args:
-            urls: 검사할 URL 리스트
-
-        Returns:
-            검사 결과 리스트
-        """
-        tasks = [self.check_url(url) for url in urls]
-        return await asyncio.gather(*tasks)
-
     # ============================
     # Google Safe Browsing API v4
     # ============================
@@ -292,31 +690,92 @@ class URLChecker:
         """
         Google Safe Browsing API v4 threatMatches:find 호출
 
+        GSB_COALESCE_WINDOW 동안 들어온 단건 조회(동시에 진행 중인 check_url들)를
+        모아 threatMatches:find 요청 하나로 보냅니다.
+
         Args:
             url: 검사할 URL
 
         Returns:
             검사 결과 또는 None
         """
-        async with self._rate_limiter:
+        future = self._gsb_waiting.get(url)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._gsb_waiting[url] = loop.create_future()
+            if self._gsb_flush_handle is None:
+                self._gsb_flush_handle = loop.call_later(
+                    self.GSB_COALESCE_WINDOW, self._flush_gsb_waiting
+                )
+        return await asyncio.shield(future)
+
+    def _flush_gsb_waiting(self) -> None:
+        """모인 단건 GSB 조회를 전송하는 태스크 시작 (call_later 콜백)"""
+        self._gsb_flush_handle = None
+        waiting, self._gsb_waiting = self._gsb_waiting, {}
+        task = asyncio.ensure_future(self._resolve_gsb_waiting(waiting))
+        # 완료 전에 태스크가 가비지 컬렉션되지 않도록 참조 유지
+        self._gsb_flush_tasks.add(task)
+        task.add_done_callback(self._gsb_flush_tasks.discard)
+
+    async def _resolve_gsb_waiting(self, waiting: dict[str, asyncio.Future]) -> None:
+        """모인 URL을 일괄 조회하고 URL별 Future에 결과 전달"""
+        try:
+            results = await self._check_google_safe_browsing_many(list(waiting))
+        except asyncio.CancelledError:
+            # close()가 전송을 취소 — 기다리던 조회는 결과 없음으로 종료
+            for future in waiting.values():
+                if not future.done():
+                    future.set_result(None)
+            raise
+        except Exception as e:
+            for future in waiting.values():
+                if not future.done():
+                    self._fail_future(future, e)
+            return
+
+        for url, future in waiting.items():
+            if not future.done():
+                future.set_result(results.get(url))
+
+    async def _check_google_safe_browsing_many(
+        self, urls: list[str]
+    ) -> dict[str, Optional[dict[str, Any]]]:
+        """URL 목록을 GSB_BATCH_SIZE 단위 청크로 나눠 동시에 조회"""
+        chunks = [
+            urls[i:i + self.GSB_BATCH_SIZE]
+            for i in range(0, len(urls), self.GSB_BATCH_SIZE)
+        ]
+        merged: dict[str, Optional[dict[str, Any]]] = {}
+        for chunk_result in await asyncio.gather(
+            *(self._check_google_safe_browsing_batch(chunk) for chunk in chunks)
+        ):
+            merged.update(chunk_result)
+        return merged
+
+    async def _check_google_safe_browsing_batch(
+        self, urls: list[str]
+    ) -> dict[str, Optional[dict[str, Any]]]:
+        """
+        여러 URL을 한 번의 threatMatches:find 요청으로 조회
+
+        Args:
+            urls: 검사할 URL 목록 (최대 GSB_BATCH_SIZE개)
+
+        Returns:
+            URL → 검사 결과 (실패 시 모든 URL이 None)
+        """
+        failed: dict[str, Optional[dict[str, Any]]] = dict.fromkeys(urls)
+
+        async with self._gsb_semaphore, self._gsb_rate_limiter:
             session = await self._ensure_session()
 
-            # API 요청 본문 구성
+            # API 요청 본문 구성 (고정 부분은 모듈 상수 재사용)
             payload = {
-                "client": {
-                    "clientId": "ordinalv8",
-                    "clientVersion": "0.1.0",
-                },
+                "client": _GSB_CLIENT,
                 "threatInfo": {
-                    "threatTypes": [
-                        "MALWARE",
-                        "SOCIAL_ENGINEERING",
-                        "UNWANTED_SOFTWARE",
-                        "POTENTIALLY_HARMFUL_APPLICATION",
-                    ],
-                    "platformTypes": ["ANY_PLATFORM"],
-                    "threatEntryTypes": ["URL"],
-                    "threatEntries": [{"url": url}],
+                    **_GSB_THREAT_INFO,
+                    "threatEntries": [{"url": url} for url in urls],
                 },
             }
 
@@ -329,39 +788,51 @@ class URLChecker:
                 async with session.post(
                     api_url,
                     json=payload,
-                    timeout=aiohttp.ClientTimeout(
-                        total=self.config.request_timeout
-                    ),
                 ) as response:
                     if response.status != 200:
                         logger.warning(
                             "GSB API 응답 코드 %d: %s",
-                            response.status, await response.text(),
+                            response.status, await _read_error_body(response),
                         )
-                        return None
+                        return failed
 
-                    data = await response.json()
-
-                    # 위협 매칭 결과 파싱
-                    matches = data.get("matches", [])
-                    threats: list[str] = []
-                    for match in matches:
-                        threat_type = match.get("threatType", "UNKNOWN")
-                        platform = match.get("platformType", "UNKNOWN")
-                        threats.append(f"{threat_type} ({platform})")
-
-                    return {
-                        "threats": threats,
-                        "match_count": len(matches),
-                        "raw_matches": matches,
-                    }
+                    data = await response.json(loads=_json_loads)
 
             except asyncio.TimeoutError:
-                logger.warning("GSB API 타임아웃: %s", url)
-                return None
+                logger.warning("GSB API 타임아웃: %d개 URL", len(urls))
+                return failed
             except Exception as e:
                 logger.error("GSB API 호출 실패: %s", e)
-                return None
+                return failed
+
+        # 위협 매칭 결과를 URL별로 분배
+        matches_by_url: dict[str, list[dict[str, Any]]] = {url: [] for url in urls}
+        for match in data.get("matches", []):
+            matched_url = match.get("threat", {}).get("url")
+            if matched_url not in matches_by_url:
+                if len(urls) == 1:
+                    matched_url = urls[0]
+                elif isinstance(matched_url, str):
+                    # 요청 URL은 정규화된 형태 — 응답 표기가 달라도 같은 URL로 매핑
+                    with contextlib.suppress(ValueError):
+                        matched_url = normalize_url(matched_url)
+                if matched_url not in matches_by_url:
+                    logger.warning("GSB 매치를 요청 URL에 대응시키지 못함: %s", matched_url)
+                    continue
+            matches_by_url[matched_url].append(match)
+
+        results: dict[str, Optional[dict[str, Any]]] = {}
+        for url, matches in matches_by_url.items():
+            threats = [
+                f"{m.get('threatType', 'UNKNOWN')} ({m.get('platformType', 'UNKNOWN')})"
+                for m in matches
+            ]
+            results[url] = {
+                "threats": threats,
+                "match_count": len(matches),
+                "raw_matches": matches,
+            }
+        return results
 
     # ============================
     # VirusTotal API v3
@@ -381,38 +852,29 @@ class URLChecker:
         Returns:
             검사 결과 또는 None
         """
-        async with self._rate_limiter:
+        async with self._vt_semaphore, self._vt_rate_limiter:
             session = await self._ensure_session()
 
-            # URL ID: Base64(URL) without padding
-            url_id = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
-
-            api_url = f"{self.config.virustotal_url}/urls/{url_id}"
-            headers = {
-                "x-apikey": self.config.virustotal_key,
-                "Accept": "application/json",
-            }
+            api_url = f"{self.config.virustotal_url}/urls/{_vt_url_id(url)}"
 
             try:
                 async with session.get(
                     api_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(
-                        total=self.config.request_timeout
-                    ),
+                    headers=self._vt_headers,
                 ) as response:
                     if response.status == 404:
-                        # URL이 VT DB에 없음 → 스캔 제출
+                        # URL이 VT DB에 없음 → 스캔 제출 (404 응답의 연결은 제출 전에 반환)
+                        response.release()
                         return await self._submit_virustotal_scan(url)
 
                     if response.status != 200:
                         logger.warning(
                             "VT API 응답 코드 %d: %s",
-                            response.status, await response.text(),
+                            response.status, await _read_error_body(response),
                         )
                         return None
 
-                    data = await response.json()
+                    data = await response.json(loads=_json_loads)
                     attributes = data.get("data", {}).get("attributes", {})
                     stats = attributes.get("last_analysis_stats", {})
 
@@ -441,7 +903,8 @@ class URLChecker:
         """
         VirusTotal에 URL 스캔 제출
 
-        DB에 없는 URL에 대해 새 스캔을 요청합니다.
+        DB에 없는 URL에 대해 새 스캔을 요청합니다. _check_virustotal이 잡은
+        동시 요청 슬롯 안에서 호출되며, 별도 요청이므로 분당 제한은 다시 거칩니다.
 
         Args:
             url: 스캔할 URL
@@ -452,23 +915,17 @@ class URLChecker:
         session = await self._ensure_session()
 
         api_url = f"{self.config.virustotal_url}/urls"
-        headers = {
-            "x-apikey": self.config.virustotal_key,
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
         data = f"url={url}"
 
+        await self._vt_rate_limiter.acquire()
         try:
             async with session.post(
                 api_url,
-                headers=headers,
+                headers=self._vt_submit_headers,
                 data=data,
-                timeout=aiohttp.ClientTimeout(
-                    total=self.config.request_timeout
-                ),
             ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = await response.json(loads=_json_loads)
                     analysis_id = (
                         result.get("data", {}).get("id", "unknown")
                     )
@@ -499,53 +956,97 @@ class URLChecker:
     async def _ensure_session(self) -> aiohttp.ClientSession:
         """aiohttp 세션 보장 (없으면 생성)"""
         if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=_CONNECTOR_LIMIT,
+                limit_per_host=_CONNECTOR_LIMIT_PER_HOST,
+                ttl_dns_cache=_DNS_CACHE_TTL,
+                keepalive_timeout=_KEEPALIVE_TIMEOUT,
+            )
             self._session = aiohttp.ClientSession(
+                connector=connector,
                 headers={"User-Agent": "OrdinalV8/2.0.0"},
+                timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
             )
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
         return self._session
 
     # ============================
     # 캐시 관리
     # ============================
 
-    def _make_cache_key(self, url: str) -> str:
-        """URL 기반 캐시 키 생성"""
-        return hashlib.sha256(url.encode("utf-8")).hexdigest()
-
     async def _get_cached(self, key: str) -> Optional[dict[str, Any]]:
-        """캐시 조회"""
-        async with self._cache_lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                return None
-            if entry.is_expired:
-                del self._cache[key]
-                return None
-            return entry.result.copy()
+        """
+        캐시 조회 (만료 항목은 조회 시 제거, 적중 항목은 최근 사용으로 이동)
+
+        중간에 await가 없어 이벤트 루프에서 끊기지 않으므로 잠금 없이 조회합니다.
+        캐시에 저장된 딕셔너리를 그대로 반환하므로 호출자는 복사본을 만들어 수정합니다.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired(time.monotonic()):
+            self._cache.pop(key, None)
+            return None
+        self._cache.move_to_end(key)
+        return entry.result
+
+    def _result_ttl(self, result: dict[str, Any]) -> float:
+        """검사 결과의 캐시 TTL (GSB/VT 결과가 모두 없으면 오류로 보고 짧게 유지)"""
+        if result["google_safe_browsing"] is None and result["virustotal"] is None:
+            return self.NEGATIVE_CACHE_TTL
+        return self.CACHE_TTL
+
+    async def _set_cached(
+        self, key: str, result: dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        """
+        캐시 저장 (가득 차면 가장 오래 사용하지 않은 항목을 O(1)로 제거)
 
-    async def _set_cached(self, key: str, result: dict[str, Any]) -> None:
-        """캐시 저장"""
+        Args:
+            key: 정규화된 URL
+            result: 검사 결과
+            ttl: 항목별 TTL (초, 기본 CACHE_TTL)
+        """
         async with self._cache_lock:
-            # 캐시 크기 제한 (최대 10000개)
-            if len(self._cache) >= 10000:
-                # 만료된 항목 정리
-                expired_keys = [
-                    k for k, v in self._cache.items() if v.is_expired
-                ]
-                for k in expired_keys:
-                    del self._cache[k]
-
-                # 여전히 초과하면 가장 오래된 것 제거
-                if len(self._cache) >= 10000:
-                    oldest = next(iter(self._cache))
-                    del self._cache[oldest]
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif len(self._cache) >= self.CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
 
             self._cache[key] = _CacheEntry(
                 result=result,
-                created_at=time.time(),
-                ttl=self.CACHE_TTL,
+                created_at=time.monotonic(),
+                ttl=self.CACHE_TTL if ttl is None else ttl,
             )
 
+    async def _reap_loop(self) -> None:
+        """만료된 캐시 항목을 주기적으로 제거 (다시 조회되지 않는 만료 항목의 메모리 회수)"""
+        while True:
+            await asyncio.sleep(self.CACHE_REAP_INTERVAL)
+            removed = await self._reap_expired()
+            if removed:
+                logger.debug("만료 캐시 항목 %d개 정리", removed)
+
+    async def _reap_expired(self) -> int:
+        """
+        만료된 캐시 항목 제거 (제거한 수 반환)
+
+        키 스냅샷을 CACHE_REAP_CHUNK개씩 검사하고 청크 사이에 이벤트 루프에
+        양보하므로, 캐시가 커도 다른 검사를 오래 막지 않습니다.
+        """
+        keys = list(self._cache)
+        removed = 0
+        for start in range(0, len(keys), self.CACHE_REAP_CHUNK):
+            now = time.monotonic()
+            for key in keys[start:start + self.CACHE_REAP_CHUNK]:
+                entry = self._cache.get(key)
+                if entry is not None and entry.is_expired(now):
+                    del self._cache[key]
+                    removed += 1
+            await asyncio.sleep(0)
+        return removed
+
     async def clear_cache(self) -> None:
         """캐시 전체 삭제"""
         async with self._cache_lock:
@@ -561,9 +1062,62 @@ class URLChecker:
     # ============================
 
     @staticmethod
-    async def _noop() -> None:
-        """아무것도 하지 않는 코루틴 (플레이스홀더)"""
-        return None
+    def _fail_future(future: asyncio.Future, exc: BaseException) -> None:
+        """
+        조회 중 Future에 예외 설정 (기다리던 호출에 같은 예외 전달)
+
+        기다리는 호출이 없을 때 "exception was never retrieved" 경고가 남지 않도록
+        예외를 확인 처리합니다.
+        """
+        future.set_exception(exc)
+        future.exception()
+
+    @staticmethod
+    def _owner_cancelled(future: asyncio.Future) -> bool:
+        """
+        공유 중인 조회 Future가 조회를 맡은 호출의 취소로 끝났는지 여부
+
+        기다리던 호출 자신이 취소된 경우 (현재 태스크에 취소 요청이 있음)와 구분합니다.
+        """
+        task = asyncio.current_task()
+        return future.cancelled() and (task is None or not task.cancelling())
+
+    @staticmethod
+    async def _none_on_error(coro: Awaitable[Any], label: str) -> Any:
+        """
+        조회 코루틴을 실행하고 예외는 로그로 남긴 뒤 None 반환
+
+        TaskGroup 안에서 한 API의 예외가 다른 API 조회까지 취소하지 않도록 감쌉니다.
+        """
+        try:
+            return await coro
+        except Exception as e:
+            logger.error("%s 오류: %s", label, e)
+            return None
+
+    @staticmethod
+    async def _bounded_gather(
+        coros: Iterable[Awaitable[Any]], limit: int
+    ) -> list[Any]:
+        """
+        코루틴을 최대 limit개씩 동시에 실행하고 결과를 입력 순서대로 반환
+
+        작업자 limit개가 이터러블에서 코루틴을 하나씩 꺼내 실행하므로, 제너레이터를
+        넘기면 대기 중인 코루틴 객체를 미리 만들지 않습니다. 예외는
+        asyncio.gather(return_exceptions=True)처럼 해당 결과 자리에 담깁니다.
+        """
+        results: dict[int, Any] = {}
+        pending = enumerate(coros)
+
+        async def worker() -> None:
+            for index, coro in pending:
+                try:
+                    results[index] = await coro
+                except Exception as e:
+                    results[index] = e
+
+        await asyncio.gather(*(worker() for _ in range(max(1, limit))))
+        return [results[index] for index in range(len(results))]
 
     def __repr__(self) -> str:
         return (